@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of response compression: bytes saved and CPU cost per encoding.
+
+Builds the bodies the read endpoints return (a blog listing, a full post,
+the project and testimonial lists) from generated text with a realistic
+vocabulary, then compresses each one with gzip, brotli and zstd at several
+levels. Reports the compressed size, bytes saved and the time to compress
+and decompress one body on one core. Cached responses pay the compression
+cost once per encoding; uncached ones pay it on every request. Run from
+the backend directory:
+
+    python benchmarks/compression_benchmark.py --items 20
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.blog import BlogPost, BlogPostSummary, derive_content_fields
+from models.project import Project
+from models.testimonial import Testimonial
+from services.compression import (
+    COMPRESSION_BROTLI_QUALITY, COMPRESSION_GZIP_LEVEL, COMPRESSION_ZSTD_LEVEL, Compressor, supported_encodings,
+)
+from services.serialization import construct_documents, dump_json, response_projection
+
+VOCABULARY = (
+    "react fastapi mongodb python javascript component state hook query index latency cache deploy "
+    "server client request response design pattern async await render page route api token user "
+    "build test debug refactor module package portfolio project blog article career learning team "
+    "the a of to and in is that for with on as it this be are by from at or an we can which"
+).split()
+
+
+def prose(rng: random.Random, words: int) -> str:
+    sentences, current = [], []
+    for _ in range(words):
+        current.append(rng.choice(VOCABULARY))
+        if len(current) >= rng.randint(8, 20):
+            sentences.append(" ".join(current).capitalize() + ".")
+            current = []
+    return " ".join(sentences + ([" ".join(current)] if current else []))
+
+
+def sample_bodies(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    posts = []
+    for i in range(count):
+        content = "".join(f"<p>{prose(rng, 80)}</p>\n" for _ in range(12))
+        posts.append(BlogPost(
+            title=prose(rng, 6), excerpt=prose(rng, 30), content=content, category=rng.choice(["Development", "Career"]),
+            published=True, date=base + timedelta(days=i),
+            **derive_content_fields(content),
+        ).model_dump())
+    projects = [
+        Project(
+            title=prose(rng, 4), description=prose(rng, 60), technologies=rng.sample(VOCABULARY[:12], 4),
+            category=rng.choice(["Web", "Mobile"]), featured=i % 3 == 0,
+        ).model_dump()
+        for i in range(count)
+    ]
+    testimonials = [
+        Testimonial(
+            name="Jane Client", position="CTO", company=f"Example {i} Ltd", content=prose(rng, 50), approved=True,
+        ).model_dump()
+        for i in range(count)
+    ]
+    summary_fields = set(response_projection(BlogPostSummary))
+    summaries = [{k: v for k, v in post.items() if k in summary_fields} for post in posts[:10]]
+    return {
+        "GET /api/blog": dump_json({
+            "posts": construct_documents(BlogPostSummary, summaries),
+            "total": len(posts), "page": 1, "per_page": 10, "next_cursor": None,
+        }),
+        "GET /api/blog/{post_id}": dump_json(construct_documents(BlogPost, posts[:1])[0]),
+        "GET /api/projects": dump_json({"projects": construct_documents(Project, projects)}),
+        "GET /api/testimonials": dump_json({"testimonials": construct_documents(Testimonial, testimonials)}),
+    }
+
+
+def decompressor(encoding: str):
+    if encoding == "gzip":
+        import gzip
+        return gzip.decompress
+    if encoding == "br":
+        import brotli
+        return brotli.decompress
+    import zstandard
+    return zstandard.ZstdDecompressor().decompress
+
+
+def time_per_call(fn, arg, seconds: float) -> float:
+    """Mean microseconds per call over at least ``seconds``"""
+    calls, started = 0, time.perf_counter()
+    while True:
+        fn(arg)
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            return elapsed / calls * 1e6
+
+
+def levels(value: str):
+    return [int(level) for level in value.split(",") if level]
+
+
+def main(args):
+    bodies = sample_bodies(args.items)
+    configured = {"gzip": COMPRESSION_GZIP_LEVEL, "br": COMPRESSION_BROTLI_QUALITY, "zstd": COMPRESSION_ZSTD_LEVEL}
+    wanted = {"gzip": levels(args.gzip_levels), "br": levels(args.brotli_qualities), "zstd": levels(args.zstd_levels)}
+    available = supported_encodings()
+    results = {}
+    for endpoint, body in bodies.items():
+        rows = []
+        for encoding, encoding_levels in wanted.items():
+            if encoding not in available:
+                continue
+            decompress = decompressor(encoding)
+            for level in encoding_levels:
+                compressor = Compressor(
+                    min_bytes=0, gzip_level=level, brotli_quality=level, zstd_level=level, preference=[encoding]
+                )
+                compressed = compressor.compress(body, encoding)
+                compress_us = time_per_call(lambda b: compressor.compress(b, encoding), body, args.seconds)
+                rows.append({
+                    "encoding": encoding,
+                    "level": level,
+                    "configured": level == configured[encoding],
+                    "bytes": len(compressed),
+                    "saved_bytes": len(body) - len(compressed),
+                    "saved_pct": round(100 * (1 - len(compressed) / len(body)), 1),
+                    "compress_us": round(compress_us, 1),
+                    "compress_mb_s": round(len(body) / compress_us, 1),
+                    "decompress_us": round(time_per_call(decompress, compressed, args.seconds), 1),
+                })
+        results[endpoint] = {"identity_bytes": len(body), "encodings": rows}
+    skipped = sorted(set(wanted) - set(available))
+    print(json.dumps({"items": args.items, "unavailable": skipped, "endpoints": results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=20, help="documents per list response")
+    parser.add_argument("--seconds", type=float, default=0.5, help="time spent measuring each level")
+    parser.add_argument("--gzip-levels", default="1,6,9")
+    parser.add_argument("--brotli-qualities", default="1,5,11")
+    parser.add_argument("--zstd-levels", default="1,3,19")
+    main(parser.parse_args())
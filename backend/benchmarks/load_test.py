@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Concurrent load test of the API, booted in-process.
+
+Seeds a throwaway database with --posts/--projects/--testimonials/--contacts
+documents, runs the app's startup hooks, then drives --concurrency async
+clients at each endpoint for --duration seconds over an in-memory ASGI
+transport. Reports requests/sec, latency percentiles, status codes and
+memory high-water marks as JSON.
+
+Without --mongo-url the database is mongomock-motor (pip install
+mongomock-motor), so the suite runs offline; numbers then reflect the app's
+own overhead rather than real query latency. Client and server share one
+event loop and core either way. Run from the backend directory:
+
+    python benchmarks/load_test.py --posts 2000 --concurrency 32 --output load.json
+    python benchmarks/load_test.py --baseline load.json --tolerance 0.2
+
+With --baseline, exits non-zero when an endpoint's RPS drops, or its p99
+rises, by more than --tolerance relative to the baseline report.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+WORDS = (
+    "react fastapi mongodb python javascript design performance cache index query async "
+    "portfolio deploy docker testing typescript frontend backend api server cloud security"
+).split()
+CATEGORIES = ["Development", "Design", "Career", "Tutorials"]
+PROJECT_CATEGORIES = ["Web", "Mobile", "Data"]
+
+
+def configure_environment(args):
+    # Must run before server is imported: settings are read at import time
+    os.environ["DB_NAME"] = f"loadtest_{uuid4().hex[:8]}"
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("INDEX_VERIFY", "off")
+    os.environ.setdefault("SEARCH_SNAPSHOT_PATH", "")
+    if args.mongo_url:
+        os.environ["MONGO_URL"] = args.mongo_url
+        return "mongodb"
+    try:
+        import mongomock_motor
+    except ImportError:
+        sys.exit("mongomock-motor is required without --mongo-url: pip install mongomock-motor")
+    import motor.motor_asyncio
+    motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+    return "mongomock"
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+async def seed(server, args, rng: random.Random) -> dict:
+    from models.blog import BlogPost, BlogPostCreate, derive_content_fields
+    from models.contact import ContactSubmission, ContactSubmissionCreate
+    from models.documents import new_document
+    from models.project import Project, ProjectCreate
+    from models.testimonial import Testimonial, TestimonialCreate
+
+    base = datetime.utcnow() - timedelta(days=args.posts + 1)
+    posts = []
+    for i in range(args.posts):
+        content = sentence(rng, args.post_words)
+        posts.append(new_document(BlogPost, BlogPostCreate(
+            title=f"Post {i}: {sentence(rng, 4)}", excerpt=sentence(rng, 20), content=content,
+            category=rng.choice(CATEGORIES), published=True,
+        ), date=base + timedelta(days=i), **derive_content_fields(content)))
+    projects = [
+        new_document(Project, ProjectCreate(
+            title=f"Project {i}", description=sentence(rng, 40), technologies=rng.sample(WORDS, 3),
+            category=rng.choice(PROJECT_CATEGORIES), featured=i % 4 == 0,
+        ))
+        for i in range(args.projects)
+    ]
+    testimonials = [
+        new_document(Testimonial, TestimonialCreate(
+            name=f"Client {i}", position="CTO", company="Example Ltd", content=sentence(rng, 30),
+        ), approved=True)
+        for i in range(args.testimonials)
+    ]
+    contacts = [
+        new_document(ContactSubmission, ContactSubmissionCreate(
+            name=f"Sender {i}", email=f"sender{i}@example.com", subject="Enquiry", message=sentence(rng, 30),
+        ))
+        for i in range(args.contacts)
+    ]
+
+    started = time.perf_counter()
+    for collection, docs in (
+        (server.db.blog_posts, posts), (server.db.projects, projects),
+        (server.db.testimonials, testimonials), (server.db.contacts, contacts),
+    ):
+        if docs:
+            await collection.insert_many(docs)
+    return {
+        "posts": len(posts), "projects": len(projects), "testimonials": len(testimonials),
+        "contacts": len(contacts), "seconds": round(time.perf_counter() - started, 3),
+        "post_ids": [post["id"] for post in posts],
+    }
+
+
+def scenarios(post_ids, rng: random.Random, per_page: int):
+    pages = max(1, min(len(post_ids) // per_page, 20))
+
+    def contact_body():
+        n = rng.randrange(1_000_000)
+        return {"name": f"Load {n}", "email": f"load{n}@example.com", "subject": "Load test", "message": sentence(rng, 20)}
+
+    return {
+        "GET /api/blog": lambda: ("GET", f"/api/blog?page={rng.randint(1, pages)}&per_page={per_page}", None),
+        "GET /api/blog?category": lambda: ("GET", f"/api/blog?category={rng.choice(CATEGORIES)}&per_page={per_page}", None),
+        "GET /api/blog/{post_id}": lambda: ("GET", f"/api/blog/{rng.choice(post_ids)}", None),
+        "GET /api/projects": lambda: ("GET", "/api/projects", None),
+        "GET /api/projects?featured": lambda: ("GET", "/api/projects?featured=true", None),
+        "GET /api/testimonials": lambda: ("GET", "/api/testimonials", None),
+        "GET /api/home": lambda: ("GET", "/api/home", None),
+        "GET /api/search": lambda: ("GET", f"/api/search?q={rng.choice(WORDS)}+{rng.choice(WORDS)[:3]}", None),
+        "POST /api/contact": lambda: ("POST", "/api/contact", contact_body()),
+    }
+
+
+def percentile(ordered, fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def rss_high_water_mb() -> float:
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20, 1)
+
+
+async def drive(client, make_request, concurrency: int, duration: float):
+    latencies, statuses = [], Counter()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            method, url, body = make_request()
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+async def run_endpoint(client, make_request, args) -> dict:
+    if args.warmup:
+        await drive(client, make_request, args.concurrency, args.warmup)
+    if args.trace_memory:
+        tracemalloc.reset_peak()
+    latencies, statuses, elapsed = await drive(client, make_request, args.concurrency, args.duration)
+    ordered = sorted(latencies)
+    result = {
+        "requests": len(ordered),
+        "rps": round(len(ordered) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(ordered, 0.50) * 1000, 2),
+            "p90": round(percentile(ordered, 0.90) * 1000, 2),
+            "p99": round(percentile(ordered, 0.99) * 1000, 2),
+            "max": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        },
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "errors": sum(count for code, count in statuses.items() if code >= 400),
+        "rss_high_water_mb": rss_high_water_mb(),
+    }
+    if args.trace_memory:
+        result["python_heap_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+    return result
+
+
+def compare(report: dict, baseline: dict, tolerance: float):
+    regressions = []
+    for name, current in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        if current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {previous['rps']} -> {current['rps']}")
+        if current["latency_ms"]["p99"] > previous["latency_ms"]["p99"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {previous['latency_ms']['p99']}ms -> {current['latency_ms']['p99']}ms")
+    return regressions
+
+
+async def main(args):
+    import httpx
+
+    backend = configure_environment(args)
+    import server
+
+    async def discard_emails(payloads):
+        # Load tests exercise the API, not the mail server
+        return [None] * len(payloads)
+
+    server.send_contact_emails = discard_emails
+    rng = random.Random(args.seed)
+    server.db.connect()
+    seeded = await seed(server, args, rng)
+    post_ids = seeded.pop("post_ids")
+    if not post_ids:
+        sys.exit("--posts must be at least 1")
+
+    selected = scenarios(post_ids, rng, args.per_page)
+    if args.endpoints:
+        selected = {name: make for name, make in selected.items() if any(part in name for part in args.endpoints)}
+
+    if args.trace_memory:
+        tracemalloc.start()
+    report = {
+        "started_at": datetime.utcnow().isoformat(),
+        "database": backend,
+        "config": {
+            "concurrency": args.concurrency, "duration": args.duration,
+            "warmup": args.warmup, "per_page": args.per_page, "seed": args.seed,
+        },
+        "seeded": seeded,
+        "endpoints": {},
+    }
+    transport = httpx.ASGITransport(app=server.app)
+    async with server.app.router.lifespan_context(server.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            for name, make_request in selected.items():
+                report["endpoints"][name] = await run_endpoint(client, make_request, args)
+                print(f"{name}: {report['endpoints'][name]['rps']} req/s", file=sys.stderr)
+        if args.mongo_url:
+            await server.db.client.drop_database(os.environ["DB_NAME"])
+    report["rss_high_water_mb"] = rss_high_water_mb()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    print(output)
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--testimonials", type=int, default=50)
+    parser.add_argument("--contacts", type=int, default=500)
+    parser.add_argument("--post-words", type=int, default=800)
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of measured load per endpoint")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds per endpoint")
+    parser.add_argument("--endpoints", nargs="*", help="only run scenarios whose name contains one of these")
+    parser.add_argument("--mongo-url", help="real MongoDB to seed a throwaway database on (default: mongomock)")
+    parser.add_argument("--trace-memory", action="store_true", help="also report Python heap peaks (slows requests)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compare deep-page latency of skip/limit and keyset pagination for blog posts.
+
+Seeds a throwaway database (BENCH_DB_NAME, default portfolio_bench) on
+MONGO_URL with --posts published posts, then times fetching the same pages
+both ways. Run from the backend directory:
+
+    python benchmarks/pagination_benchmark.py --posts 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from services.pagination import BLOG_SORT, encode_cursor, keyset_query
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+BENCH_DB_NAME = os.getenv("BENCH_DB_NAME", "portfolio_bench")
+
+
+async def seed(collection, count: int, batch_size: int = 5000):
+    await collection.drop()
+    base = datetime(2020, 1, 1)
+    for start in range(0, count, batch_size):
+        docs = [
+            {
+                "id": f"post-{i:08d}",
+                "title": f"Benchmark post {i}",
+                "excerpt": "Seeded for pagination benchmarks",
+                "content": "lorem ipsum " * 50,
+                "category": "Tech" if i % 2 else "Life",
+                "date": base + timedelta(minutes=i // 3),
+                "read_time": "1 min read",
+                "published": True,
+                "created_at": base,
+                "updated_at": base,
+            }
+            for i in range(start, min(start + batch_size, count))
+        ]
+        await collection.insert_many(docs, ordered=False)
+    await collection.create_index([("published", 1), ("date", -1), ("id", -1)])
+
+
+async def time_skip(collection, page: int, per_page: int) -> float:
+    started = time.perf_counter()
+    await collection.find({"published": True}).sort(BLOG_SORT).skip((page - 1) * per_page).limit(per_page).to_list(per_page)
+    return time.perf_counter() - started
+
+
+async def cursor_for_page(collection, page: int, per_page: int) -> str:
+    # The token a client would hold after reading page - 1
+    last = await collection.find({"published": True}).sort(BLOG_SORT).skip((page - 1) * per_page - 1).limit(1).to_list(1)
+    return encode_cursor(last[0])
+
+
+async def time_keyset(collection, token: str, per_page: int) -> float:
+    started = time.perf_counter()
+    await collection.find(keyset_query({"published": True}, token)).sort(BLOG_SORT).limit(per_page).to_list(per_page)
+    return time.perf_counter() - started
+
+
+async def main(args):
+    client = AsyncIOMotorClient(MONGO_URL)
+    collection = client[BENCH_DB_NAME].blog_posts
+    if not args.skip_seed:
+        await seed(collection, args.posts)
+
+    results = []
+    max_page = args.posts // args.per_page
+    for page in [p for p in (2, 10, 100, 1000, 5000, max_page) if 1 < p <= max_page]:
+        token = await cursor_for_page(collection, page, args.per_page)
+        skip_times = [await time_skip(collection, page, args.per_page) for _ in range(args.repeat)]
+        keyset_times = [await time_keyset(collection, token, args.per_page) for _ in range(args.repeat)]
+        results.append({
+            "page": page,
+            "skip_ms": round(sorted(skip_times)[len(skip_times) // 2] * 1000, 3),
+            "keyset_ms": round(sorted(keyset_times)[len(keyset_times) // 2] * 1000, 3),
+        })
+
+    started = time.perf_counter()
+    await collection.count_documents({"published": True})
+    count_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    print(json.dumps({"posts": args.posts, "per_page": args.per_page, "count_documents_ms": count_ms, "pages": results}, indent=2))
+    if not args.keep:
+        await client.drop_database(BENCH_DB_NAME)
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=100000)
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse an already seeded database")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark database afterwards")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Time building and querying the in-memory search index.
+
+Generates --docs synthetic posts and projects whose words follow a Zipf
+distribution (so a handful of terms appear in most documents, like real
+prose), loads them the way a cold build does, then times representative
+queries. "prepare_ms" is time spent sorting impact lists in a worker
+thread (the event loop keeps serving meanwhile); "first_ms", "p50_ms" and
+"p99_ms" are time on the event loop. No database is needed. Run from the
+backend directory:
+
+    python benchmarks/search_benchmark.py --docs 100000
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.search import SEARCH_SYNC_BATCH_SIZE, SearchIndex, prepare_documents
+
+QUERIES = {
+    "common_term": "lorem",
+    "two_terms": "lorem ipsum",
+    "three_terms": "lorem ipsum dolor",
+    "rare_and_common": "lorem word4000",
+    "prefix": "lorem ips",
+    "short_prefix": "wo",
+}
+
+
+def make_vocabulary(size: int):
+    words = ["lorem", "ipsum", "dolor", "sit", "amet"] + [f"word{i}" for i in range(size - 5)]
+    cumulative = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(size)))
+    return words, cumulative
+
+
+def make_documents(count: int, seed: int, vocabulary_size: int, content_words: int):
+    rng = random.Random(seed)
+    words, cumulative = make_vocabulary(vocabulary_size)
+
+    def text(n):
+        return " ".join(rng.choices(words, cum_weights=cumulative, k=n))
+
+    for i in range(count):
+        if i % 4:
+            yield "blog", {
+                "id": f"post-{i}", "title": text(8), "excerpt": text(30), "content": text(content_words),
+                "category": "Tech", "published": True,
+            }
+        else:
+            yield "project", {
+                "id": f"project-{i}", "title": text(5), "technologies": text(4).split(),
+                "description": text(60), "category": "Web",
+            }
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 3)
+
+
+def main(args):
+    index = SearchIndex()
+    documents = make_documents(args.docs, args.seed, args.vocabulary, args.content_words)
+
+    started = time.perf_counter()
+    tokenize_seconds = 0.0
+    with index._bulk():
+        while True:
+            batch = list(itertools.islice(documents, SEARCH_SYNC_BATCH_SIZE))
+            if not batch:
+                break
+            # prepare_documents is the part a build runs in the worker thread
+            tokenize_started = time.perf_counter()
+            prepared = prepare_documents(batch)
+            tokenize_seconds += time.perf_counter() - tokenize_started
+            index.apply_prepared(prepared)
+    index.prewarm_impact_lists()
+    build_seconds = time.perf_counter() - started
+
+    results = {}
+    for name, query in QUERIES.items():
+        for doc_type in (None, "blog"):
+            label = name if doc_type is None else f"{name}_type_{doc_type}"
+            # The first run may have to sort impact lists; the API does that in a worker thread
+            prepare_started = time.perf_counter()
+            asyncio.run(index.prepare(query, doc_type=doc_type))
+            prepare_ms = round((time.perf_counter() - prepare_started) * 1000, 3)
+            cold_started = time.perf_counter()
+            index.search(query, doc_type=doc_type, limit=args.limit)
+            cold_ms = round((time.perf_counter() - cold_started) * 1000, 3)
+            samples = []
+            for _ in range(args.repeat):
+                query_started = time.perf_counter()
+                index.search(query, doc_type=doc_type, limit=args.limit)
+                samples.append(time.perf_counter() - query_started)
+            results[label] = {"prepare_ms": prepare_ms, "first_ms": cold_ms, "p50_ms": percentile(samples, 0.5), "p99_ms": percentile(samples, 0.99)}
+
+    print(json.dumps({
+        "documents": len(index),
+        "terms": len(index.doc_frequency),
+        "build_seconds": round(build_seconds, 2),
+        "tokenize_seconds": round(tokenize_seconds, 2),
+        "limit": args.limit,
+        "queries": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--content-words", type=int, default=150)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the CPU cost of building list responses.
+
+"before" rebuilds Pydantic models from each document and lets FastAPI
+validate them against the response_model and encode them with its default
+JSON path. "after" is the trusted-document path the read endpoints use now:
+projected dicts plus orjson. Reports responses/sec on one core for each list
+endpoint. Run from the backend directory:
+
+    python benchmarks/serialization_benchmark.py --items 50
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from models.blog import BlogPost, BlogPostSummary, BlogPostsResponse, derive_content_fields
+from models.project import Project, ProjectsResponse
+from models.testimonial import Testimonial, TestimonialResponse
+from services.serialization import construct_documents, dump_json, response_projection
+
+
+def sample_documents(count: int):
+    base = datetime(2024, 1, 1)
+    content = "<p>Benchmark article body with a few words.</p> " * 200
+    posts = [
+        BlogPost(
+            title=f"Benchmark post {i}", excerpt="A short excerpt for the listing", content=content,
+            category="Development", published=True, date=base + timedelta(days=i), **derive_content_fields(content),
+        ).model_dump()
+        for i in range(count)
+    ]
+    projects = [
+        Project(
+            title=f"Project {i}", description="A portfolio project description " * 5,
+            technologies=["React", "FastAPI", "MongoDB"], category="Web", featured=i % 2 == 0,
+        ).model_dump()
+        for i in range(count)
+    ]
+    testimonials = [
+        Testimonial(
+            name="Jane Client", position="CTO", company="Example Ltd",
+            content="Great collaboration and delivery " * 5, approved=True,
+        ).model_dump()
+        for _ in range(count)
+    ]
+    return posts, projects, testimonials
+
+
+def project_fields(docs, model):
+    projection = response_projection(model)
+    return [{key: value for key, value in doc.items() if key in projection} for doc in docs]
+
+
+def make_cases(posts, projects, testimonials):
+    summaries = project_fields(posts, BlogPostSummary)
+    project_docs = project_fields(projects, Project)
+    testimonial_docs = project_fields(testimonials, Testimonial)
+    blog_field = create_response_field(name="blog", type_=BlogPostsResponse)
+    projects_field = create_response_field(name="projects", type_=ProjectsResponse)
+    testimonials_field = create_response_field(name="testimonials", type_=TestimonialResponse)
+
+    async def fastapi_default(field, content):
+        payload = await serialize_response(field=field, response_content=content)
+        return json.dumps(jsonable_encoder(payload)).encode()
+
+    # Before: models validated on construction, then again by FastAPI against response_model
+    return {
+        "GET /api/blog": (
+            lambda: fastapi_default(blog_field, BlogPostsResponse(
+                posts=[BlogPostSummary(**p) for p in summaries], total=len(posts), page=1, per_page=len(posts)
+            )),
+            lambda: dump_json({
+                "posts": construct_documents(BlogPostSummary, summaries),
+                "total": len(posts), "page": 1, "per_page": len(posts), "next_cursor": None,
+            }),
+        ),
+        "GET /api/projects": (
+            lambda: fastapi_default(projects_field, ProjectsResponse(projects=[Project(**p) for p in projects])),
+            lambda: dump_json({"projects": construct_documents(Project, project_docs)}),
+        ),
+        "GET /api/testimonials": (
+            lambda: fastapi_default(testimonials_field, TestimonialResponse(
+                testimonials=[Testimonial(**t) for t in testimonials]
+            )),
+            lambda: dump_json({"testimonials": construct_documents(Testimonial, testimonial_docs)}),
+        ),
+    }
+
+
+async def rate(fn, seconds: float) -> float:
+    done, started = 0, time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        result = fn()
+        if asyncio.iscoroutine(result):
+            await result
+        done += 1
+    return done / (time.perf_counter() - started)
+
+
+async def main(args):
+    cases = make_cases(*sample_documents(args.items))
+    results = {}
+    for endpoint, (before, after) in cases.items():
+        before_rate = await rate(before, args.seconds)
+        after_rate = await rate(after, args.seconds)
+        results[endpoint] = {
+            "before_rps": round(before_rate, 1),
+            "after_rps": round(after_rate, 1),
+            "speedup": round(after_rate / before_rate, 2),
+        }
+    print(json.dumps({"items_per_response": args.items, "endpoints": results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
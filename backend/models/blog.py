@@ -1,15 +1,45 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
+import hashlib
 import uuid
 import re
 
-def calculate_read_time(content: str) -> str:
-    """Calculate estimated read time based on content length"""
-    words = len(re.findall(r'\w+', content))
+WORD_RE = re.compile(r'\w+')
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+MARKDOWN_LINK_RE = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+MARKDOWN_SYMBOL_RE = re.compile(r'[#*_`>~|]+')
+WHITESPACE_RE = re.compile(r'\s+')
+TEXT_EXCERPT_LENGTH = 200
+
+def read_time_for_words(words: int) -> str:
     minutes = max(1, round(words / 200))  # Average reading speed: 200 words/min
     return f"{minutes} min read"
 
+def calculate_read_time(content: str) -> str:
+    """Calculate estimated read time based on content length"""
+    return read_time_for_words(len(WORD_RE.findall(content)))
+
+def plain_text_excerpt(content: str, length: int = TEXT_EXCERPT_LENGTH) -> str:
+    """Strip HTML/markdown markup and cut at a word boundary"""
+    text = HTML_TAG_RE.sub(' ', content)
+    text = MARKDOWN_LINK_RE.sub(r'\1', text)
+    text = MARKDOWN_SYMBOL_RE.sub(' ', text)
+    text = WHITESPACE_RE.sub(' ', text).strip()
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(' ', 1)[0] + '…'
+
+def derive_content_fields(content: str) -> dict:
+    """Everything computed from the article body; run once when content is written"""
+    words = len(WORD_RE.findall(content))
+    return {
+        "word_count": words,
+        "read_time": read_time_for_words(words),
+        "text_excerpt": plain_text_excerpt(content),
+        "content_hash": hashlib.sha256(content.encode()).hexdigest(),
+    }
+
 class BlogPost(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str = Field(..., min_length=5, max_length=200)
@@ -19,15 +49,14 @@ class BlogPost(BaseModel):
     image: Optional[str] = None
     date: datetime = Field(default_factory=datetime.utcnow)
     read_time: str = Field(default="")
+    # Derived from content at write time by derive_content_fields
+    word_count: int = Field(default=0)
+    text_excerpt: str = Field(default="")
+    content_hash: str = Field(default="")
     published: bool = Field(default=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        if not self.read_time and self.content:
-            self.read_time = calculate_read_time(self.content)
-
 class BlogPostCreate(BaseModel):
     title: str = Field(..., min_length=5, max_length=200)
     excerpt: str = Field(..., min_length=10, max_length=500)
@@ -44,8 +73,33 @@ class BlogPostUpdate(BaseModel):
     image: Optional[str] = None
     published: Optional[bool] = None
 
+class BlogPostSummary(BaseModel):
+    """Listing view of a post; the article body is only served by GET /api/blog/{post_id}"""
+    id: str
+    title: str
+    excerpt: str
+    category: str
+    image: Optional[str] = None
+    date: datetime
+    read_time: str = ""
+
+class BlogPostDetail(BaseModel):
+    """A post as GET /api/blog/{post_id} serves it; the write-time derivations stay internal"""
+    id: str
+    title: str
+    excerpt: str
+    content: str
+    category: str
+    image: Optional[str] = None
+    date: datetime
+    read_time: str = ""
+    published: bool = False
+    created_at: datetime
+    updated_at: datetime
+
 class BlogPostsResponse(BaseModel):
-    posts: List[BlogPost]
-    total: int
+    posts: List[BlogPostSummary]
+    total: Optional[int] = None
     page: int
-    per_page: int
\ No newline at end of file
+    per_page: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
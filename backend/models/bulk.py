@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+
+class BulkItemError(BaseModel):
+    index: int
+    error: str
+
+class BulkInsertResponse(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: List[BulkItemError]
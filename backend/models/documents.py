@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple, Type, TypeVar
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+@lru_cache(maxsize=None)
+def _field_defaults(model: Type[BaseModel]) -> Tuple[Dict[str, Any], Dict[str, Callable[[], Any]]]:
+    static, factories = {}, {}
+    for name, field in model.model_fields.items():
+        if field.default_factory is not None:
+            factories[name] = field.default_factory
+        elif field.default is not PydanticUndefined:
+            static[name] = field.default
+    return static, factories
+
+def new_document(model: Type[BaseModel], data: BaseModel, **overrides) -> Dict[str, Any]:
+    """Turn a validated *Create payload into a storage document for ``model`` in one pass.
+
+    Defaults are filled in without re-validating; every utcnow-based
+    timestamp on the document shares a single clock reading.
+    """
+    static, factories = _field_defaults(model)
+    doc = {**static, **data.model_dump(), **overrides}
+    now = None
+    for name, factory in factories.items():
+        if name in doc:
+            continue
+        if factory is datetime.utcnow:
+            now = now or datetime.utcnow()
+            doc[name] = now
+        else:
+            doc[name] = factory()
+    return doc
+
+def create_document(model: Type[ModelT], data: BaseModel, **overrides) -> Tuple[Dict[str, Any], ModelT]:
+    """Like ``new_document``, plus the response model built without validation"""
+    doc = new_document(model, data, **overrides)
+    # model_construct copies the values, so Mongo adding "_id" to doc on insert does not leak
+    return doc, model.model_construct(**doc)
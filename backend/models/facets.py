@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class CategoryCount(BaseModel):
+    name: str
+    count: int
+    # Projects only: how many in the category are featured
+    featured: Optional[int] = None
+
+class CategoriesResponse(BaseModel):
+    total: int
+    featured: Optional[int] = None
+    categories: List[CategoryCount]
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import List
+
+from models.blog import BlogPostSummary
+from models.project import Project
+from models.testimonial import Testimonial
+
+class HomeResponse(BaseModel):
+    """Every section the landing page renders, fetched in one request"""
+    projects: List[Project]
+    featured_projects: List[Project]
+    testimonials: List[Testimonial]
+    posts: List[BlogPostSummary]
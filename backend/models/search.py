@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class SearchResult(BaseModel):
+    type: str
+    id: str
+    title: str
+    category: Optional[str] = None
+    summary: str = ""
+    score: float
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    results: List[SearchResult]
+    took_ms: float
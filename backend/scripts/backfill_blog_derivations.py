@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Backfill write-time derived fields (word_count, read_time, text_excerpt,
+content_hash) on blog posts stored before they existed, or whose content
+changed outside the API. Touched posts get a new updated_at, so running
+workers see the collection version move and stop serving the old bodies.
+Run from the backend directory:
+
+    python scripts/backfill_blog_derivations.py [--dry-run] [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from models.blog import derive_content_fields
+
+load_dotenv(Path(__file__).resolve().parent.parent / '.env')
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = os.getenv("DB_NAME", "portfolio")
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("backfill")
+
+
+async def backfill(db, batch_size: int, dry_run: bool) -> dict:
+    scanned, updated = 0, 0
+    pending = []
+    now = datetime.utcnow()
+    cursor = db.blog_posts.find({}, {"_id": 1, "content": 1, "content_hash": 1}).batch_size(batch_size)
+    async for post in cursor:
+        scanned += 1
+        content = post.get("content") or ""
+        if post.get("content_hash") == hashlib.sha256(content.encode()).hexdigest():
+            continue
+        # updated_at moves too, or version tokens (and cached responses) would never notice the new fields
+        pending.append(UpdateOne({"_id": post["_id"]}, {"$set": {**derive_content_fields(content), "updated_at": now}}))
+        if len(pending) >= batch_size:
+            updated += await flush(db, pending, dry_run)
+    updated += await flush(db, pending, dry_run)
+    return {"scanned": scanned, "updated": updated}
+
+
+async def flush(db, pending: list, dry_run: bool) -> int:
+    count = len(pending)
+    if pending and not dry_run:
+        await db.blog_posts.bulk_write(pending, ordered=False)
+    pending.clear()
+    return count
+
+
+async def main(args):
+    client = AsyncIOMotorClient(MONGO_URL)
+    result = await backfill(client[DB_NAME], args.batch_size, args.dry_run)
+    verb = "Would update" if args.dry_run else "Updated"
+    logger.info(f"{verb} {result['updated']} of {result['scanned']} blog posts")
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Render the public read endpoints to static, pre-compressed JSON snapshots.
+
+Reads every published post, project and approved testimonial in one pass
+and writes the exact bodies GET /api/blog (each category and page),
+/api/blog/{post_id}, /api/projects (each category/featured filter) and
+/api/testimonials would return, each with .gz and .br variants, plus a
+sitemap.xml listing every post with its lastmod. Point the API at the same
+directory with SNAPSHOT_DIR and it serves these files without querying
+MongoDB until the data changes. Run from the backend directory, e.g. after
+publishing or on a schedule:
+
+    python scripts/render_snapshots.py --output snapshots --sitemap ../frontend/public/sitemap.xml
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from models.blog import BlogPostDetail, BlogPostSummary
+from models.project import Project
+from models.testimonial import Testimonial
+from services.conditional import COLLECTION_VERSION_SOURCES, CollectionVersions
+from services.pagination import BLOG_SORT, encode_cursor
+from services.serialization import construct_documents, dump_json, response_projection
+from services.snapshots import SNAPSHOT_DIR, SnapshotWriter, render_sitemap, snapshot_name
+
+load_dotenv(Path(__file__).resolve().parent.parent / '.env')
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = os.getenv("DB_NAME", "portfolio")
+SITE_URL = os.getenv("SITE_URL", "https://janiduperera.netlify.app")
+
+# Same pages as frontend/generate-sitemap.js
+STATIC_PAGES = ["", "about", "skills", "projects", "education", "blog", "testimonials", "contact"]
+# The list endpoints return at most this many projects/testimonials
+LIST_LIMIT = 100
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("render_snapshots")
+
+
+class ConcurrentWrite(Exception):
+    pass
+
+
+async def read_content(db):
+    """Load everything in one pass, bracketed by version tokens so a concurrent write is detected"""
+    versions = CollectionVersions(db, COLLECTION_VERSION_SOURCES)
+    before = {name: (await versions.refresh(name))["token"] for name in COLLECTION_VERSION_SOURCES}
+    posts = await db.blog_posts.find({"published": True}, response_projection(BlogPostDetail)).sort(BLOG_SORT).to_list(None)
+    projects = await db.projects.find({}, response_projection(Project)).sort("created_at", -1).to_list(None)
+    testimonials = await db.testimonials.find(
+        {"approved": True}, response_projection(Testimonial)
+    ).sort("created_at", -1).to_list(LIST_LIMIT)
+    after = {name: (await versions.refresh(name))["token"] for name in COLLECTION_VERSION_SOURCES}
+    if before != after:
+        raise ConcurrentWrite(f"collections changed while reading: {sorted(k for k in before if before[k] != after[k])}")
+    return before, posts, projects, testimonials
+
+
+def render_blog(writer: SnapshotWriter, posts, per_page: int):
+    summary_fields = set(response_projection(BlogPostSummary)) - {"_id"}
+    categories = sorted({post["category"] for post in posts})
+    for category in [None, *categories]:
+        group = posts if category is None else [post for post in posts if post["category"] == category]
+        total = len(group)
+        for page in range(1, max(1, math.ceil(total / per_page)) + 1):
+            chunk = group[(page - 1) * per_page:page * per_page]
+            summaries = [{k: v for k, v in post.items() if k in summary_fields} for post in chunk]
+            writer.write(snapshot_name("blog", category=category, page=page, per_page=per_page), dump_json({
+                "posts": construct_documents(BlogPostSummary, summaries),
+                "total": total,
+                "page": page,
+                "per_page": per_page,
+                "next_cursor": encode_cursor(chunk[-1]) if page * per_page < total else None,
+            }))
+    for post in construct_documents(BlogPostDetail, posts):
+        writer.write(snapshot_name("blog_post", post_id=post["id"]), dump_json(post))
+
+
+def render_projects(writer: SnapshotWriter, projects):
+    categories = sorted({project["category"] for project in projects})
+    for category in [None, *categories]:
+        for featured in (None, True, False):
+            matching = [
+                project for project in projects
+                if (category is None or project["category"] == category)
+                and (featured is None or project.get("featured") == featured)
+            ][:LIST_LIMIT]
+            writer.write(
+                snapshot_name("projects", category=category, featured=featured),
+                dump_json({"projects": construct_documents(Project, matching)}),
+            )
+
+
+def newest(docs, field: str):
+    return max((doc[field] for doc in docs if doc.get(field)), default=None)
+
+
+async def main(args):
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[DB_NAME]
+    started = time.perf_counter()
+    for attempt in range(1, args.attempts + 1):
+        try:
+            versions, posts, projects, testimonials = await read_content(db)
+            break
+        except ConcurrentWrite as e:
+            logger.warning(f"Attempt {attempt}: {str(e)}")
+            if attempt == args.attempts:
+                client.close()
+                sys.exit("Content kept changing while rendering; try again later")
+            await asyncio.sleep(1)
+    client.close()
+
+    writer = SnapshotWriter(args.output, gzip_level=args.gzip_level, brotli_quality=args.brotli_quality)
+    render_blog(writer, posts, args.per_page)
+    render_projects(writer, projects)
+    writer.write(snapshot_name("testimonials"), dump_json({"testimonials": construct_documents(Testimonial, testimonials)}))
+
+    lastmod = {
+        "blog": newest(posts, "updated_at"),
+        "projects": newest(projects, "created_at"),
+        "testimonials": newest(testimonials, "created_at"),
+    }
+    sitemap = render_sitemap(args.site_url, [(page, lastmod.get(page)) for page in STATIC_PAGES], posts)
+    writer.write_file("sitemap.xml", sitemap)
+    if args.sitemap:
+        Path(args.sitemap).write_text(sitemap)
+
+    writer.publish({
+        "rendered_at": datetime.utcnow().isoformat(),
+        "versions": versions,
+        "per_page": args.per_page,
+        "counts": {"posts": len(posts), "projects": len(projects), "testimonials": len(testimonials)},
+    })
+    logger.info(
+        f"Rendered {writer.files} snapshots to {writer.directory} in {time.perf_counter() - started:.2f}s "
+        f"({writer.bytes['identity']} bytes, gzip {writer.bytes['gzip']}, br {writer.bytes['br']})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=SNAPSHOT_DIR or "snapshots")
+    parser.add_argument("--per-page", type=int, default=10, help="page size of the rendered blog listings")
+    parser.add_argument("--site-url", default=SITE_URL)
+    parser.add_argument("--sitemap", help="also write sitemap.xml here, e.g. ../frontend/public/sitemap.xml")
+    parser.add_argument("--gzip-level", type=int, default=9)
+    parser.add_argument("--brotli-quality", type=int, default=11)
+    parser.add_argument("--attempts", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
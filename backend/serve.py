@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Production launcher: runs several uvicorn workers sharing one listening socket.
+
+Workers default to one per CPU core (WEB_CONCURRENCY overrides). Signals:
+
+    SIGHUP           start a fresh set of workers with reloaded code, then
+                     gracefully stop the old set once the new one is serving
+    SIGTERM/SIGINT   stop every worker after in-flight requests finish
+
+Crashed workers are replaced. Workers invalidate each other's caches
+through INVALIDATION_BACKEND: "ipc" (Unix sockets in a temporary
+directory) unless it is already set, e.g. to "changestream" when the
+workers span several hosts. Run from the backend directory:
+
+    python serve.py --port 8001 --workers 4
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import time
+from typing import List, Tuple
+
+import uvicorn
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("serve")
+
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0")) or os.cpu_count() or 1
+GRACEFUL_TIMEOUT = float(os.getenv("GRACEFUL_TIMEOUT", "30"))
+# How long a reloaded worker set gets to finish startup before the reload is abandoned
+RELOAD_TIMEOUT = float(os.getenv("RELOAD_TIMEOUT", "60"))
+RESTART_BACKOFF = 1.0
+
+
+class WorkerServer(uvicorn.Server):
+    """uvicorn server that reports back once the app's lifespan startup has finished"""
+
+    def __init__(self, config: uvicorn.Config, ready):
+        super().__init__(config)
+        self.ready = ready
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            self.ready.set()
+
+
+def run_worker(sock, options: dict, ready):
+    config = uvicorn.Config("server:app", **options)
+    WorkerServer(config, ready).run(sockets=[sock])
+
+
+class Supervisor:
+    def __init__(self, sock, workers: int, options: dict):
+        self.sock = sock
+        self.workers = workers
+        self.options = options
+        self.context = multiprocessing.get_context("spawn")
+        self.processes: List[Tuple[multiprocessing.Process, object]] = []
+        self.should_exit = False
+        self.reload_requested = False
+
+    def spawn(self):
+        ready = self.context.Event()
+        process = self.context.Process(target=run_worker, args=(self.sock, self.options, ready), name="worker")
+        process.start()
+        logger.info(f"Started worker {process.pid}")
+        return process, ready
+
+    def stop(self, processes):
+        for process, _ in processes:
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT + 5
+        for process, _ in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Worker {process.pid} did not stop in time, killing it")
+                process.kill()
+                process.join()
+
+    def reload(self):
+        self.reload_requested = False
+        logger.info("Reloading: starting a new set of workers")
+        fresh = [self.spawn() for _ in range(self.workers)]
+        deadline = time.monotonic() + RELOAD_TIMEOUT
+        for process, ready in fresh:
+            while not ready.wait(0.5):
+                if not process.is_alive() or time.monotonic() > deadline or self.should_exit:
+                    logger.error("New workers failed to start, keeping the current ones")
+                    self.stop(fresh)
+                    return
+        old, self.processes = self.processes, fresh
+        self.stop(old)
+        logger.info("Reload complete")
+
+    def replace_dead_workers(self):
+        for index, (process, _) in enumerate(self.processes):
+            if not process.is_alive():
+                logger.warning(f"Worker {process.pid} exited with code {process.exitcode}, replacing it")
+                time.sleep(RESTART_BACKOFF)
+                self.processes[index] = self.spawn()
+
+    def run(self):
+        signal.signal(signal.SIGHUP, self._request_reload)
+        signal.signal(signal.SIGTERM, self._request_exit)
+        signal.signal(signal.SIGINT, self._request_exit)
+        self.processes = [self.spawn() for _ in range(self.workers)]
+        while not self.should_exit:
+            time.sleep(0.5)
+            if self.reload_requested:
+                self.reload()
+            elif not self.should_exit:
+                self.replace_dead_workers()
+        logger.info("Shutting down workers")
+        self.stop(self.processes)
+
+    def _request_reload(self, signum, frame):
+        self.reload_requested = True
+
+    def _request_exit(self, signum, frame):
+        self.should_exit = True
+
+
+def main(args):
+    # Inherited by the spawned workers
+    os.environ.setdefault("INVALIDATION_BACKEND", "ipc")
+    socket_dir = None
+    if os.environ["INVALIDATION_BACKEND"] == "ipc" and not os.getenv("INVALIDATION_SOCKET_DIR"):
+        # Ours to clean up; a directory passed in by the caller is left alone
+        socket_dir = tempfile.mkdtemp(prefix="portfolio-invalidation-")
+        os.environ["INVALIDATION_SOCKET_DIR"] = socket_dir
+    if args.workers > 1 and os.getenv("RATE_LIMIT_BACKEND", "memory") == "memory":
+        logger.warning("Rate limits are per worker; set RATE_LIMIT_BACKEND=mongo to share them")
+
+    options = {
+        "log_level": args.log_level,
+        "proxy_headers": True,
+        "forwarded_allow_ips": os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        "timeout_graceful_shutdown": GRACEFUL_TIMEOUT,
+    }
+    sock = uvicorn.Config("server:app", host=args.host, port=args.port).bind_socket()
+    logger.info(f"Serving on {args.host}:{args.port} with {args.workers} workers")
+    try:
+        Supervisor(sock, args.workers, options).run()
+    finally:
+        sock.close()
+        if socket_dir is not None:
+            shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY)
+    parser.add_argument("--log-level", default="info")
+    main(parser.parse_args())
@@ -1,22 +1,51 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 from datetime import datetime
 from uuid import uuid4
+from pymongo import ReturnDocument
 
 # Import models
 from models.contact import ContactSubmission, ContactSubmissionCreate, ContactSubmissionResponse
-from models.blog import BlogPost, BlogPostCreate, BlogPostUpdate, BlogPostsResponse, calculate_read_time
+from models.blog import (
+    BlogPost, BlogPostCreate, BlogPostDetail, BlogPostUpdate, BlogPostSummary, BlogPostsResponse, derive_content_fields
+)
 from models.testimonial import Testimonial, TestimonialCreate, TestimonialResponse
 from models.project import Project, ProjectCreate, ProjectsResponse
+from models.bulk import BulkInsertResponse
+from models.facets import CategoriesResponse
+from models.home import HomeResponse
+from models.documents import create_document, new_document
+from models.search import SearchResponse
+from services.bulk import BULK_CHUNK_SIZE, bulk_insert, iter_request_items
+from services.cache import ResponseCache, TTLCache, cache_key
+from services.compression import ENCODINGS, CompressionMiddleware, Compressor
+from services.conditional import (
+    COLLECTION_VERSION_SOURCES, CollectionVersions, GroupedVersions, encoded_etag, is_not_modified, make_etag,
+    validator_headers,
+)
+from services.database import Database
+from services.facets import FacetCounts
+from services.indexes import provision_indexes
+from services.invalidation import build_invalidation_channel
+from services.mailer import SMTPConnectionPool, build_contact_message
+from services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, MongoCommandMetrics, record_smtp_send, render_metrics
+from services.outbox import EmailOutbox
+from services.serialization import construct_documents, dump_json, response_projection
+from services.search import BLOG_FIELDS, SEARCH_SNAPSHOT_PATH, SearchIndex
+from services.singleflight import SingleFlight
+from services.snapshots import SnapshotStore, snapshot_name
+from services.pagination import BLOG_SORT, CONTACT_EXPORT_SORT, InvalidCursor, encode_cursor, keyset_query, resume_query
+from services.profiling import ProfilingMiddleware, phase, profiling_enabled
+from services.ratelimit import RateLimitMiddleware, build_rate_limit_backend, default_limits
 from pydantic import BaseModel, EmailStr
 
 ROOT_DIR = Path(__file__).parent
@@ -25,15 +54,35 @@ load_dotenv(ROOT_DIR / '.env')
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "portfolio")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
+CONTACT_EXPORT_BATCH_SIZE = int(os.getenv("CONTACT_EXPORT_BATCH_SIZE", "200"))
+# Default section sizes of GET /api/home; each can be overridden per request
+HOME_PROJECTS_LIMIT = int(os.getenv("HOME_PROJECTS_LIMIT", "12"))
+HOME_FEATURED_LIMIT = int(os.getenv("HOME_FEATURED_LIMIT", "3"))
+HOME_TESTIMONIALS_LIMIT = int(os.getenv("HOME_TESTIMONIALS_LIMIT", "6"))
+HOME_POSTS_LIMIT = int(os.getenv("HOME_POSTS_LIMIT", "3"))
 
-# MongoDB client
-client = AsyncIOMotorClient(MONGO_URL)
-db = client[DB_NAME]
+# MongoDB (the Motor client itself is created by the lifespan handler)
+db = Database(MONGO_URL, DB_NAME, event_listeners=[MongoCommandMetrics()])
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await startup()
+    try:
+        yield
+    finally:
+        await shutdown()
 
 # FastAPI app
-app = FastAPI(title="Janidu Portfolio API", version="1.0.0")
+app = FastAPI(title="Janidu Portfolio API", version="1.0.0", default_response_class=ORJSONResponse, lifespan=lifespan)
 api_router = APIRouter(prefix="/api")
 
+# Response compression (innermost, so it sees bodies exactly as the handlers produced them)
+compressor = Compressor()
+app.add_middleware(CompressionMiddleware, compressor=compressor)
+
+# Rate limiting (added before CORS so 429 responses still carry CORS headers)
+app.add_middleware(RateLimitMiddleware, limits=default_limits(), backend=build_rate_limit_backend(db))
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -43,6 +92,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Sampled profiling, only installed when PROFILE_SAMPLE_RATE or PROFILE_ADMIN_TOKEN is set
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+
+# Metrics (outermost, so rate-limited requests are counted too)
+app.add_middleware(MetricsMiddleware, router=app.router)
+
 # Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -51,35 +107,213 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # ---------------------
-# SMTP Email Function
+# SMTP Email Delivery
 # ---------------------
-def send_contact_email(name: str, sender_email: str, subject: str, message: str):
-    receiver_email = os.getenv("EMAIL_TO")
-    smtp_user = os.getenv("EMAIL_USER")
-    smtp_password = os.getenv("EMAIL_PASSWORD")
+smtp_pool = SMTPConnectionPool(on_send=record_smtp_send)
+
+async def send_contact_emails(payloads):
+    """Send a batch of contact notifications over one pooled SMTP session"""
+    messages, errors = [], [None] * len(payloads)
+    for i, payload in enumerate(payloads):
+        try:
+            messages.append((i, build_contact_message(**payload)))
+        except Exception as e:
+            errors[i] = e
+    if messages:
+        results = await smtp_pool.send_many([msg for _, msg in messages])
+        for (i, _), error in zip(messages, results):
+            errors[i] = error
+    logger.info(f"Sent {errors.count(None)}/{len(payloads)} contact emails")
+    return errors
+
+# Deliveries are drained by a background worker so SMTP never blocks a request;
+# created on startup once the database is connected
+email_outbox: Optional[EmailOutbox] = None
+
+# ---------------------
+# Response Cache
+# ---------------------
+response_cache = ResponseCache()
+# Concurrent misses for the same cache key share one database load
+read_flights = SingleFlight()
+# Published posts per category and projects per category/featured, kept current by the write paths
+blog_facets = FacetCounts("blog_posts", {"published": True}, ["category"])
+project_facets = FacetCounts("projects", {}, ["category", "featured"])
+COLLECTION_FACETS = {"blog_posts": blog_facets, "projects": project_facets}
+# updated_at of recently read posts; a post's own validators don't change when other posts do
+blog_post_versions: TTLCache[datetime] = TTLCache()
+
+# Post fields that show up in listings and in the search index; other edits leave those alone
+BLOG_LISTING_FIELDS = set(BlogPostSummary.model_fields) | {"published"}
+BLOG_SEARCH_FIELDS = set(BLOG_FIELDS) | {"category", "published"}
 
-    if not all([receiver_email, smtp_user, smtp_password]):
-        raise Exception("Email environment variables not set")
+# Collections whose changes are picked up outside the API drop their whole namespace
+COLLECTION_NAMESPACES = {
+    "blog_posts": ("blog", "blog_post", "home"),
+    "testimonials": ("testimonials", "home"),
+    "projects": ("projects", "home"),
+}
 
-    msg = MIMEMultipart()
-    msg["From"] = smtp_user
-    msg["To"] = receiver_email
-    msg["Subject"] = f"Portfolio Contact Form: {subject}"
+def invalidate_reads(namespace: str, match=None):
+    """Drop cached bodies and detach in-flight loads that may predate a write"""
+    # The refills that follow must not read a secondary that lacks the write
+    db.mark_write()
+    response_cache.invalidate(namespace, match)
+    read_flights.forget(lambda key: key[0] == namespace and (match is None or match(dict(key[1]))))
 
-    body = f"""
-New message from portfolio contact form:
+def invalidate_collection(name: str):
+    for namespace in COLLECTION_NAMESPACES[name]:
+        invalidate_reads(namespace)
+    if name in COLLECTION_FACETS:
+        COLLECTION_FACETS[name].invalidate()
+    if name == "blog_posts":
+        blog_post_versions.clear()
+        blog_listing_versions.invalidate()
 
-Name: {name}
-Email: {sender_email}
-Subject: {subject}
-Message: {message}
-"""
-    msg.attach(MIMEText(body, "plain"))
+def blog_post_changed(post: dict, previous: Optional[dict] = None, fields: Optional[Iterable[str]] = None):
+    """Drop the cached reads a post appears in and (re)index it.
 
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-        server.login(smtp_user, smtp_password)
-        server.send_message(msg)
-    logger.info(f"Email sent to {receiver_email} from {sender_email}")
+    Updates pass the changed ``fields`` and the ``previous`` published and
+    category values, so only the listings the post leaves or enters are
+    dropped, and only when a listed field changed. Creates pass neither.
+    """
+    fields = set(fields) if fields is not None else None
+    invalidate_reads("blog_post", lambda p: p["post_id"] == post["id"])
+    blog_post_versions.invalidate(post["id"])
+    blog_listing_versions.invalidate()
+    if fields is None or fields & BLOG_LISTING_FIELDS:
+        if previous is None and fields is not None and "category" in fields:
+            # Moved from an unknown category (change stream updates carry no old values)
+            invalidate_reads("blog")
+            invalidate_reads("home")
+        else:
+            if previous is not None:
+                listed = [doc for doc in (previous, post) if doc.get("published")]
+            else:
+                # Updates with unknown old values may have just been unpublished
+                listed = [post] if fields is not None or post.get("published") else []
+            categories = {doc["category"] for doc in listed}
+            if categories:
+                invalidate_reads("blog", lambda p: p["category"] is None or p["category"] in categories)
+                invalidate_reads("home")
+    if fields is None or fields & BLOG_SEARCH_FIELDS:
+        search_index.add_blog_post(post)
+
+def project_changed(project: dict):
+    search_index.add_project(project)
+    invalidate_reads("projects", lambda p: (
+        p["category"] in (None, project["category"]) and p["featured"] in (None, project["featured"])
+    ))
+    invalidate_reads("home")
+
+def testimonial_changed(testimonial: dict):
+    # Submissions start unapproved, so they only show up once approved
+    if testimonial.get("approved"):
+        invalidate_reads("testimonials")
+        invalidate_reads("home")
+
+DOCUMENT_CHANGE_HANDLERS = {
+    "blog_posts": blog_post_changed,
+    "projects": project_changed,
+    "testimonials": testimonial_changed,
+}
+
+collection_versions = CollectionVersions(
+    db,
+    COLLECTION_VERSION_SOURCES,
+    on_change=invalidate_collection,
+)
+# Per-category tokens, so a post edit only changes the validators of the listings it appears in
+blog_listing_versions = GroupedVersions(db, "blog_posts", {"published": True}, "category", "updated_at")
+
+# ---------------------
+# Cross-worker Invalidation
+# ---------------------
+# Created on startup; NullChannel unless INVALIDATION_BACKEND is set (serve.py sets it)
+invalidation_channel = None
+
+async def publish_change(collection: str, doc_id: Optional[str] = None, since: Optional[datetime] = None, **details):
+    """Tell the other workers a collection changed; they evict from their own caches"""
+    event = {"collection": collection, "id": doc_id, "since": since.isoformat() if since else None, **details}
+    try:
+        await invalidation_channel.publish(event)
+    except Exception as e:
+        # Peers still converge through their periodic version refresh
+        logger.error(f"Failed to publish invalidation for {collection}: {str(e)}")
+
+async def apply_remote_change(event: dict):
+    collection = event["collection"]
+    if collection not in DOCUMENT_CHANGE_HANDLERS:
+        return
+    await collection_versions.refresh(collection)
+    if collection in COLLECTION_FACETS:
+        # Whether the peer inserted or updated is unknown here, so recount on next use
+        COLLECTION_FACETS[collection].invalidate()
+    doc = await db[collection].find_one({"id": event["id"]}, {"_id": 0}) if event.get("id") else None
+    if doc is not None:
+        if collection == "blog_posts":
+            blog_post_changed(doc, previous=event.get("previous"), fields=event.get("fields"))
+        else:
+            DOCUMENT_CHANGE_HANDLERS[collection](doc)
+        return
+    # Bulk writes evict everything cached from the collection
+    invalidate_collection(collection)
+    if collection in ("blog_posts", "projects") and event.get("since"):
+        await search_index.sync(db, since=datetime.fromisoformat(event["since"]))
+
+def json_response(body: bytes, headers: Optional[dict] = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def cached_response(request: Request, key, body: bytes, headers: dict) -> Response:
+    """Serve a cached body, compressing it at most once per encoding while it stays cached"""
+    encoding = compressor.negotiate(request.headers.get("accept-encoding", ""), len(body))
+    if encoding == "identity":
+        return json_response(body, headers)
+    data = response_cache.get_variant(key, encoding)
+    if data is None:
+        data = compressor.compress(body, encoding)
+        response_cache.set_variant(key, encoding, data)
+    headers = {**headers, "ETag": encoded_etag(headers["ETag"], encoding), "Content-Encoding": encoding}
+    return Response(content=data, media_type="application/json", headers=headers)
+
+def conditional_headers(request: Request, etag: str, last_modified: Optional[datetime]):
+    """Return validator headers, plus a 304 response when the client copy is current"""
+    headers = validator_headers(etag, last_modified)
+    headers["Vary"] = "Accept-Encoding"
+    # The client may hold any encoding of the representation; all share one version
+    for encoding in ("identity", *ENCODINGS):
+        candidate = encoded_etag(etag, encoding)
+        if is_not_modified(request.headers, candidate, last_modified):
+            return headers, Response(status_code=304, headers={**headers, "ETag": candidate})
+    return headers, None
+
+async def check_not_modified(request: Request, collection: str, *parts, token: Optional[str] = None):
+    """Validators derived from the collection version (or a narrower ``token``) and the request parameters"""
+    version = await collection_versions.get(collection)
+    return conditional_headers(request, make_etag(token or version["token"], *parts), version["last_modified"])
+
+def post_validators(request: Request, post_id: str, updated_at: datetime):
+    """Validators of a single post, derived from its own updated_at"""
+    return conditional_headers(request, make_etag("blog_post", post_id, updated_at.isoformat()), updated_at)
+
+# ---------------------
+# Static Snapshots
+# ---------------------
+# Rendered by scripts/render_snapshots.py; used only while SNAPSHOT_DIR is set
+snapshot_store = SnapshotStore()
+
+async def snapshot_response(request: Request, collection: str, headers: dict, name: str) -> Optional[Response]:
+    """Serve a pre-rendered, pre-compressed body while it still matches the collection version"""
+    if not snapshot_store.enabled:
+        return None
+    version = await collection_versions.get(collection)
+    variants = await snapshot_store.lookup(collection, version["token"], name)
+    if variants is None:
+        return None
+    encoding, body = snapshot_store.select(variants, request.headers.get("accept-encoding", ""))
+    if encoding != "identity":
+        headers = {**headers, "ETag": encoded_etag(headers["ETag"], encoding), "Content-Encoding": encoding}
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # ---------------------
 # Root & Health
@@ -88,156 +322,562 @@ Message: {message}
 async def root():
     return {"message": "Janidu Portfolio API", "status": "active"}
 
+@api_router.get("/health")
+async def health():
+    """Readiness probe: ping latency and connection pool saturation"""
+    mongo = await db.health()
+    status_code = 503 if mongo["status"] == "unavailable" else 200
+    return ORJSONResponse({"status": mongo["status"], "mongo": mongo}, status_code=status_code)
+
 # ---------------------
 # Contact Endpoints
 # ---------------------
 @api_router.post("/contact", response_model=ContactSubmissionResponse)
 async def submit_contact_form(contact_data: ContactSubmissionCreate):
     try:
-        contact = ContactSubmission(**contact_data.dict())
-        await db.contacts.insert_one(contact.dict())
-
-        # Send email
-        try:
-            send_contact_email(
-                name=contact.name,
-                sender_email=contact.email,
-                subject=contact.subject or "No Subject",
-                message=contact.message
-            )
-        except Exception as e:
-            logger.error(f"Failed to send email: {str(e)}")
-            return ContactSubmissionResponse(
-                success=True,
-                message=f"Message saved but failed to send email: {str(e)}",
-                id=contact.id
-            )
-
-        logger.info(f"New contact submission from {contact.email}")
-        return ContactSubmissionResponse(
-            success=True,
-            message="Thank you for your message! I'll get back to you soon.",
-            id=contact.id
-        )
+        with phase("construct"):
+            doc, contact = create_document(ContactSubmission, contact_data)
+        with phase("query"):
+            await db.contacts.insert_one(doc)
     except Exception as e:
         logger.error(f"Error submitting contact form: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to submit contact form")
 
+    # Delivery itself happens in the outbox worker; this is the enqueue. The
+    # submission is already stored, so failing here must not become a 500
+    # that invites the visitor to send it again.
+    try:
+        with phase("email"):
+            await email_outbox.enqueue(contact.id, {
+                "name": contact.name,
+                "sender_email": contact.email,
+                "subject": contact.subject or "No Subject",
+                "message": contact.message,
+            })
+    except Exception as e:
+        logger.error(f"Contact {contact.id} stored but its notification was not queued: {str(e)}")
+
+    logger.info(f"New contact submission from {contact.email}")
+    return ContactSubmissionResponse(
+        success=True,
+        message="Thank you for your message! I'll get back to you soon.",
+        id=contact.id
+    )
+
+async def stream_contact_submissions(query: dict):
+    """Yield submissions oldest first as NDJSON, one Motor batch in memory at a time"""
+    cursor = db.contacts.find(query, {"_id": 0}).sort(CONTACT_EXPORT_SORT).batch_size(CONTACT_EXPORT_BATCH_SIZE)
+    count = 0
+    try:
+        async for doc in cursor:
+            # Starlette awaits each send, so a slow client pauses the cursor here
+            yield ContactSubmission(**doc).model_dump_json() + "\n"
+            count += 1
+    except Exception as e:
+        logger.error(f"Contact export aborted after {count} rows: {str(e)}")
+        raise
+    finally:
+        await cursor.close()
+    logger.info(f"Streamed {count} contact submissions")
+
 @api_router.get("/contact")
-async def get_contact_submissions():
+async def get_contact_submissions(
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    since: Optional[datetime] = Query(None),
+    since_id: Optional[str] = Query(None)
+):
+    query = resume_query({}, since, since_id) if since else {}
+    if format == "ndjson":
+        # Resume a previous export by passing the last row's created_at as ?since= and its id as ?since_id=
+        return StreamingResponse(stream_contact_submissions(query), media_type="application/x-ndjson")
     try:
-        contacts = await db.contacts.find().sort("created_at", -1).to_list(100)
+        contacts = await db.contacts.find(query, {"_id": 0}).sort([("created_at", -1), ("id", -1)]).to_list(100)
         return {"contacts": contacts}
     except Exception as e:
         logger.error(f"Error fetching contacts: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch contacts")
 
+@api_router.get("/contact/outbox")
+async def get_email_outbox_stats():
+    try:
+        return {"outbox": await email_outbox.stats(), "smtp": smtp_pool.stats()}
+    except Exception as e:
+        logger.error(f"Error fetching outbox stats: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch outbox stats")
+
 # ---------------------
 # Blog Endpoints
 # ---------------------
+# Listings never fetch the article body from Mongo
+BLOG_SUMMARY_PROJECTION = response_projection(BlogPostSummary)
+# Nor does the detail view expose word_count, text_excerpt or content_hash
+BLOG_DETAIL_PROJECTION = response_projection(BlogPostDetail)
+
 @api_router.get("/blog", response_model=BlogPostsResponse)
 async def get_blog_posts(
+    request: Request,
     category: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
-    per_page: int = Query(10, ge=1, le=50)
+    per_page: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None),
+    with_total: bool = Query(True)
 ):
     try:
-        skip = (page - 1) * per_page
-        query = {"published": True}
-        if category:
-            query["category"] = category
-        posts_cursor = db.blog_posts.find(query).sort("date", -1).skip(skip).limit(per_page)
-        posts = await posts_cursor.to_list(per_page)
-        total = await db.blog_posts.count_documents(query)
-        blog_posts = [BlogPost(**post) for post in posts]
-        return BlogPostsResponse(posts=blog_posts, total=total, page=page, per_page=per_page)
+        headers, not_modified = await check_not_modified(
+            request, "blog_posts", "blog", category, page, per_page, cursor, with_total,
+            token=await blog_listing_versions.token(category),
+        )
+        if not_modified:
+            return not_modified
+        if cursor is None and with_total:
+            snapshot = await snapshot_response(
+                request, "blog_posts", headers, snapshot_name("blog", category=category, page=page, per_page=per_page)
+            )
+            if snapshot:
+                return snapshot
+
+        key = cache_key("blog", category=category, page=page, per_page=per_page, cursor=cursor, with_total=with_total)
+        body = response_cache.get(key)
+        if body is not None:
+            return cached_response(request, key, body, headers)
+        body = await read_flights.do(
+            key, lambda: load_blog_posts(category, page, per_page, cursor, with_total), response_cache.set
+        )
+        return cached_response(request, key, body, headers)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching blog posts: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch blog posts")
 
-@api_router.get("/blog/{post_id}", response_model=BlogPost)
-async def get_blog_post(post_id: str):
+async def load_blog_posts(category: Optional[str], page: int, per_page: int, cursor: Optional[str], with_total: bool) -> bytes:
+    """Query and serialize one listing page; concurrent misses share a single call"""
+    query = {"published": True}
+    if category:
+        query["category"] = category
+    if cursor:
+        # Keyset mode: range predicate on (date, id) instead of skipping
+        posts_cursor = db.reads.blog_posts.find(keyset_query(query, cursor), BLOG_SUMMARY_PROJECTION).sort(BLOG_SORT)
+    else:
+        skip = (page - 1) * per_page
+        posts_cursor = db.reads.blog_posts.find(query, BLOG_SUMMARY_PROJECTION).sort(BLOG_SORT).skip(skip)
+    # One extra document tells us whether another page exists
+    with phase("query"):
+        posts = await posts_cursor.limit(per_page + 1).to_list(per_page + 1)
+    next_cursor = encode_cursor(posts[per_page - 1]) if len(posts) > per_page else None
+    posts = posts[:per_page]
+
+    total = None
+    if with_total:
+        with phase("count"):
+            total = await blog_facets.count(db, category=category)
+
+    # Documents come straight from our own collection, so skip re-validation
+    with phase("construct"):
+        summaries = construct_documents(BlogPostSummary, posts)
+    with phase("serialize"):
+        body = dump_json({
+            "posts": summaries,
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "next_cursor": next_cursor,
+        })
+    return body
+
+# Declared before /blog/{post_id} so "categories" is not taken for a post id
+@api_router.get("/blog/categories", response_model=CategoriesResponse)
+async def get_blog_categories(request: Request):
     try:
-        post = await db.blog_posts.find_one({"id": post_id, "published": True})
-        if not post:
-            raise HTTPException(status_code=404, detail="Blog post not found")
-        return BlogPost(**post)
+        headers, not_modified = await check_not_modified(
+            request, "blog_posts", "blog_categories", token=await blog_listing_versions.counts_token()
+        )
+        if not_modified:
+            return not_modified
+        categories = await blog_facets.breakdown(db, "category")
+        body = dump_json({"total": sum(c["count"] for c in categories), "categories": categories})
+        return json_response(body, headers)
+    except Exception as e:
+        logger.error(f"Error fetching blog categories: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch blog categories")
+
+@api_router.get("/blog/{post_id}", response_model=BlogPostDetail)
+async def get_blog_post(post_id: str, request: Request):
+    try:
+        updated_at = blog_post_versions.get(post_id)
+        if updated_at is None:
+            # Validators come from the post itself, so every worker derives the same ones
+            stamp = await db.reads.blog_posts.find_one({"id": post_id, "published": True}, {"_id": 0, "updated_at": 1})
+            if stamp is None:
+                raise HTTPException(status_code=404, detail="Blog post not found")
+            updated_at = stamp["updated_at"]
+            blog_post_versions.set(post_id, updated_at)
+        headers, not_modified = post_validators(request, post_id, updated_at)
+        if not_modified:
+            return not_modified
+        snapshot = await snapshot_response(request, "blog_posts", headers, snapshot_name("blog_post", post_id=post_id))
+        if snapshot:
+            return snapshot
+
+        key = cache_key("blog_post", post_id=post_id)
+        body = response_cache.get(key)
+        if body is not None:
+            return cached_response(request, key, body, headers)
+        body, updated_at = await read_flights.do(key, lambda: load_blog_post(post_id), store_blog_post)
+        headers, _ = post_validators(request, post_id, updated_at)
+        return cached_response(request, key, body, headers)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching blog post {post_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch blog post")
 
+async def load_blog_post(post_id: str):
+    with phase("query"):
+        post = await db.reads.blog_posts.find_one({"id": post_id, "published": True}, BLOG_DETAIL_PROJECTION)
+    if not post:
+        raise HTTPException(status_code=404, detail="Blog post not found")
+    with phase("construct"):
+        document = construct_documents(BlogPostDetail, [post])[0]
+    with phase("serialize"):
+        return dump_json(document), post["updated_at"]
+
+def store_blog_post(key, loaded):
+    body, updated_at = loaded
+    response_cache.set(key, body)
+    blog_post_versions.set(dict(key[1])["post_id"], updated_at)
+
 @api_router.post("/blog", response_model=BlogPost)
 async def create_blog_post(post_data: BlogPostCreate):
     try:
-        blog_post = BlogPost(**post_data.dict())
-        blog_post.read_time = calculate_read_time(blog_post.content)
-        await db.blog_posts.insert_one(blog_post.dict())
+        doc, blog_post = create_document(BlogPost, post_data, **derive_content_fields(post_data.content))
+        await db.blog_posts.insert_one(doc)
+        blog_facets.apply(None, doc)
+        await collection_versions.refresh("blog_posts")
+        blog_post_changed(doc)
+        await publish_change("blog_posts", blog_post.id)
         logger.info(f"Created blog post: {blog_post.title}")
         return blog_post
     except Exception as e:
         logger.error(f"Error creating blog post: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to create blog post")
 
+@api_router.patch("/blog/{post_id}", response_model=BlogPost)
+async def update_blog_post(post_id: str, post_data: BlogPostUpdate):
+    # Only image may be cleared; a null for any other field means "leave as is"
+    changes = {k: v for k, v in post_data.model_dump(exclude_unset=True).items() if v is not None or k == "image"}
+    if not changes:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    if "content" in changes:
+        changes.update(derive_content_fields(changes["content"]))
+    changes["updated_at"] = datetime.utcnow()
+    try:
+        # One atomic $set; the pre-image tells us which listings the post leaves
+        previous = await db.blog_posts.find_one_and_update(
+            {"id": post_id}, {"$set": changes}, projection={"_id": 0}, return_document=ReturnDocument.BEFORE
+        )
+        if previous is None:
+            raise HTTPException(status_code=404, detail="Blog post not found")
+        post = {**previous, **changes}
+        blog_facets.apply(previous, post)
+        # Includes derived fields, e.g. read_time when an edit changed the word count
+        fields = sorted(k for k, v in changes.items() if previous.get(k) != v)
+        await collection_versions.refresh("blog_posts")
+        blog_post_changed(post, previous=previous, fields=fields)
+        await publish_change(
+            "blog_posts", post_id,
+            previous={"published": previous.get("published"), "category": previous.get("category")}, fields=fields,
+        )
+        logger.info(f"Updated blog post {post_id}: {', '.join(fields)}")
+        return BlogPost.model_construct(**post)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating blog post {post_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to update blog post")
+
+def build_blog_post_document(item: dict) -> dict:
+    post_data = BlogPostCreate(**item)
+    return new_document(BlogPost, post_data, **derive_content_fields(post_data.content))
+
+@api_router.post("/blog/bulk", response_model=BulkInsertResponse)
+async def bulk_create_blog_posts(request: Request, chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=10000)):
+    return await run_bulk_insert(request, "blog_posts", build_blog_post_document, chunk_size)
+
 # ---------------------
 # Testimonials
 # ---------------------
 @api_router.get("/testimonials", response_model=TestimonialResponse)
-async def get_testimonials():
+async def get_testimonials(request: Request):
     try:
-        testimonials = await db.testimonials.find({"approved": True}).sort("created_at", -1).to_list(100)
-        testimonial_objects = [Testimonial(**t) for t in testimonials]
-        return TestimonialResponse(testimonials=testimonial_objects)
+        headers, not_modified = await check_not_modified(request, "testimonials", "testimonials")
+        if not_modified:
+            return not_modified
+        snapshot = await snapshot_response(request, "testimonials", headers, snapshot_name("testimonials"))
+        if snapshot:
+            return snapshot
+
+        key = cache_key("testimonials")
+        body = response_cache.get(key)
+        if body is not None:
+            return cached_response(request, key, body, headers)
+        body = await read_flights.do(key, load_testimonials, response_cache.set)
+        return cached_response(request, key, body, headers)
     except Exception as e:
         logger.error(f"Error fetching testimonials: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch testimonials")
 
+async def load_testimonials() -> bytes:
+    testimonials = await db.reads.testimonials.find(
+        {"approved": True}, response_projection(Testimonial)
+    ).sort("created_at", -1).to_list(100)
+    return dump_json({"testimonials": construct_documents(Testimonial, testimonials)})
+
 @api_router.post("/testimonials", response_model=Testimonial)
 async def submit_testimonial(testimonial_data: TestimonialCreate):
     try:
-        testimonial = Testimonial(**testimonial_data.dict())
-        await db.testimonials.insert_one(testimonial.dict())
+        doc, testimonial = create_document(Testimonial, testimonial_data)
+        await db.testimonials.insert_one(doc)
+        await collection_versions.refresh("testimonials")
+        testimonial_changed(doc)
+        await publish_change("testimonials", testimonial.id)
         logger.info(f"New testimonial submitted by {testimonial.name}")
         return testimonial
     except Exception as e:
         logger.error(f"Error submitting testimonial: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to submit testimonial")
 
+def build_testimonial_document(item: dict) -> dict:
+    return new_document(Testimonial, TestimonialCreate(**item))
+
+@api_router.post("/testimonials/bulk", response_model=BulkInsertResponse)
+async def bulk_submit_testimonials(request: Request, chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=10000)):
+    return await run_bulk_insert(request, "testimonials", build_testimonial_document, chunk_size)
+
 # ---------------------
 # Projects
 # ---------------------
 @api_router.get("/projects", response_model=ProjectsResponse)
-async def get_projects(category: Optional[str] = None, featured: Optional[bool] = None):
+async def get_projects(request: Request, category: Optional[str] = None, featured: Optional[bool] = None):
     try:
-        query = {}
-        if category and category != "All":
-            query["category"] = category
-        if featured is not None:
-            query["featured"] = featured
-        projects = await db.projects.find(query).sort("created_at", -1).to_list(100)
-        project_objects = [Project(**p) for p in projects]
-        return ProjectsResponse(projects=project_objects)
+        if category == "All":
+            category = None
+        headers, not_modified = await check_not_modified(request, "projects", "projects", category, featured)
+        if not_modified:
+            return not_modified
+        snapshot = await snapshot_response(
+            request, "projects", headers, snapshot_name("projects", category=category, featured=featured)
+        )
+        if snapshot:
+            return snapshot
+
+        key = cache_key("projects", category=category, featured=featured)
+        body = response_cache.get(key)
+        if body is not None:
+            return cached_response(request, key, body, headers)
+        body = await read_flights.do(key, lambda: load_projects(category, featured), response_cache.set)
+        return cached_response(request, key, body, headers)
     except Exception as e:
         logger.error(f"Error fetching projects: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch projects")
 
+async def load_projects(category: Optional[str], featured: Optional[bool]) -> bytes:
+    query = {}
+    if category:
+        query["category"] = category
+    if featured is not None:
+        query["featured"] = featured
+    projects = await db.reads.projects.find(query, response_projection(Project)).sort("created_at", -1).to_list(100)
+    return dump_json({"projects": construct_documents(Project, projects)})
+
+@api_router.get("/projects/categories", response_model=CategoriesResponse)
+async def get_project_categories(request: Request):
+    try:
+        headers, not_modified = await check_not_modified(request, "projects", "project_categories")
+        if not_modified:
+            return not_modified
+        categories = await project_facets.breakdown(db, "category", "featured")
+        body = dump_json({
+            "total": sum(c["count"] for c in categories),
+            "featured": sum(c["featured"] for c in categories),
+            "categories": categories,
+        })
+        return json_response(body, headers)
+    except Exception as e:
+        logger.error(f"Error fetching project categories: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch project categories")
+
 @api_router.post("/projects", response_model=Project)
 async def create_project(project_data: ProjectCreate):
     try:
-        project = Project(**project_data.dict())
-        await db.projects.insert_one(project.dict())
+        doc, project = create_document(Project, project_data)
+        await db.projects.insert_one(doc)
+        project_facets.apply(None, doc)
+        await collection_versions.refresh("projects")
+        project_changed(doc)
+        await publish_change("projects", project.id)
         logger.info(f"Created project: {project.title}")
         return project
     except Exception as e:
         logger.error(f"Error creating project: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to create project")
 
+def build_project_document(item: dict) -> dict:
+    return new_document(Project, ProjectCreate(**item))
+
+@api_router.post("/projects/bulk", response_model=BulkInsertResponse)
+async def bulk_create_projects(request: Request, chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=10000)):
+    return await run_bulk_insert(request, "projects", build_project_document, chunk_size)
+
+# ---------------------
+# Homepage
+# ---------------------
+HOME_COLLECTIONS = ("projects", "testimonials", "blog_posts")
+
+@api_router.get("/home", response_model=HomeResponse)
+async def get_home(
+    request: Request,
+    projects_limit: int = Query(HOME_PROJECTS_LIMIT, ge=0, le=100),
+    featured_limit: int = Query(HOME_FEATURED_LIMIT, ge=0, le=100),
+    testimonials_limit: int = Query(HOME_TESTIMONIALS_LIMIT, ge=0, le=100),
+    posts_limit: int = Query(HOME_POSTS_LIMIT, ge=0, le=50)
+):
+    limits = (projects_limit, featured_limit, testimonials_limit, posts_limit)
+    try:
+        # The payload changes whenever any of its collections does
+        versions = await asyncio.gather(*(collection_versions.get(name) for name in HOME_COLLECTIONS))
+        etag = make_etag(*(version["token"] for version in versions), "home", *limits)
+        last_modified = max((v["last_modified"] for v in versions if v["last_modified"]), default=None)
+        headers, not_modified = conditional_headers(request, etag, last_modified)
+        if not_modified:
+            return not_modified
+
+        key = cache_key(
+            "home", projects=projects_limit, featured=featured_limit, testimonials=testimonials_limit, posts=posts_limit
+        )
+        body = response_cache.get(key)
+        if body is not None:
+            return cached_response(request, key, body, headers)
+        body = await read_flights.do(key, lambda: load_home(*limits), response_cache.set)
+        return cached_response(request, key, body, headers)
+    except Exception as e:
+        logger.error(f"Error fetching homepage: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch homepage")
+
+async def newest(collection, query: dict, projection: dict, sort, limit: int):
+    if limit == 0:
+        return []
+    return await collection.find(query, projection).sort(sort).limit(limit).to_list(limit)
+
+async def load_home(projects_limit: int, featured_limit: int, testimonials_limit: int, posts_limit: int) -> bytes:
+    """Every homepage section, queried concurrently and serialized as one body"""
+    project_projection = response_projection(Project)
+    with phase("query"):
+        projects, featured, testimonials, posts = await asyncio.gather(
+            newest(db.reads.projects, {}, project_projection, [("created_at", -1)], projects_limit),
+            newest(db.reads.projects, {"featured": True}, project_projection, [("created_at", -1)], featured_limit),
+            newest(
+                db.reads.testimonials, {"approved": True}, response_projection(Testimonial),
+                [("created_at", -1)], testimonials_limit,
+            ),
+            newest(db.reads.blog_posts, {"published": True}, BLOG_SUMMARY_PROJECTION, BLOG_SORT, posts_limit),
+        )
+    with phase("serialize"):
+        return dump_json({
+            "projects": construct_documents(Project, projects),
+            "featured_projects": construct_documents(Project, featured),
+            "testimonials": construct_documents(Testimonial, testimonials),
+            "posts": construct_documents(BlogPostSummary, posts),
+        })
+
+# ---------------------
+# Search
+# ---------------------
+search_index = SearchIndex()
+
+@api_router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = Query(None, pattern="^(blog|project)$"),
+    limit: int = Query(10, ge=1, le=50),
+    prefix: bool = Query(True)
+):
+    if not search_index.ready:
+        # Built in the background after startup; nothing to search until it is swapped in
+        raise HTTPException(status_code=503, detail="Search index is still building", headers={"Retry-After": "5"})
+    started = time.perf_counter()
+    await search_index.prepare(q, doc_type=type, prefix=prefix)
+    results = search_index.search(q, doc_type=type, limit=limit, prefix=prefix)
+    took_ms = round((time.perf_counter() - started) * 1000, 3)
+    return SearchResponse(query=q, total=len(results), results=results, took_ms=took_ms)
+
+# ---------------------
+# Bulk Ingest
+# ---------------------
+async def run_bulk_insert(request: Request, collection: str, build, chunk_size: int) -> BulkInsertResponse:
+    """Shared body of the bulk endpoints: ingest, then drop every cached read of the collection"""
+    started_at = datetime.utcnow()
+    try:
+        result = await bulk_insert(db[collection], iter_request_items(request), build, chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid bulk payload: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error bulk inserting into {collection}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to bulk insert into {collection}")
+    if result["inserted"]:
+        # Refreshed first, so no request sees the new version alongside a body cached before the insert
+        await collection_versions.refresh(collection)
+        invalidate_collection(collection)
+        if collection in ("blog_posts", "projects"):
+            await search_index.sync(db, since=started_at)
+        await publish_change(collection, since=started_at)
+    return BulkInsertResponse(**result)
+
+# ---------------------
+# Cache Stats
+# ---------------------
+@api_router.get("/cache/stats")
+async def get_cache_stats():
+    return {"cache": response_cache.stats(), "single_flight": read_flights.stats(), "snapshots": snapshot_store.stats()}
+
+# ---------------------
+# Metrics
+# ---------------------
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 # Include router
 app.include_router(api_router)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+# ---------------------
+# Lifecycle
+# ---------------------
+async def startup():
+    global email_outbox, invalidation_channel
+    db.connect()
+    await db.warm_up()
+    await provision_indexes(db)
+    for facets in COLLECTION_FACETS.values():
+        await facets.ensure(db)
+    search_index.start(db)
+    email_outbox = EmailOutbox(db.email_outbox, send_batch=send_contact_emails)
+    email_outbox.start()
+    invalidation_channel = build_invalidation_channel(db.db)
+    await invalidation_channel.start(apply_remote_change)
+
+async def shutdown():
+    if invalidation_channel is not None:
+        await invalidation_channel.stop()
+    if email_outbox is not None:
+        await email_outbox.stop()
+    await smtp_pool.close()
+    await search_index.stop()
+    if SEARCH_SNAPSHOT_PATH and search_index.ready:
+        search_index.save(SEARCH_SNAPSHOT_PATH)
+    db.close()
 
 if __name__ == "__main__":
+    # Single development worker; use serve.py to run one worker per core
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
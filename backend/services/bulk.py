@@ -0,0 +1,105 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+
+
+async def iter_request_items(request) -> AsyncIterator[Any]:
+    """Yield raw items from a JSON array body or, incrementally, from an NDJSON stream"""
+    if "ndjson" in request.headers.get("content-type", ""):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+        if buffer.strip():
+            yield buffer
+        return
+
+    items = await request.json()
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array or an NDJSON body")
+    for item in items:
+        yield item
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors())
+    return str(error)
+
+
+def _prepare_chunk(raw_items: List[Any], start: int, build: Callable[[Dict[str, Any]], Dict[str, Any]]):
+    docs, indexes, errors = [], [], []
+    for offset, raw in enumerate(raw_items):
+        try:
+            item = json.loads(raw) if isinstance(raw, (bytes, str)) else raw
+            if not isinstance(item, dict):
+                raise ValueError("Item must be a JSON object")
+            docs.append(build(item))
+            indexes.append(start + offset)
+        except ValueError as e:
+            # pydantic's ValidationError and json's JSONDecodeError are both ValueErrors
+            errors.append({"index": start + offset, "error": _describe(e)})
+    return docs, indexes, errors
+
+
+async def _insert_chunk(collection, docs: List[Dict[str, Any]], indexes: List[int]) -> Tuple[int, List[Dict[str, Any]]]:
+    if not docs:
+        return 0, []
+    try:
+        result = await collection.insert_many(docs, ordered=False)
+        return len(result.inserted_ids), []
+    except BulkWriteError as e:
+        errors = [
+            {"index": indexes[write_error["index"]], "error": write_error.get("errmsg", "Write failed")}
+            for write_error in e.details.get("writeErrors", [])
+        ]
+        return e.details.get("nInserted", 0), errors
+
+
+async def bulk_insert(
+    collection,
+    raw_items: AsyncIterator[Any],
+    build: Callable[[Dict[str, Any]], Dict[str, Any]],
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Validate and insert items in unordered chunks, collecting per-item errors.
+
+    ``build`` turns one raw dict into a storage document and raises
+    ValueError for invalid input. Validation runs in a worker thread so a
+    large chunk does not stall the event loop.
+    """
+    received, inserted = 0, 0
+    errors: List[Dict[str, Any]] = []
+    pending: List[Any] = []
+
+    async def flush():
+        nonlocal inserted
+        docs, indexes, chunk_errors = await asyncio.to_thread(_prepare_chunk, pending.copy(), received - len(pending), build)
+        pending.clear()
+        count, write_errors = await _insert_chunk(collection, docs, indexes)
+        inserted += count
+        errors.extend(chunk_errors + write_errors)
+
+    async for raw in raw_items:
+        pending.append(raw)
+        received += 1
+        if len(pending) >= chunk_size:
+            await flush()
+    if pending:
+        await flush()
+
+    errors.sort(key=lambda e: e["index"])
+    logger.info(f"Bulk insert into {collection.name}: {inserted}/{received} inserted, {len(errors)} failed")
+    return {"received": received, "inserted": inserted, "failed": len(errors), "errors": errors}
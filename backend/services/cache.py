@@ -0,0 +1,149 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Optional, Set, Tuple, TypeVar
+
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+CacheKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+def cache_key(namespace: str, **params) -> CacheKey:
+    """Build a cache key from an endpoint namespace and its query parameters"""
+    return (namespace, tuple(sorted(params.items())))
+
+
+class ResponseCache:
+    """LRU cache of serialized response bodies with a TTL and a byte budget.
+
+    Entries are grouped by namespace so writes can invalidate only the keys
+    whose parameters match the changed document. Compressed variants of a
+    body are stored alongside it, count against the byte budget and are
+    dropped with it.
+    """
+
+    def __init__(
+        self,
+        ttl: float = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        enabled: bool = CACHE_ENABLED,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries: "OrderedDict[CacheKey, Tuple[float, bytes, Dict[str, bytes]]]" = OrderedDict()
+        self._namespaces: Dict[str, Set[CacheKey]] = {}
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0, "variants": 0}
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        expires_at, body, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return body
+
+    def set(self, key: CacheKey, body: bytes):
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, body, {})
+        self._namespaces.setdefault(key[0], set()).add(key)
+        self._bytes += len(body)
+        self._evict()
+
+    def get_variant(self, key: CacheKey, encoding: str) -> Optional[bytes]:
+        """Compressed copy of a cached body; call after a successful ``get``"""
+        entry = self._entries.get(key)
+        return entry[2].get(encoding) if entry is not None else None
+
+    def set_variant(self, key: CacheKey, encoding: str, data: bytes):
+        entry = self._entries.get(key)
+        # The body may have been invalidated or evicted while it was being compressed
+        if entry is None or encoding in entry[2]:
+            return
+        entry[2][encoding] = data
+        self._bytes += len(data)
+        self._stats["variants"] += 1
+        self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats["evictions"] += 1
+
+    def _remove(self, key: CacheKey):
+        _, body, variants = self._entries.pop(key)
+        self._bytes -= len(body) + sum(len(data) for data in variants.values())
+        keys = self._namespaces.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._namespaces[key[0]]
+
+    def invalidate(self, namespace: str, match: Optional[Callable[[Dict[str, Any]], bool]] = None) -> int:
+        """Drop keys in a namespace, optionally only those whose params satisfy ``match``"""
+        removed = 0
+        for key in list(self._namespaces.get(namespace, ())):
+            if match is None or match(dict(key[1])):
+                self._remove(key)
+                removed += 1
+        self._stats["invalidations"] += removed
+        return removed
+
+    def clear(self):
+        self._entries.clear()
+        self._namespaces.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["entries"] = len(self._entries)
+        stats["bytes"] = self._bytes
+        stats["hit_rate"] = round(self._stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+ValueT = TypeVar("ValueT")
+
+
+class TTLCache(Generic[ValueT]):
+    """Short-lived cache of small per-key values, e.g. document versions"""
+
+    def __init__(self, ttl: float = CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._values: Dict[Any, Tuple[float, ValueT]] = {}
+
+    def get(self, key) -> Optional[ValueT]:
+        entry = self._values.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key, value: ValueT):
+        self._values[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, *keys):
+        for key in keys:
+            self._values.pop(key, None)
+
+    def clear(self):
+        self._values.clear()
@@ -0,0 +1,220 @@
+import gzip
+import os
+import zlib
+from typing import Optional, Sequence, Set
+
+from starlette.datastructures import MutableHeaders
+
+from services.conditional import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+# Bodies smaller than this go out as-is; the framing overhead would eat the savings
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "512"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+# Server preference when the client accepts several; unavailable codecs are skipped
+COMPRESSION_ENCODINGS = [
+    e.strip() for e in os.getenv("COMPRESSION_ENCODINGS", "br,zstd,gzip").split(",") if e.strip()
+]
+
+ENCODINGS = ("br", "zstd", "gzip")
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/xml", "application/javascript", "text/",
+)
+
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """Codings an Accept-Encoding header allows (q > 0)"""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        params = params.strip().replace(" ", "")
+        try:
+            quality = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            quality = 0.0
+        if quality > 0:
+            accepted.add(coding.strip())
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available, preference: Sequence[str] = ("br", "gzip")) -> str:
+    """Pick the first preferred variant the client accepts; identity otherwise"""
+    accepted = accepted_encodings(accept_encoding)
+    for encoding in preference:
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return "identity"
+
+
+def supported_encodings():
+    supported = ["gzip"]
+    if brotli is not None:
+        supported.append("br")
+    if zstandard is not None:
+        supported.append("zstd")
+    return supported
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class Compressor:
+    """Negotiates and applies one content coding with the configured levels"""
+
+    def __init__(
+        self,
+        min_bytes: int = COMPRESSION_MIN_BYTES,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+        zstd_level: int = COMPRESSION_ZSTD_LEVEL,
+        preference: Sequence[str] = COMPRESSION_ENCODINGS,
+    ):
+        unknown = set(preference) - set(ENCODINGS)
+        if unknown:
+            raise ValueError(f"Unknown encodings {sorted(unknown)}, expected some of {', '.join(ENCODINGS)}")
+        self.min_bytes = min_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+        self.available = tuple(e for e in preference if e in supported_encodings())
+        self._zstd = zstandard.ZstdCompressor(level=zstd_level) if zstandard is not None else None
+
+    def negotiate(self, accept_encoding: str, size: Optional[int] = None) -> str:
+        """Coding to use for a body of ``size`` bytes (None when not known up front)"""
+        if not accept_encoding or (size is not None and size < self.min_bytes):
+            return "identity"
+        return choose_encoding(accept_encoding, self.available, self.available)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "gzip":
+            # mtime=0 keeps the output identical for identical input
+            return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        if encoding == "zstd":
+            return self._zstd.compress(body)
+        raise ValueError(f"Unsupported encoding {encoding!r}")
+
+    def stream(self, encoding: str):
+        """Incremental compressor exposing ``compress(chunk)`` and ``flush()``"""
+        if encoding == "gzip":
+            return zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        if encoding == "br":
+            return _BrotliStream(brotli.Compressor(quality=self.brotli_quality))
+        if encoding == "zstd":
+            return self._zstd.compressobj()
+        raise ValueError(f"Unsupported encoding {encoding!r}")
+
+
+class _BrotliStream:
+    def __init__(self, compressor):
+        self._compressor = compressor
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses the client accepts in a coding for.
+
+    Whole bodies below ``min_bytes`` are left alone; streamed bodies are
+    compressed incrementally. Responses that already carry a
+    Content-Encoding (pre-compressed cache entries and snapshots) pass
+    through untouched, so a payload is only compressed here when nothing
+    upstream kept a compressed copy. A strong ETag gets the coding appended.
+    """
+
+    def __init__(self, app, compressor: Optional[Compressor] = None, enabled: bool = COMPRESSION_ENABLED):
+        self.app = app
+        self.compressor = compressor or Compressor()
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = self.compressor.negotiate(accept_encoding)
+        if encoding == "identity":
+            return await self.app(scope, receive, send)
+
+        start = None
+        stream = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, stream, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if (
+                    "content-encoding" in headers
+                    or message["status"] < 200 or message["status"] in (204, 304)
+                    or not is_compressible(headers.get("content-type", ""))
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held back until the first body chunk shows whether it is worth compressing
+                    start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(raw=start["headers"])
+            if stream is None:
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.compressor.min_bytes:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                self._encode_headers(headers, encoding)
+                if not more_body:
+                    body = self.compressor.compress(body, encoding)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                del headers["Content-Length"]
+                stream = self.compressor.stream(encoding)
+                await send(start)
+            chunk = stream.compress(body)
+            if not more_body:
+                chunk += stream.flush()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _encode_headers(headers: MutableHeaders, encoding: str):
+        headers["Content-Encoding"] = encoding
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            # A strong ETag has to differ between encodings of the same resource
+            headers["ETag"] = encoded_etag(etag, encoding)
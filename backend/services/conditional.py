@@ -0,0 +1,229 @@
+import asyncio
+import hashlib
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+
+VERSION_REFRESH_SECONDS = float(os.getenv("VERSION_REFRESH_SECONDS", "30"))
+# Documents hashed per round trip when digesting a collection
+VERSION_DIGEST_BATCH_SIZE = int(os.getenv("VERSION_DIGEST_BATCH_SIZE", "500"))
+
+# What each collection's version covers: the documents its endpoints can serve
+# ("filter"), the field whose newest value is the Last-Modified ("timestamp"),
+# and whether the token also hashes those documents ("digest"). Digests catch
+# edits outside the API that bump no timestamp (approving a testimonial,
+# featuring a project); they stream every matching document through the hash
+# one batch at a time, so they are only used for the small collections. Blog posts are edited through PATCH, which
+# bumps updated_at.
+COLLECTION_VERSION_SOURCES = {
+    "blog_posts": {"filter": {"published": True}, "timestamp": "updated_at", "digest": False},
+    "testimonials": {"filter": {"approved": True}, "timestamp": "created_at", "digest": True},
+    "projects": {"filter": {}, "timestamp": "created_at", "digest": True},
+}
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive UTC datetime as an HTTP date"""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag derived from the collection version and request parameters"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of one content coding of a resource; identity keeps the plain tag"""
+    if encoding == "identity":
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(headers, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current validators"""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match uses weak comparison and takes precedence over dates
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+class CollectionVersions:
+    """Tracks a version token and newest timestamp per collection.
+
+    The token is derived from the count and newest timestamp of the
+    documents the collection's endpoints serve (plus, for digest sources,
+    their content), so every worker computes the same value for the same
+    data. Write endpoints call ``refresh`` right after writing; changes made
+    outside the API are picked up after ``refresh_interval`` seconds and
+    reported through ``on_change`` so dependent caches can be dropped.
+    """
+
+    def __init__(
+        self,
+        db,
+        sources: Dict[str, Dict[str, Any]],
+        refresh_interval: float = VERSION_REFRESH_SECONDS,
+        on_change: Optional[Callable[[str], None]] = None,
+    ):
+        self.db = db
+        self.sources = sources
+        self.refresh_interval = refresh_interval
+        self.on_change = on_change
+        self._versions: Dict[str, Dict[str, Any]] = {}
+        self._locks = {name: asyncio.Lock() for name in sources}
+
+    async def _measure(self, name: str):
+        source = self.sources[name]
+        field = source["timestamp"]
+        collection = self.db[name]
+        if not source.get("digest"):
+            count = await collection.count_documents(source["filter"])
+            newest = await collection.find_one(source["filter"], {field: 1}, sort=[(field, -1)])
+            return count, newest.get(field) if newest else None, ""
+        digest, count, newest = hashlib.sha1(), 0, None
+        cursor = collection.find(source["filter"], {"_id": 0}).sort("id", 1).batch_size(VERSION_DIGEST_BATCH_SIZE)
+        async for doc in cursor:
+            # Only the running hash is kept, never the documents themselves
+            digest.update(orjson.dumps(doc, option=orjson.OPT_SORT_KEYS))
+            count += 1
+            stamp = doc.get(field)
+            if stamp is not None and (newest is None or stamp > newest):
+                newest = stamp
+        return count, newest, digest.hexdigest()
+
+    async def refresh(self, name: str) -> Dict[str, Any]:
+        count, last_modified, digest = await self._measure(name)
+        token = make_etag(name, count, last_modified.isoformat() if last_modified else "", digest).strip('"')
+        previous = self._versions.get(name)
+        if previous is not None and previous["last_modified"] is not None:
+            if token == previous["token"]:
+                last_modified = previous["last_modified"]
+            elif last_modified is None or last_modified <= previous["last_modified"]:
+                # Changed without a newer timestamp (an approval, a removal): date
+                # it when it was noticed, rounded up past the second HTTP dates keep
+                last_modified = datetime.utcnow().replace(microsecond=0) + timedelta(seconds=1)
+        version = {
+            "token": token,
+            "last_modified": last_modified,
+            "refreshed_at": time.monotonic(),
+        }
+        self._versions[name] = version
+        return version
+
+    async def get(self, name: str) -> Dict[str, Any]:
+        version = self._versions.get(name)
+        if version is None or time.monotonic() - version["refreshed_at"] > self.refresh_interval:
+            async with self._locks[name]:
+                version = self._versions.get(name)
+                if version is None or time.monotonic() - version["refreshed_at"] > self.refresh_interval:
+                    previous = version
+                    version = await self.refresh(name)
+                    if previous is not None and previous["token"] != version["token"] and self.on_change:
+                        self.on_change(name)
+        return version
+
+
+
+class GroupedVersions:
+    """Version tokens of the slices of a collection grouped by one field.
+
+    One ``$group`` over the documents the endpoints serve yields, per value
+    of ``group_by`` (a blog category), the count and newest ``timestamp``;
+    each slice's token is derived from those alone, so every worker computes
+    the same token for the same data and an edit in one category leaves the
+    others' tokens alone. Writes call ``invalidate`` and the next lookup
+    re-measures; changes made elsewhere are picked up after
+    ``refresh_interval`` seconds. Tokens only: Last-Modified stays with the
+    collection version, which never moves backwards.
+    """
+
+    def __init__(
+        self,
+        db,
+        collection_name: str,
+        match: Dict[str, Any],
+        group_by: str,
+        timestamp: str,
+        refresh_interval: float = VERSION_REFRESH_SECONDS,
+    ):
+        self.db = db
+        self.collection_name = collection_name
+        self.match = match
+        self.group_by = group_by
+        self.timestamp = timestamp
+        self.refresh_interval = refresh_interval
+        # group value -> (count, newest timestamp)
+        self._groups: Optional[Dict[Any, Tuple[int, Optional[datetime]]]] = None
+        self._measured_at = 0.0
+        self._writes = 0
+        self._lock = asyncio.Lock()
+
+    async def _measure(self) -> Dict[Any, Tuple[int, Optional[datetime]]]:
+        pipeline = [
+            {"$match": self.match},
+            {"$group": {"_id": f"${self.group_by}", "count": {"$sum": 1}, "newest": {"$max": f"${self.timestamp}"}}},
+        ]
+        groups = {}
+        async for row in self.db[self.collection_name].aggregate(pipeline):
+            groups[row["_id"]] = (row["count"], row["newest"])
+        return groups
+
+    def _current(self) -> bool:
+        return self._groups is not None and time.monotonic() - self._measured_at <= self.refresh_interval
+
+    async def _ensure(self) -> Dict[Any, Tuple[int, Optional[datetime]]]:
+        if self._current():
+            return self._groups
+        async with self._lock:
+            if self._current():
+                return self._groups
+            writes = self._writes
+            groups = await self._measure()
+            # A write during the measurement may be missing from it; use it once but measure again next time
+            if self._writes == writes:
+                self._groups, self._measured_at = groups, time.monotonic()
+            return groups
+
+    def invalidate(self):
+        self._writes += 1
+        self._groups = None
+
+    async def token(self, value: Any = None) -> str:
+        """Token of the documents whose ``group_by`` equals ``value``; None covers every group"""
+        groups = await self._ensure()
+        if value is None:
+            count = sum(count for count, _ in groups.values())
+            newest = max((newest for _, newest in groups.values() if newest is not None), default=None)
+        else:
+            count, newest = groups.get(value, (0, None))
+        return make_etag(self.collection_name, value, count, newest.isoformat() if newest else "").strip('"')
+
+    async def counts_token(self) -> str:
+        """Token that changes only when the number of documents in some group does"""
+        groups = await self._ensure()
+        counts = sorted((str(value), count) for value, (count, _) in groups.items())
+        return make_etag(self.collection_name, "counts", counts).strip('"')
@@ -0,0 +1,235 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference, monitoring
+
+logger = logging.getLogger(__name__)
+
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "10000"))
+# Bursts beyond the pool fail after this long instead of queueing indefinitely
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+# Used by the read-only endpoints; writes always go to the primary
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+# After a write, reads stay on the primary this long so cache fills never see a lagging secondary
+MONGO_READ_AFTER_WRITE_SECONDS = float(os.getenv("MONGO_READ_AFTER_WRITE_SECONDS", "10"))
+# Pool usage above this fraction reports the database as degraded
+MONGO_SATURATION_WARNING = float(os.getenv("MONGO_SATURATION_WARNING", "0.9"))
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Counts open, checked-out and waiting connections per server from pool events"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.servers: Dict[str, Dict[str, int]] = defaultdict(lambda: {
+            "open": 0, "checked_out": 0, "waiting": 0, "peak_checked_out": 0, "checkout_timeouts": 0,
+        })
+
+    def _update(self, address, **changes):
+        with self._lock:
+            server = self.servers[f"{address[0]}:{address[1]}"]
+            for name, delta in changes.items():
+                server[name] += delta
+            server["peak_checked_out"] = max(server["peak_checked_out"], server["checked_out"])
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self._lock:
+            self.servers.pop(f"{event.address[0]}:{event.address[1]}", None)
+
+    def connection_created(self, event):
+        self._update(event.address, open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event.address, open=-1)
+
+    def connection_check_out_started(self, event):
+        self._update(event.address, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        timeouts = 1 if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT else 0
+        self._update(event.address, waiting=-1, checkout_timeouts=timeouts)
+
+    def connection_checked_out(self, event):
+        self._update(event.address, waiting=-1, checked_out=1)
+
+    def connection_checked_in(self, event):
+        self._update(event.address, checked_out=-1)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {address: dict(counts) for address, counts in self.servers.items()}
+
+
+class _ReadView:
+    """Collections of the database bound to the configured read preference"""
+
+    def __init__(self, db, read_preference):
+        self._db = db
+        self._read_preference = read_preference
+        self._collections: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._db.get_collection(name, read_preference=self._read_preference)
+            self._collections[name] = collection
+        return collection
+
+
+class Database:
+    """Owns the Motor client for the app's lifetime.
+
+    ``connect()`` is called from the lifespan handler; until then the
+    object can be handed around, and collections are resolved on use
+    (``database.blog_posts``, ``database["projects"]``). ``reads`` exposes
+    the same collections with the read-only endpoints' read preference.
+
+    Responses are cached under version tokens measured on the primary, so
+    a fill read from a secondary that has not replicated the latest write
+    would be cached under the new token. ``mark_write()`` is called
+    whenever data changes, and ``reads`` falls back to the primary for
+    ``read_after_write_seconds`` afterwards; set it above the replica
+    set's worst expected lag.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        name: str,
+        event_listeners: Iterable[Any] = (),
+        max_pool_size: int = MONGO_MAX_POOL_SIZE,
+        min_pool_size: int = MONGO_MIN_POOL_SIZE,
+        max_idle_time_ms: int = MONGO_MAX_IDLE_TIME_MS,
+        server_selection_timeout_ms: int = MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        connect_timeout_ms: int = MONGO_CONNECT_TIMEOUT_MS,
+        socket_timeout_ms: int = MONGO_SOCKET_TIMEOUT_MS,
+        wait_queue_timeout_ms: int = MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        read_preference: str = MONGO_READ_PREFERENCE,
+        read_after_write_seconds: float = MONGO_READ_AFTER_WRITE_SECONDS,
+    ):
+        if read_preference not in READ_PREFERENCES:
+            raise ValueError(f"Unknown read preference {read_preference!r}, expected one of {', '.join(READ_PREFERENCES)}")
+        self.url = url
+        self.name = name
+        self.event_listeners = list(event_listeners)
+        self.options = {
+            "maxPoolSize": max_pool_size,
+            "minPoolSize": min_pool_size,
+            "maxIdleTimeMS": max_idle_time_ms,
+            "serverSelectionTimeoutMS": server_selection_timeout_ms,
+            "connectTimeoutMS": connect_timeout_ms,
+            "socketTimeoutMS": socket_timeout_ms,
+            "waitQueueTimeoutMS": wait_queue_timeout_ms,
+        }
+        self.read_preference = read_preference
+        self.read_after_write_seconds = read_after_write_seconds
+        self.pool_monitor = PoolMonitor()
+        self.client = None
+        self.db = None
+        self._read_view = None
+        self._primary_until = 0.0
+
+    def connect(self):
+        if self.client is not None:
+            return
+        self.client = AsyncIOMotorClient(
+            self.url, event_listeners=[*self.event_listeners, self.pool_monitor], **self.options
+        )
+        self.db = self.client[self.name]
+        if self.read_preference != "primary":
+            self._read_view = _ReadView(self.db, READ_PREFERENCES[self.read_preference])
+
+    @property
+    def reads(self):
+        if self._read_view is None or time.monotonic() < self._primary_until:
+            return self.db
+        return self._read_view
+
+    def mark_write(self):
+        """Route ``reads`` to the primary until secondaries have caught up with this write"""
+        self._primary_until = time.monotonic() + self.read_after_write_seconds
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name: str):
+        if self.db is None:
+            raise RuntimeError("Database used before connect()")
+        return self.db[name]
+
+    async def ping(self) -> float:
+        """Round-trip a ping to the server; returns latency in milliseconds"""
+        started = time.perf_counter()
+        await self.db.command("ping")
+        return (time.perf_counter() - started) * 1000
+
+    async def warm_up(self) -> float:
+        """Open min_pool_size connections before the first request needs them"""
+        started = time.perf_counter()
+        # Concurrent pings each check out their own connection
+        await asyncio.gather(*(self.ping() for _ in range(max(1, self.options["minPoolSize"]))))
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.info(f"MongoDB ready, {self.pool_size()} connections warmed in {elapsed:.1f}ms")
+        return elapsed
+
+    def pool_size(self) -> int:
+        return sum(server["open"] for server in self.pool_monitor.snapshot().values())
+
+    async def health(self) -> Dict[str, Any]:
+        servers = self.pool_monitor.snapshot()
+        max_pool_size = self.options["maxPoolSize"]
+        busiest = max((server["checked_out"] for server in servers.values()), default=0)
+        saturation = busiest / max_pool_size if max_pool_size else 0.0
+        health = {
+            "status": "ok",
+            "read_preference": self.read_preference,
+            "pool": {"max_size": max_pool_size, "saturation": round(saturation, 3), "servers": servers},
+        }
+        try:
+            health["ping_ms"] = round(await self.ping(), 2)
+        except Exception as e:
+            health["status"] = "unavailable"
+            health["error"] = str(e)
+            return health
+        if saturation >= MONGO_SATURATION_WARNING or any(s["waiting"] > 0 for s in servers.values()):
+            health["status"] = "degraded"
+        return health
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class FacetCounts:
+    """Document counts of one collection per combination of facet values, kept in memory.
+
+    Seeded from a single ``$group`` aggregation over the documents matching
+    ``match``; after that the write paths call ``apply`` with the old and
+    new version of each document they write, so lookups never touch
+    MongoDB. Writes this process cannot account for (bulk inserts, other
+    workers, edits outside the API) call ``invalidate`` and the next lookup
+    re-seeds. A write landing while a seed runs leaves the counts marked
+    stale, so a seed that may have missed it is replaced on the next lookup.
+    """
+
+    def __init__(self, collection_name: str, match: Dict[str, Any], facets: Sequence[str]):
+        self.collection_name = collection_name
+        self.match = match
+        self.facets = tuple(facets)
+        self.counts: Dict[Tuple[Any, ...], int] = defaultdict(int)
+        self.stale = True
+        self._writes = 0
+        self._lock = asyncio.Lock()
+
+    def _key(self, doc: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple(doc.get(name) for name in self.facets)
+
+    def _matches(self, doc: Optional[Dict[str, Any]]) -> bool:
+        return doc is not None and all(doc.get(field) == value for field, value in self.match.items())
+
+    async def seed(self, db):
+        writes = self._writes
+        pipeline = [
+            {"$match": self.match},
+            {"$group": {"_id": {name: f"${name}" for name in self.facets}, "count": {"$sum": 1}}},
+        ]
+        counts = defaultdict(int)
+        async for row in db[self.collection_name].aggregate(pipeline):
+            counts[tuple(row["_id"].get(name) for name in self.facets)] = row["count"]
+        self.counts = counts
+        self.stale = self._writes != writes
+
+    async def ensure(self, db):
+        if not self.stale:
+            return
+        async with self._lock:
+            if self.stale:
+                await self.seed(db)
+
+    def apply(self, previous: Optional[Dict[str, Any]], current: Optional[Dict[str, Any]]):
+        """Account for one document write; ``previous`` is None for inserts"""
+        self._writes += 1
+        if self._matches(previous):
+            key = self._key(previous)
+            self.counts[key] -= 1
+            if self.counts[key] <= 0:
+                del self.counts[key]
+        if self._matches(current):
+            self.counts[self._key(current)] += 1
+
+    def invalidate(self):
+        self._writes += 1
+        self.stale = True
+
+    async def count(self, db, **values) -> int:
+        """Documents whose facets equal ``values``; facets not given (or None) match anything"""
+        await self.ensure(db)
+        positions = [(self.facets.index(name), value) for name, value in values.items() if value is not None]
+        return sum(
+            count for key, count in self.counts.items()
+            if all(key[index] == value for index, value in positions)
+        )
+
+    async def breakdown(self, db, facet: str, *extra: str) -> List[Dict[str, Any]]:
+        """Count per value of ``facet``, plus how many of those have each ``extra`` facet set"""
+        await self.ensure(db)
+        index = self.facets.index(facet)
+        extra_indexes = [(name, self.facets.index(name)) for name in extra]
+        rows: Dict[Any, Dict[str, Any]] = {}
+        for key, count in self.counts.items():
+            row = rows.setdefault(key[index], {"name": key[index], "count": 0, **{name: 0 for name in extra}})
+            row["count"] += count
+            for name, extra_index in extra_indexes:
+                if key[extra_index]:
+                    row[name] += count
+        return sorted(rows.values(), key=lambda row: str(row["name"]))
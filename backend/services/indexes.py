@@ -0,0 +1,119 @@
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Set
+
+from pymongo import ASCENDING, DESCENDING
+
+logger = logging.getLogger(__name__)
+
+INDEX_PROVISIONING = os.getenv("INDEX_PROVISIONING", "true").lower() == "true"
+# "warn" logs bad plans, "fail" aborts startup, "off" skips explain()
+INDEX_VERIFY = os.getenv("INDEX_VERIFY", "warn").lower()
+
+# Every collection gets a unique index on "id"; the rest mirror the query shapes below
+INDEXES: Dict[str, List[List[tuple]]] = {
+    "blog_posts": [
+        [("published", ASCENDING), ("date", DESCENDING), ("id", DESCENDING)],
+        [("published", ASCENDING), ("category", ASCENDING), ("date", DESCENDING), ("id", DESCENDING)],
+        # Newest edit, measured for the collection version after every write
+        [("published", ASCENDING), ("updated_at", DESCENDING)],
+    ],
+    "testimonials": [
+        [("approved", ASCENDING), ("created_at", DESCENDING)],
+    ],
+    "projects": [
+        [("created_at", DESCENDING)],
+        [("category", ASCENDING), ("created_at", DESCENDING)],
+        [("featured", ASCENDING), ("created_at", DESCENDING)],
+        [("category", ASCENDING), ("featured", ASCENDING), ("created_at", DESCENDING)],
+    ],
+    "contacts": [
+        [("created_at", ASCENDING), ("id", ASCENDING)],
+    ],
+    "email_outbox": [
+        [("status", ASCENDING), ("next_attempt_at", ASCENDING)],
+        [("status", ASCENDING), ("locked_until", ASCENDING)],
+    ],
+}
+
+# Representative filters/sorts for every read the API issues
+_SAMPLE_DATE = datetime(2024, 1, 1)
+QUERY_SHAPES: List[Dict[str, Any]] = [
+    {"collection": "blog_posts", "filter": {"published": True}, "sort": [("date", -1), ("id", -1)]},
+    {"collection": "blog_posts", "filter": {"published": True, "category": "Tech"}, "sort": [("date", -1), ("id", -1)]},
+    {"collection": "blog_posts", "filter": {
+        "published": True,
+        "$or": [{"date": {"$lt": _SAMPLE_DATE}}, {"date": _SAMPLE_DATE, "id": {"$lt": "x"}}],
+    }, "sort": [("date", -1), ("id", -1)]},
+    {"collection": "blog_posts", "filter": {"id": "x", "published": True}, "sort": None},
+    {"collection": "blog_posts", "filter": {"published": True}, "sort": [("updated_at", -1)]},
+    {"collection": "testimonials", "filter": {"approved": True}, "sort": [("created_at", -1)]},
+    {"collection": "testimonials", "filter": {"approved": True}, "sort": [("id", 1)]},
+    {"collection": "projects", "filter": {}, "sort": [("created_at", -1)]},
+    {"collection": "projects", "filter": {"category": "Web"}, "sort": [("created_at", -1)]},
+    {"collection": "projects", "filter": {"featured": True}, "sort": [("created_at", -1)]},
+    {"collection": "projects", "filter": {"category": "Web", "featured": True}, "sort": [("created_at", -1)]},
+    {"collection": "projects", "filter": {}, "sort": [("id", 1)]},
+    {"collection": "contacts", "filter": {}, "sort": [("created_at", -1), ("id", -1)]},
+    {"collection": "contacts", "filter": {
+        "$or": [{"created_at": {"$gt": _SAMPLE_DATE}}, {"created_at": _SAMPLE_DATE, "id": {"$gt": "x"}}],
+    }, "sort": [("created_at", 1), ("id", 1)]},
+]
+
+BAD_STAGES = {"COLLSCAN", "SORT"}
+
+
+async def ensure_indexes(db):
+    """Create the indexes backing every query shape; safe to run on each startup"""
+    for collection, specs in INDEXES.items():
+        await db[collection].create_index([("id", ASCENDING)], unique=True)
+        for keys in specs:
+            await db[collection].create_index(keys)
+    logger.info(f"Ensured indexes on {len(INDEXES)} collections")
+
+
+def _plan_stages(plan: Any, found: Set[str]) -> Set[str]:
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            found.add(plan["stage"])
+        for value in plan.values():
+            _plan_stages(value, found)
+    elif isinstance(plan, list):
+        for item in plan:
+            _plan_stages(item, found)
+    return found
+
+
+async def verify_query_plans(db, strict: bool = False) -> List[Dict[str, Any]]:
+    """Explain each registered query shape and report collection scans or in-memory sorts"""
+    problems = []
+    for shape in QUERY_SHAPES:
+        cursor = db[shape["collection"]].find(shape["filter"])
+        if shape["sort"]:
+            cursor = cursor.sort(shape["sort"])
+        explain = await cursor.limit(10).explain()
+        stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}), set())
+        bad = sorted(stages & BAD_STAGES)
+        if bad:
+            problems.append({**shape, "stages": bad})
+            logger.warning(f"Query on {shape['collection']} {shape['filter']} uses {', '.join(bad)}")
+    if problems and strict:
+        raise RuntimeError(f"{len(problems)} query shapes are not fully index-backed")
+    return problems
+
+
+async def provision_indexes(db):
+    if INDEX_PROVISIONING:
+        await ensure_indexes(db)
+    if INDEX_VERIFY == "off":
+        return
+    try:
+        problems = await verify_query_plans(db, strict=INDEX_VERIFY == "fail")
+    except Exception as e:
+        if INDEX_VERIFY == "fail":
+            raise
+        logger.warning(f"Could not verify query plans: {str(e)}")
+        return
+    if not problems:
+        logger.info(f"All {len(QUERY_SHAPES)} query shapes are index-backed")
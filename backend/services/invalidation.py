@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# "none" for a single process, "ipc" for workers on one host, "changestream" across hosts
+INVALIDATION_BACKEND = os.getenv("INVALIDATION_BACKEND", "none").lower()
+INVALIDATION_SOCKET_DIR = os.getenv("INVALIDATION_SOCKET_DIR", "")
+INVALIDATION_RETRY_SECONDS = float(os.getenv("INVALIDATION_RETRY_SECONDS", "5"))
+# How long a worker waits for the change stream to echo one of its own writes back
+INVALIDATION_ECHO_SECONDS = float(os.getenv("INVALIDATION_ECHO_SECONDS", "10"))
+
+WATCHED_COLLECTIONS = ("blog_posts", "projects", "testimonials")
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class NullChannel:
+    """Single worker: local invalidation in the write path is all there is"""
+
+    async def start(self, handler: Handler):
+        pass
+
+    async def publish(self, event: Dict[str, Any]):
+        pass
+
+    async def stop(self):
+        pass
+
+
+class LocalSocketChannel:
+    """Broadcasts change events between workers on one host.
+
+    Each worker binds a Unix datagram socket named after its pid in a
+    shared directory; publishing sends one datagram to every other socket
+    there. Sockets left behind by dead workers are removed on first failed
+    send.
+    """
+
+    def __init__(self, directory: str):
+        if not directory:
+            raise ValueError("INVALIDATION_SOCKET_DIR is required for the ipc invalidation backend")
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}.sock")
+        self.sock: Optional[socket.socket] = None
+        self._handler: Optional[Handler] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(self, handler: Handler):
+        self._handler = handler
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.path)
+        self.sock.setblocking(False)
+        asyncio.get_running_loop().add_reader(self.sock.fileno(), self._receive)
+
+    def _receive(self):
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                return
+            try:
+                event = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                logger.warning("Ignoring malformed invalidation message")
+                continue
+            task = asyncio.ensure_future(self._handler(event))
+            self._tasks.add(task)
+            task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Failed to apply invalidation: {str(task.exception())}")
+
+    async def publish(self, event: Dict[str, Any]):
+        data = orjson.dumps(event)
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(".sock") or path == self.path:
+                continue
+            try:
+                self.sock.sendto(data, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            except BlockingIOError:
+                # The peer is not draining its socket; its version refresh will catch up
+                logger.warning(f"Invalidation queue full for {name}")
+
+    async def stop(self):
+        if self.sock is None:
+            return
+        asyncio.get_running_loop().remove_reader(self.sock.fileno())
+        self.sock.close()
+        self.sock = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ChangeStreamChannel:
+    """Every worker watches the content collections; MongoDB fans the writes out.
+
+    Needs a replica set (or Atlas). The write itself is the message, so
+    publishing only records that this worker already invalidated locally:
+    the stream's echo of a document write is skipped once, and inserts into
+    a collection this worker just bulk-invalidated are skipped for
+    ``echo_seconds``. A peer insert landing in that window is picked up by
+    the periodic version refresh instead.
+    """
+
+    def __init__(
+        self,
+        motor_db,
+        collections: Iterable[str] = WATCHED_COLLECTIONS,
+        echo_seconds: float = INVALIDATION_ECHO_SECONDS,
+    ):
+        self.motor_db = motor_db
+        self.collections = list(collections)
+        self.echo_seconds = echo_seconds
+        self._task: Optional[asyncio.Task] = None
+        # (collection, id) -> deadlines of this worker's writes not yet seen on the stream
+        self._own_writes: Dict[Tuple[str, str], List[float]] = {}
+        # collection -> until when inserts are covered by this worker's own bulk invalidation
+        self._own_bulk: Dict[str, float] = {}
+
+    async def start(self, handler: Handler):
+        self._task = asyncio.create_task(self._watch(handler))
+
+    async def _watch(self, handler: Handler):
+        pipeline = [{"$match": {"ns.coll": {"$in": self.collections}}}]
+        resume_token = None
+        while True:
+            try:
+                async with self.motor_db.watch(pipeline, full_document="updateLookup", resume_after=resume_token) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        if self._is_echo(change):
+                            continue
+                        document = change.get("fullDocument") or {}
+                        event = {"collection": change["ns"]["coll"], "id": document.get("id")}
+                        if change["operationType"] == "update":
+                            event["fields"] = list(change["updateDescription"]["updatedFields"])
+                        await handler(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Change stream interrupted, retrying in {INVALIDATION_RETRY_SECONDS}s: {str(e)}")
+                await asyncio.sleep(INVALIDATION_RETRY_SECONDS)
+
+    def _is_echo(self, change: Dict[str, Any]) -> bool:
+        now = time.monotonic()
+        collection = change["ns"]["coll"]
+        key = (collection, (change.get("fullDocument") or {}).get("id"))
+        deadlines = [deadline for deadline in self._own_writes.pop(key, []) if deadline > now]
+        if deadlines:
+            if deadlines[1:]:
+                self._own_writes[key] = deadlines[1:]
+            return True
+        return change["operationType"] == "insert" and self._own_bulk.get(collection, 0.0) > now
+
+    async def publish(self, event: Dict[str, Any]):
+        now = time.monotonic()
+        deadline = now + self.echo_seconds
+        if event.get("id"):
+            self._own_writes.setdefault((event["collection"], event["id"]), []).append(deadline)
+        else:
+            self._own_bulk[event["collection"]] = deadline
+        # Echoes the stream never delivered (e.g. it raced ahead of this call) just expire
+        self._own_writes = {
+            key: deadlines for key, deadlines in self._own_writes.items() if deadlines[-1] > now
+        }
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def build_invalidation_channel(motor_db, backend: str = INVALIDATION_BACKEND):
+    if backend == "ipc":
+        return LocalSocketChannel(INVALIDATION_SOCKET_DIR)
+    if backend == "changestream":
+        return ChangeStreamChannel(motor_db)
+    return NullChannel()
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import os
+import smtplib
+import time
+from collections import deque
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "true").lower() == "true"
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "2"))
+SMTP_IDLE_TIMEOUT = float(os.getenv("SMTP_IDLE_TIMEOUT", "60"))
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+
+
+def build_contact_message(name: str, sender_email: str, subject: str, message: str) -> MIMEMultipart:
+    """Build the notification email for a contact form submission"""
+    receiver_email = os.getenv("EMAIL_TO")
+    smtp_user = os.getenv("EMAIL_USER")
+
+    if not all([receiver_email, smtp_user]):
+        raise Exception("Email environment variables not set")
+
+    msg = MIMEMultipart()
+    msg["From"] = smtp_user
+    msg["To"] = receiver_email
+    msg["Subject"] = f"Portfolio Contact Form: {subject}"
+
+    body = f"""
+New message from portfolio contact form:
+
+Name: {name}
+Email: {sender_email}
+Subject: {subject}
+Message: {message}
+"""
+    msg.attach(MIMEText(body, "plain"))
+    return msg
+
+
+class _PooledConnection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+
+
+class SMTPConnectionPool:
+    """Keeps authenticated SMTP sessions open between sends.
+
+    smtplib is blocking, so every network call runs in a worker thread. At
+    most ``max_size`` sessions exist at once; sessions idle for longer than
+    ``idle_timeout`` are closed and replaced before the server drops them.
+    """
+
+    def __init__(
+        self,
+        host: str = SMTP_HOST,
+        port: int = SMTP_PORT,
+        use_ssl: bool = SMTP_USE_SSL,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        max_size: int = SMTP_POOL_SIZE,
+        idle_timeout: float = SMTP_IDLE_TIMEOUT,
+        timeout: float = SMTP_TIMEOUT,
+        on_send: Optional[Callable[[Optional[float], Optional[Exception]], None]] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.user = user if user is not None else os.getenv("EMAIL_USER")
+        self.password = password if password is not None else os.getenv("EMAIL_PASSWORD")
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        # Called once per message with (send duration or None, error or None)
+        self.on_send = on_send
+        self._slots = asyncio.Semaphore(max_size)
+        self._idle: List[_PooledConnection] = []
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self._stats = {
+            "sends": 0,
+            "failures": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "reconnects": 0,
+        }
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        smtp = smtp_class(self.host, self.port, timeout=self.timeout)
+        # Local stand-in servers usually run without auth
+        if self.password:
+            smtp.login(self.user, self.password)
+        return smtp
+
+    @staticmethod
+    def _close(conn: _PooledConnection):
+        try:
+            conn.smtp.quit()
+        except Exception:
+            conn.smtp.close()
+
+    async def _open(self) -> _PooledConnection:
+        conn = _PooledConnection(await asyncio.to_thread(self._connect))
+        self._stats["connections_opened"] += 1
+        return conn
+
+    async def _acquire(self) -> _PooledConnection:
+        await self._slots.acquire()
+        try:
+            now = time.monotonic()
+            while self._idle:
+                conn = self._idle.pop()
+                if now - conn.last_used < self.idle_timeout:
+                    self._stats["connections_reused"] += 1
+                    return conn
+                await asyncio.to_thread(self._close, conn)
+            return await self._open()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: Optional[_PooledConnection]):
+        if conn is not None:
+            conn.last_used = time.monotonic()
+            self._idle.append(conn)
+        self._slots.release()
+
+    async def send_many(self, messages: List[MIMEMultipart]) -> List[Optional[Exception]]:
+        """Send messages over a single session; returns one error (or None) per message"""
+        errors: List[Optional[Exception]] = []
+        conn: Optional[_PooledConnection] = None
+        try:
+            conn = await self._acquire()
+        except Exception as e:
+            self._stats["failures"] += len(messages)
+            logger.error(f"SMTP connection failed: {str(e)}")
+            for _ in messages:
+                self._notify(None, e)
+            return [e] * len(messages)
+
+        try:
+            for msg in messages:
+                started = time.perf_counter()
+                try:
+                    try:
+                        await asyncio.to_thread(conn.smtp.send_message, msg)
+                    except smtplib.SMTPServerDisconnected:
+                        # Server closed the session under us; retry once on a fresh one
+                        self._stats["reconnects"] += 1
+                        conn = await self._open()
+                        await asyncio.to_thread(conn.smtp.send_message, msg)
+                except Exception as e:
+                    self._stats["failures"] += 1
+                    self._notify(time.perf_counter() - started, e)
+                    errors.append(e)
+                    # Rejected messages leave the session usable; anything else does not
+                    if not isinstance(e, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)):
+                        conn.smtp.close()
+                        conn = None
+                        break
+                else:
+                    conn.uses += 1
+                    self._stats["sends"] += 1
+                    elapsed = time.perf_counter() - started
+                    self._latencies.append(elapsed)
+                    self._notify(elapsed, None)
+                    errors.append(None)
+        finally:
+            self._release(conn)
+
+        # Anything left unsent after a dead connection is reported as failed
+        while len(errors) < len(messages):
+            self._stats["failures"] += 1
+            errors.append(smtplib.SMTPServerDisconnected("Connection lost before send"))
+            self._notify(None, errors[-1])
+        return errors
+
+    def _notify(self, duration: Optional[float], error: Optional[Exception]):
+        if self.on_send is not None:
+            self.on_send(duration, error)
+
+    async def send(self, msg: MIMEMultipart):
+        error = (await self.send_many([msg]))[0]
+        if error is not None:
+            raise error
+
+    async def close(self):
+        while self._idle:
+            await asyncio.to_thread(self._close, self._idle.pop())
+
+    def stats(self) -> Dict[str, float]:
+        latencies = sorted(self._latencies)
+        opened = self._stats["connections_opened"]
+        reused = self._stats["connections_reused"]
+        stats = dict(self._stats)
+        stats["idle_connections"] = len(self._idle)
+        stats["reuse_rate"] = round(reused / (opened + reused), 3) if opened + reused else 0.0
+        if latencies:
+            stats["latency_avg_ms"] = round(sum(latencies) / len(latencies) * 1000, 2)
+            stats["latency_p50_ms"] = round(latencies[len(latencies) // 2] * 1000, 2)
+            stats["latency_p95_ms"] = round(latencies[int(len(latencies) * 0.95)] * 1000, 2)
+            stats["latency_max_ms"] = round(latencies[-1] * 1000, 2)
+        return stats
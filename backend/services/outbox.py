@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import uuid
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "10"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "3600"))
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "120"))
+
+# Delivery states
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+DEAD = "dead"
+
+
+def backoff_delay(attempts: int, base: float = OUTBOX_BACKOFF_BASE, cap: float = OUTBOX_BACKOFF_MAX) -> float:
+    """Exponential backoff in seconds for the given number of failed attempts"""
+    return min(cap, base * (2 ** max(0, attempts - 1)))
+
+
+class EmailOutbox:
+    """Durable queue of pending email deliveries backed by a Mongo collection.
+
+    Request handlers call ``enqueue`` and return immediately; a background
+    task claims due records in batches and hands their payloads to
+    ``send_batch``, which returns one error (or None) per payload.
+    """
+
+    def __init__(
+        self,
+        collection,
+        send_batch: Callable[[List[Dict[str, Any]]], Awaitable[List[Optional[Exception]]]],
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        poll_interval: float = OUTBOX_POLL_INTERVAL,
+        lease_seconds: float = OUTBOX_LEASE_SECONDS,
+    ):
+        self.collection = collection
+        self.send_batch = send_batch
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def enqueue(self, contact_id: str, payload: Dict[str, Any]) -> str:
+        now = datetime.utcnow()
+        record = {
+            "id": str(uuid.uuid4()),
+            "contact_id": contact_id,
+            "payload": payload,
+            "status": PENDING,
+            "attempts": 0,
+            "last_error": None,
+            "next_attempt_at": now,
+            "locked_until": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        await self.collection.insert_one(record)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return record["id"]
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": PENDING, "next_attempt_at": {"$lte": now}},
+                    # A worker that died mid-send leaves its lease behind
+                    {"status": SENDING, "locked_until": {"$lte": now}},
+                ]
+            },
+            {"$set": {
+                "status": SENDING,
+                "locked_until": now + timedelta(seconds=self.lease_seconds),
+                "updated_at": now,
+            }},
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def claim_batch(self) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < self.batch_size:
+            record = await self._claim()
+            if not record:
+                break
+            batch.append(record)
+        return batch
+
+    async def _mark_sent(self, record: Dict[str, Any]):
+        await self.collection.update_one(
+            {"id": record["id"]},
+            {"$set": {
+                "status": SENT,
+                "locked_until": None,
+                "sent_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+            }, "$inc": {"attempts": 1}},
+        )
+        logger.info(f"Outbox delivered {record['id']} for contact {record['contact_id']}")
+
+    async def _mark_failed(self, record: Dict[str, Any], error: Exception):
+        attempts = record.get("attempts", 0) + 1
+        now = datetime.utcnow()
+        update = {
+            "attempts": attempts,
+            "last_error": str(error),
+            "locked_until": None,
+            "updated_at": now,
+        }
+        if attempts >= self.max_attempts:
+            update["status"] = DEAD
+            logger.error(f"Outbox giving up on {record['id']} after {attempts} attempts: {error}")
+        else:
+            delay = backoff_delay(attempts)
+            update["status"] = PENDING
+            update["next_attempt_at"] = now + timedelta(seconds=delay)
+            logger.warning(f"Outbox delivery {record['id']} failed (attempt {attempts}), retrying in {delay:.0f}s: {error}")
+        await self.collection.update_one({"id": record["id"]}, {"$set": update})
+
+    async def drain_once(self) -> int:
+        """Claim and deliver one batch; returns the number of records processed"""
+        batch = await self.claim_batch()
+        if not batch:
+            return 0
+        try:
+            errors = await self.send_batch([record["payload"] for record in batch])
+        except Exception as e:
+            errors = [e] * len(batch)
+        for record, error in zip(batch, errors):
+            if error is None:
+                await self._mark_sent(record)
+            else:
+                await self._mark_failed(record, error)
+        return len(batch)
+
+    async def _run(self):
+        logger.info("Email outbox worker started")
+        while not self._stopping:
+            # Cleared before draining so an enqueue during the drain is not lost
+            self._wakeup.clear()
+            try:
+                processed = await self.drain_once()
+            except Exception as e:
+                logger.error(f"Outbox worker error: {str(e)}")
+                processed = 0
+            if processed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        logger.info("Email outbox worker stopped")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            # Created here so the event belongs to the loop the worker runs on
+            self._wakeup = asyncio.Event()
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def stats(self) -> Dict[str, int]:
+        counts = {PENDING: 0, SENDING: 0, SENT: 0, DEAD: 0}
+        async for row in self.collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+        return counts
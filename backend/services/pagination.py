@@ -0,0 +1,57 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+# Keyset order for blog listings; "id" breaks ties between posts with equal dates
+BLOG_SORT = [("date", -1), ("id", -1)]
+# Oldest-first order of contact exports, resumed from the last row's (created_at, id)
+CONTACT_EXPORT_SORT = [("created_at", 1), ("id", 1)]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(post: Dict[str, Any]) -> str:
+    """Opaque token pointing just past the given post in BLOG_SORT order"""
+    raw = json.dumps({"d": post["date"].isoformat(), "i": post["id"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["d"]), str(data["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {token}") from e
+
+
+def keyset_query(query: Dict[str, Any], token: str) -> Dict[str, Any]:
+    """Narrow ``query`` to the documents that come after ``token``"""
+    date, post_id = decode_cursor(token)
+    return {
+        **query,
+        "$or": [
+            {"date": {"$lt": date}},
+            {"date": date, "id": {"$lt": post_id}},
+        ],
+    }
+
+
+def resume_query(query: Dict[str, Any], created_at: datetime, contact_id: Optional[str] = None) -> Dict[str, Any]:
+    """Narrow ``query`` to the submissions after (``created_at``, ``contact_id``) in CONTACT_EXPORT_SORT order.
+
+    Without an id only strictly later timestamps match, which skips rows that
+    share the last exported millisecond; exports resume with both values.
+    """
+    if contact_id is None:
+        return {**query, "created_at": {"$gt": created_at}}
+    return {
+        **query,
+        "$or": [
+            {"created_at": {"$gt": created_at}},
+            {"created_at": created_at, "id": {"$gt": contact_id}},
+        ],
+    }
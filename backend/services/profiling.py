@@ -0,0 +1,186 @@
+import asyncio
+import contextvars
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Optional
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+# Fraction of requests profiled (0 disables sampling)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Requests sending "X-Profile: <token>" are always profiled when a token is set
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "1")) / 1000
+
+PROFILE_HEADER = b"x-profile"
+SLUG_RE = re.compile(r'[^A-Za-z0-9]+')
+
+_current: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar("request_profile", default=None)
+_NO_PHASE = nullcontext()
+
+
+def profiling_enabled() -> bool:
+    return PROFILE_SAMPLE_RATE > 0 or bool(PROFILE_ADMIN_TOKEN)
+
+
+class RequestProfile:
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.status: Optional[int] = None
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def server_timing(self) -> bytes:
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items()]
+        entries.append(f"app;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(entries).encode()
+
+
+class _Phase:
+    __slots__ = ("profile", "name", "started")
+
+    def __init__(self, profile: RequestProfile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profile.add(self.name, time.perf_counter() - self.started)
+
+
+def phase(name: str):
+    """Time a block as a named phase of the current request, if it is being profiled.
+
+    Outside a profiled request this is one ContextVar lookup returning a
+    shared no-op context manager.
+    """
+    profile = _current.get()
+    if profile is None:
+        return _NO_PHASE
+    return _Phase(profile, name)
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts.
+
+    The event loop thread is shared, so samples can include other requests
+    running concurrently with the profiled one.
+    """
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL):
+        super().__init__(daemon=True, name="stack-sampler")
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    async def stop(self, timeout: float = 1.0) -> Counter:
+        """Stop sampling; the join runs in a worker thread so the loop keeps serving meanwhile"""
+        self._stopped.set()
+        await asyncio.to_thread(self.join, timeout)
+        # A copy, in case a slow final sample is still being counted after the timeout
+        return Counter(self.stacks)
+
+
+def write_profile(directory: str, profile: RequestProfile, stacks: Counter, total: float) -> Path:
+    """Write ``<name>.collapsed`` (flamegraph.pl / speedscope input) and ``<name>.json`` phase timings"""
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    name = f"{int(time.time() * 1000)}-{profile.method}-{SLUG_RE.sub('_', profile.path).strip('_')}-{uuid4().hex[:8]}"
+    with open(path / f"{name}.collapsed", "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    with open(path / f"{name}.json", "w") as f:
+        json.dump({
+            "method": profile.method,
+            "path": profile.path,
+            "status": profile.status,
+            "total_ms": round(total * 1000, 3),
+            "phases_ms": {phase_name: round(seconds * 1000, 3) for phase_name, seconds in profile.phases.items()},
+            "samples": sum(stacks.values()),
+        }, f, indent=2)
+    return path / name
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling a sampled fraction of requests, or those carrying the admin header.
+
+    Profiled responses get a ``Server-Timing`` header with the phase
+    timings. Only installed when profiling is configured, so it costs
+    nothing otherwise.
+    """
+
+    def __init__(
+        self,
+        app,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+        admin_token: str = PROFILE_ADMIN_TOKEN,
+        directory: str = PROFILE_DIR,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.admin_token = admin_token.encode()
+        self.directory = directory
+
+    def _should_profile(self, scope) -> bool:
+        if self.admin_token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.admin_token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            return await self.app(scope, receive, send)
+
+        profile = RequestProfile(scope["method"], scope["path"])
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", profile.server_timing())]}
+            await send(message)
+
+        token = _current.set(profile)
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            stacks = await sampler.stop()
+            _current.reset(token)
+            total = time.perf_counter() - profile.started
+            try:
+                written = await asyncio.to_thread(write_profile, self.directory, profile, stacks, total)
+                logger.info(f"Profiled {profile.method} {profile.path} in {total * 1000:.1f}ms -> {written}")
+            except OSError as e:
+                logger.error(f"Failed to write profile: {str(e)}")
@@ -0,0 +1,251 @@
+import math
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+import orjson
+from pymongo import ReturnDocument
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# "memory" keeps buckets per worker; "mongo" shares them across workers
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_CONTACT = os.getenv("RATE_LIMIT_CONTACT", "5/minute")
+RATE_LIMIT_TESTIMONIALS = os.getenv("RATE_LIMIT_TESTIMONIALS", "3/minute")
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+RATE_LIMIT_SWEEP_INTERVAL = float(os.getenv("RATE_LIMIT_SWEEP_INTERVAL", "60"))
+RATE_LIMIT_MAX_BODY = 64 * 1024
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(spec: str) -> Tuple[int, float]:
+    """Parse "5/minute" into (bucket capacity, tokens refilled per second)"""
+    count, _, period = spec.partition("/")
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period.strip().rstrip("s")]
+
+
+class RouteLimit:
+    def __init__(self, method: str, path: str, spec: str, body_keys: Iterable[str] = ()):
+        self.method = method
+        self.path = path
+        self.capacity, self.rate = parse_rate(spec)
+        # JSON body fields that get their own bucket alongside the client IP
+        self.body_keys = tuple(body_keys)
+
+
+class InMemoryRateLimitBackend:
+    """Token buckets in a dict: O(1) per hit, idle buckets swept periodically"""
+
+    def __init__(self, sweep_interval: float = RATE_LIMIT_SWEEP_INTERVAL):
+        self.sweep_interval = sweep_interval
+        # key -> [tokens, updated_at, refilled_at]
+        self._buckets: Dict[str, List[float]] = {}
+        self._last_sweep = time.monotonic()
+
+    async def hit(self, key: str, capacity: int, rate: float) -> float:
+        """Take one token; returns 0 when allowed, otherwise seconds until one is available"""
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_interval:
+            self._sweep(now)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(capacity), now, now]
+        else:
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            bucket[2] = now + (capacity - bucket[0]) / rate
+            return 0.0
+        return (1 - bucket[0]) / rate
+
+    def _sweep(self, now: float):
+        # A bucket that has refilled completely is the same as no bucket at all
+        expired = [key for key, bucket in self._buckets.items() if bucket[2] <= now]
+        for key in expired:
+            del self._buckets[key]
+        self._last_sweep = now
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class MongoRateLimitBackend:
+    """Token buckets shared by every worker, updated atomically in one round trip.
+
+    Documents expire through a TTL index on ``expires_at`` once the bucket
+    would be full again. The collection is looked up on use, so the backend
+    can be built before the database connects.
+    """
+
+    def __init__(self, db, collection_name: str = "rate_limits"):
+        self.db = db
+        self.collection_name = collection_name
+        self._indexed = False
+
+    @property
+    def collection(self):
+        return self.db[self.collection_name]
+
+    async def hit(self, key: str, capacity: int, rate: float) -> float:
+        if not self._indexed:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexed = True
+        now = datetime.utcnow()
+        elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        refilled = {"$min": [capacity, {"$add": [{"$ifNull": ["$tokens", capacity]}, {"$multiply": [elapsed, rate]}]}]}
+        bucket = await self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": now}},
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+                {"$set": {
+                    "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    "expires_at": now + timedelta(seconds=capacity / rate),
+                }},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if bucket["allowed"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / rate
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying per-route token buckets keyed by client IP and body fields.
+
+    Rejections are answered before the request reaches FastAPI. Keys that
+    were just rejected are remembered locally until their retry time, so
+    repeated attempts are refused without consulting the backend at all.
+    Routes with body keys refuse bodies over RATE_LIMIT_MAX_BODY with 413,
+    having read no more than that much of them.
+    """
+
+    def __init__(self, app, limits: Iterable[RouteLimit], backend=None, enabled: bool = RATE_LIMIT_ENABLED):
+        self.app = app
+        self.limits = {(limit.method, limit.path): limit for limit in limits}
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.enabled = enabled
+        self._blocked: Dict[str, float] = {}
+        self._last_sweep = time.monotonic()
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        limit = self.limits.get((scope["method"], scope["path"]))
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        keys = [f"{limit.path}:ip:{self._client_ip(scope)}"]
+        if limit.body_keys:
+            body, receive = await self._buffer_body(scope, receive)
+            if body is None:
+                return await self._too_large(send)
+            keys.extend(f"{limit.path}:{name}:{value}" for name, value in self._body_values(body, limit.body_keys))
+
+        retry_after = await self._check(keys, limit)
+        if retry_after:
+            return await self._reject(send, retry_after)
+        await self.app(scope, receive, send)
+
+    async def _check(self, keys: List[str], limit: RouteLimit) -> float:
+        now = time.monotonic()
+        if now - self._last_sweep >= RATE_LIMIT_SWEEP_INTERVAL:
+            self._blocked = {key: until for key, until in self._blocked.items() if until > now}
+            self._last_sweep = now
+        for key in keys:
+            until = self._blocked.get(key)
+            if until is not None and until > now:
+                return until - now
+        for key in keys:
+            wait = await self.backend.hit(key, limit.capacity, limit.rate)
+            if wait:
+                self._blocked[key] = now + wait
+                return wait
+        return 0.0
+
+    @staticmethod
+    def _client_ip(scope) -> str:
+        if RATE_LIMIT_TRUST_FORWARDED:
+            for name, value in scope.get("headers", ()):
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    async def _buffer_body(scope, receive):
+        """Read the request body once and hand downstream a receive() that replays it.
+
+        The body is None when it is larger than RATE_LIMIT_MAX_BODY; reading
+        stops as soon as that is known.
+        """
+        for name, value in scope.get("headers", ()):
+            if name == b"content-length" and value.isdigit() and int(value) > RATE_LIMIT_MAX_BODY:
+                return None, receive
+        chunks, size, more_body = [], 0, True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if size > RATE_LIMIT_MAX_BODY:
+                return None, receive
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return body, replay
+
+    @staticmethod
+    def _body_values(body: bytes, names: Tuple[str, ...]):
+        if not body:
+            return []
+        try:
+            data = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return []
+        if not isinstance(data, dict):
+            return []
+        return [(name, str(data[name]).strip().lower()) for name in names if data.get(name)]
+
+    @staticmethod
+    async def _reject(send, retry_after: float):
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": b'{"detail":"Too many requests"}'})
+
+    @staticmethod
+    async def _too_large(send):
+        await send({"type": "http.response.start", "status": 413, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b'{"detail":"Request body too large"}'})
+
+
+def build_rate_limit_backend(db):
+    if RATE_LIMIT_BACKEND == "mongo":
+        return MongoRateLimitBackend(db)
+    return InMemoryRateLimitBackend()
+
+
+def default_limits() -> List[RouteLimit]:
+    return [
+        RouteLimit("POST", "/api/contact", RATE_LIMIT_CONTACT, body_keys=("email",)),
+        RouteLimit("POST", "/api/testimonials", RATE_LIMIT_TESTIMONIALS),
+    ]
@@ -0,0 +1,611 @@
+import asyncio
+import bisect
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_SNAPSHOT_PATH = os.getenv("SEARCH_SNAPSHOT_PATH", "")
+SEARCH_MAX_PREFIX_EXPANSIONS = int(os.getenv("SEARCH_MAX_PREFIX_EXPANSIONS", "20"))
+# Caps the postings scanned for prefix expansions so short prefixes stay fast
+SEARCH_PREFIX_POSTINGS_BUDGET = int(os.getenv("SEARCH_PREFIX_POSTINGS_BUDGET", "3000"))
+# Postings at least this long are read in impact order and cut off early; shorter ones are scored in full
+SEARCH_IMPACT_LIST_MIN = int(os.getenv("SEARCH_IMPACT_LIST_MIN", "1024"))
+# Most frequent terms per type whose impact lists are sorted as part of a build, before the first query needs them
+SEARCH_IMPACT_PREWARM_TERMS = int(os.getenv("SEARCH_IMPACT_PREWARM_TERMS", "20"))
+# Documents tokenized per worker-thread hop during builds and syncs
+SEARCH_SYNC_BATCH_SIZE = int(os.getenv("SEARCH_SYNC_BATCH_SIZE", "500"))
+# Tokenized documents a sync applies to the live index between yields to the event loop
+SEARCH_APPLY_SLICE = 50
+
+TOKEN_RE = re.compile(r'\w+')
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or that the this to was were will with".split()
+)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Length normalisation split into a constant and a per-length factor
+NORM_BASE = K1 * (1 - B)
+NORM_SCALE = K1 * B
+# Impact lists are re-sorted once the average length drifts this far from the one they were sorted with
+IMPACT_DRIFT_LIMIT = 1.25
+
+# Field weights applied to term frequencies
+BLOG_FIELDS = {"title": 3.0, "excerpt": 2.0, "content": 1.0}
+PROJECT_FIELDS = {"title": 3.0, "technologies": 2.0, "description": 1.0}
+
+SNAPSHOT_VERSION = 2
+
+# (doc_type, doc_id, weighted term frequencies or None to remove, meta)
+Prepared = Tuple[str, str, Optional[Dict[str, float]], Dict[str, Any]]
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(HTML_TAG_RE.sub(" ", text).lower()) if t not in STOPWORDS]
+
+
+def term_frequencies(fields: Dict[str, str], weights: Dict[str, float]) -> Dict[str, float]:
+    frequencies: Dict[str, float] = defaultdict(float)
+    for name, text in fields.items():
+        weight = weights.get(name, 1.0)
+        for term in tokenize(text):
+            frequencies[term] += weight
+    return frequencies
+
+
+def blog_document(post: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    fields = {name: post.get(name) or "" for name in BLOG_FIELDS}
+    meta = {"title": post["title"], "category": post.get("category"), "summary": post.get("excerpt", "")}
+    return fields, meta
+
+
+def project_document(project: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    fields = {
+        "title": project.get("title") or "",
+        "technologies": " ".join(project.get("technologies") or []),
+        "description": project.get("description") or "",
+    }
+    meta = {"title": project["title"], "category": project.get("category"), "summary": project.get("description", "")[:200]}
+    return fields, meta
+
+
+def prepare_documents(batch: Iterable[Tuple[str, Dict[str, Any]]]) -> List[Prepared]:
+    """Tokenize raw posts and projects; pure, so it can run in a worker thread"""
+    prepared = []
+    for doc_type, doc in batch:
+        if doc_type == "blog":
+            if not doc.get("published"):
+                prepared.append(("blog", doc["id"], None, {}))
+                continue
+            fields, meta = blog_document(doc)
+            prepared.append(("blog", doc["id"], term_frequencies(fields, BLOG_FIELDS), meta))
+        else:
+            fields, meta = project_document(doc)
+            prepared.append(("project", doc["id"], term_frequencies(fields, PROJECT_FIELDS), meta))
+    return prepared
+
+
+def impact(frequency: float, length: float, average_length: float) -> float:
+    """BM25 saturation of one term in one document, before the idf and (K1 + 1) factors"""
+    return frequency / (frequency + NORM_BASE + NORM_SCALE * length / average_length)
+
+
+class SearchIndex:
+    """Incremental in-memory inverted index with BM25 ranking and prefix matching.
+
+    Postings are kept per document type and map each term to
+    ``{doc_key: weighted term frequency}``, so a type filter never touches
+    the other types' documents. Long postings also get an impact-ordered
+    list (highest BM25 contribution first); queries read those lists in
+    step and stop once no unread document can enter the top ``limit``
+    (threshold algorithm, using each list's next impact as the bound).
+    A sorted vocabulary lets the last characters typed match as a prefix.
+
+    Lookups and single-document writes run on the event loop; the heavy
+    work does not. Documents are tokenized in a worker thread a batch at a
+    time, a cold build fills a separate index there before it is swapped
+    in, and ``prepare`` sorts the impact lists a query needs there too.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(dict)
+        self.doc_frequency: Dict[str, int] = {}
+        self.doc_terms: Dict[str, List[str]] = {}
+        self.doc_lengths: Dict[str, float] = {}
+        self.doc_meta: Dict[str, Dict[str, Any]] = {}
+        self.vocabulary: List[str] = []
+        self.total_length = 0.0
+        self.synced_at: Optional[datetime] = None
+        self.ready = False
+        # (doc_type, term) -> (average length sorted with, [(-impact, doc_key), ...])
+        self._impacts: Dict[Tuple[str, str], Tuple[float, List[Tuple[float, str]]]] = {}
+        # New terms collected during a bulk load, merged into the vocabulary in one sort
+        self._pending_terms: Optional[set] = None
+        # Impact lists being sorted in a worker thread, and those written to meanwhile
+        self._sorts: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._dirty: set = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    # ---------------------
+    # Writes
+    # ---------------------
+    def add(self, doc_type: str, doc_id: str, fields: Dict[str, str], weights: Dict[str, float], meta: Dict[str, Any]):
+        self._apply(doc_type, doc_id, term_frequencies(fields, weights), meta)
+
+    def _apply(self, doc_type: str, doc_id: str, frequencies: Dict[str, float], meta: Dict[str, Any]):
+        key = f"{doc_type}:{doc_id}"
+        if key in self.doc_terms:
+            self.remove(doc_type, doc_id)
+
+        length = sum(frequencies.values())
+        postings = self.postings[doc_type]
+        doc_frequency = self.doc_frequency
+        for term, frequency in frequencies.items():
+            term_postings = postings.get(term)
+            if term_postings is None:
+                postings[term] = {key: frequency}
+            else:
+                term_postings[key] = frequency
+            df = doc_frequency.get(term)
+            if df is None:
+                self._add_term(term)
+                doc_frequency[term] = 1
+            else:
+                doc_frequency[term] = df + 1
+        if self._impacts:
+            for term, frequency in frequencies.items():
+                self._impact_insert(doc_type, term, key, frequency, length)
+        if self._sorts:
+            self._dirty.update((doc_type, term) for term in frequencies)
+        self.doc_terms[key] = list(frequencies)
+        self.doc_lengths[key] = length
+        self.doc_meta[key] = {"type": doc_type, "id": doc_id, **meta}
+        self.total_length += length
+
+    def remove(self, doc_type: str, doc_id: str):
+        key = f"{doc_type}:{doc_id}"
+        terms = self.doc_terms.pop(key, None)
+        if terms is None:
+            return
+        length = self.doc_lengths.pop(key, 0.0)
+        postings = self.postings.get(doc_type, {})
+        if self._sorts:
+            self._dirty.update((doc_type, term) for term in terms)
+        for term in terms:
+            term_postings = postings.get(term)
+            frequency = term_postings.pop(key, None) if term_postings is not None else None
+            if frequency is None:
+                continue
+            if term_postings:
+                self._impact_remove(doc_type, term, key, frequency, length)
+            else:
+                del postings[term]
+                self._impacts.pop((doc_type, term), None)
+            df = self.doc_frequency.get(term, 0) - 1
+            if df > 0:
+                self.doc_frequency[term] = df
+            else:
+                self.doc_frequency.pop(term, None)
+                self._drop_term(term)
+        self.total_length -= length
+        self.doc_meta.pop(key, None)
+
+    def add_blog_post(self, post: Dict[str, Any]):
+        if not post.get("published"):
+            self.remove("blog", post["id"])
+            return
+        fields, meta = blog_document(post)
+        self.add("blog", post["id"], fields, BLOG_FIELDS, meta)
+
+    def add_project(self, project: Dict[str, Any]):
+        fields, meta = project_document(project)
+        self.add("project", project["id"], fields, PROJECT_FIELDS, meta)
+
+    def apply_prepared(self, prepared: Iterable[Prepared]):
+        with self._bulk():
+            for doc_type, doc_id, frequencies, meta in prepared:
+                if frequencies is None:
+                    self.remove(doc_type, doc_id)
+                else:
+                    self._apply(doc_type, doc_id, frequencies, meta)
+
+    @contextmanager
+    def _bulk(self):
+        """Defer vocabulary upkeep to one sort instead of an insort per new term"""
+        if self._pending_terms is not None:
+            yield
+            return
+        self._pending_terms = set()
+        try:
+            yield
+        finally:
+            pending, self._pending_terms = self._pending_terms, None
+            if pending:
+                # Two sorted runs: timsort merges them in linear time
+                self.vocabulary.extend(sorted(pending))
+                self.vocabulary.sort()
+
+    def _add_term(self, term: str):
+        if self._pending_terms is not None:
+            self._pending_terms.add(term)
+        else:
+            bisect.insort(self.vocabulary, term)
+
+    def _drop_term(self, term: str):
+        if self._pending_terms is not None and term in self._pending_terms:
+            self._pending_terms.discard(term)
+            return
+        index = bisect.bisect_left(self.vocabulary, term)
+        if index < len(self.vocabulary) and self.vocabulary[index] == term:
+            self.vocabulary.pop(index)
+
+    def _impact_insert(self, doc_type: str, term: str, key: str, frequency: float, length: float):
+        cached = self._impacts.get((doc_type, term))
+        if cached is None:
+            return
+        if self._pending_terms is not None:
+            # Bulk loads touch most lists; re-sorting on the next query is cheaper
+            del self._impacts[(doc_type, term)]
+            return
+        average_length, entries = cached
+        bisect.insort(entries, (-impact(frequency, length, average_length), key))
+
+    def _impact_remove(self, doc_type: str, term: str, key: str, frequency: float, length: float):
+        cached = self._impacts.get((doc_type, term))
+        if cached is None:
+            return
+        average_length, entries = cached
+        entry = (-impact(frequency, length, average_length), key)
+        index = bisect.bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            entries.pop(index)
+        else:
+            del self._impacts[(doc_type, term)]
+
+    # ---------------------
+    # Queries
+    # ---------------------
+    def _expand(self, token: str, prefix: bool) -> Iterable[Tuple[str, float]]:
+        if token in self.doc_frequency:
+            yield token, 1.0
+        if not prefix:
+            return
+        index = bisect.bisect_right(self.vocabulary, token)
+        expansions, budget = 0, SEARCH_PREFIX_POSTINGS_BUDGET
+        while index < len(self.vocabulary) and expansions < SEARCH_MAX_PREFIX_EXPANSIONS and budget > 0:
+            term = self.vocabulary[index]
+            if not term.startswith(token):
+                break
+            # Prefix matches count for less than the exact word
+            yield term, 0.5
+            index += 1
+            expansions += 1
+            budget -= self.doc_frequency[term]
+
+    def _average_length(self) -> float:
+        return self.total_length / len(self.doc_terms) if self.doc_terms else 1.0
+
+    def _impact_current(self, pair: Tuple[str, str], average_length: float) -> bool:
+        cached = self._impacts.get(pair)
+        return cached is not None and 1 / IMPACT_DRIFT_LIMIT <= average_length / cached[0] <= IMPACT_DRIFT_LIMIT
+
+    def _sorted_impacts(self, items: List[Tuple[str, float]], average_length: float) -> List[Tuple[float, str]]:
+        # Only point lookups on shared state, so it is safe in a worker thread
+        lengths = self.doc_lengths
+        entries = []
+        for key, frequency in items:
+            length = lengths.get(key)
+            if length is not None:
+                entries.append((-impact(frequency, length, average_length), key))
+        entries.sort()
+        return entries
+
+    def _impact_list(self, doc_type: str, term: str, postings: Dict[str, float], average_length: float):
+        if self._impact_current((doc_type, term), average_length):
+            return self._impacts[(doc_type, term)]
+        # Not prepared by ``prepare`` (or written to since): sort here
+        cached = self._impacts[(doc_type, term)] = (average_length, self._sorted_impacts(list(postings.items()), average_length))
+        return cached
+
+    async def _sort_impact_list(self, pair: Tuple[str, str]):
+        task = self._sorts.get(pair)
+        if task is None:
+            task = asyncio.ensure_future(self._run_sort(pair))
+            self._sorts[pair] = task
+            task.add_done_callback(lambda done: self._sorts.pop(pair, None) if self._sorts.get(pair) is done else None)
+        await asyncio.shield(task)
+
+    async def _run_sort(self, pair: Tuple[str, str]):
+        doc_type, term = pair
+        postings = self.postings.get(doc_type, {}).get(term)
+        if postings is None or len(postings) < SEARCH_IMPACT_LIST_MIN:
+            return
+        average_length = self._average_length()
+        items = list(postings.items())
+        self._dirty.discard(pair)
+        entries = await asyncio.to_thread(self._sorted_impacts, items, average_length)
+        if pair in self._dirty:
+            # Written to while sorting; the snapshot is stale, so leave it to the next query
+            self._dirty.discard(pair)
+            return
+        self._impacts[pair] = (average_length, entries)
+
+    def prewarm_impact_lists(self, count: int = SEARCH_IMPACT_PREWARM_TERMS):
+        """Sort the lists of each type's most frequent terms; only for an index nothing else is reading yet"""
+        average_length = self._average_length()
+        for doc_type, by_term in self.postings.items():
+            for term, postings in heapq.nlargest(count, by_term.items(), key=lambda item: len(item[1])):
+                if len(postings) >= SEARCH_IMPACT_LIST_MIN:
+                    self._impacts[(doc_type, term)] = (average_length, self._sorted_impacts(list(postings.items()), average_length))
+
+    async def prepare(self, query: str, doc_type: Optional[str] = None, prefix: bool = True):
+        """Sort the impact lists ``search`` needs for this query in a worker thread instead of on the event loop"""
+        components = self._components(query, prefix)
+        average_length = self._average_length()
+        pairs = set()
+        for name in [doc_type] if doc_type else list(self.postings):
+            by_term = self.postings.get(name, {})
+            for term, _ in components:
+                postings = by_term.get(term)
+                if postings is not None and len(postings) >= SEARCH_IMPACT_LIST_MIN and not self._impact_current((name, term), average_length):
+                    pairs.add((name, term))
+        if pairs:
+            await asyncio.gather(*(self._sort_impact_list(pair) for pair in pairs))
+
+    def _top(self, doc_type: str, components: List[Tuple[str, float]], limit: int, average_length: float) -> List[Tuple[float, str]]:
+        postings_by_term = self.postings.get(doc_type)
+        if not postings_by_term:
+            return []
+        matched = [(term, postings_by_term[term], weight) for term, weight in components if term in postings_by_term]
+        if not matched:
+            return []
+        lengths = self.doc_lengths
+        scale = NORM_SCALE / average_length
+        short = [(postings, weight) for _, postings, weight in matched if len(postings) < SEARCH_IMPACT_LIST_MIN]
+        long = [(term, postings, weight) for term, postings, weight in matched if len(postings) >= SEARCH_IMPACT_LIST_MIN]
+
+        # Short postings are scored in full, a term at a time
+        scores: Dict[str, float] = {}
+        current, base = scores.get, NORM_BASE
+        for postings, weight in short:
+            for key, frequency in postings.items():
+                scores[key] = current(key, 0.0) + weight * frequency / (frequency + base + scale * lengths[key])
+        for _, postings, weight in long:
+            for key in scores:
+                frequency = postings.get(key)
+                if frequency is not None:
+                    scores[key] += weight * frequency / (frequency + base + scale * lengths[key])
+        top = [(score, key) for key, score in heapq.nlargest(limit, scores.items(), key=itemgetter(1))]
+        heapq.heapify(top)
+        if not long:
+            return top
+
+        # Documents outside every short list only score through the long ones
+        seen = scores
+        scored = [(postings, weight) for _, postings, weight in long]
+
+        def consider(key: str):
+            seen[key] = 0.0
+            norm = NORM_BASE + scale * lengths[key]
+            score = 0.0
+            for postings, weight in scored:
+                frequency = postings.get(key)
+                if frequency is not None:
+                    score += weight * frequency / (frequency + norm)
+            if len(top) < limit:
+                heapq.heappush(top, (score, key))
+            elif score > top[0][0]:
+                heapq.heapreplace(top, (score, key))
+
+        # Long postings are streamed in impact order
+        streams = []
+        for term, postings, weight in long:
+            sorted_with, entries = self._impact_list(doc_type, term, postings, average_length)
+            # Impacts sorted with a shorter average length understate today's by at most this factor
+            streams.append([weight * max(1.0, average_length / sorted_with), entries, 0])
+
+        step = max(limit, 16)
+        while streams:
+            for stream in streams:
+                _, entries, position = stream
+                for _, key in entries[position:position + step]:
+                    if key not in seen:
+                        consider(key)
+                stream[2] = position + step
+            streams = [stream for stream in streams if stream[2] < len(stream[1])]
+            # No unread document can score more than the sum of each list's next impact
+            bound = sum(scale_by * -entries[position][0] for scale_by, entries, position in streams)
+            if len(top) >= limit and top[0][0] >= bound:
+                break
+        return top
+
+    def _components(self, query: str, prefix: bool) -> List[Tuple[str, float]]:
+        """(term, BM25 weight) of every term the query matches, prefix expansions included"""
+        tokens = tokenize(query)
+        if not tokens or not self.doc_terms:
+            return []
+        count = len(self.doc_terms)
+        components = []
+        unique_tokens = list(dict.fromkeys(tokens))
+        for position, token in enumerate(unique_tokens):
+            # Only the word still being typed is matched as a prefix
+            expand = prefix and position == len(unique_tokens) - 1
+            for term, boost in self._expand(token, expand):
+                df = self.doc_frequency[term]
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                components.append((term, boost * idf * (K1 + 1)))
+        return components
+
+    def search(self, query: str, doc_type: Optional[str] = None, limit: int = 10, prefix: bool = True) -> List[Dict[str, Any]]:
+        components = self._components(query, prefix)
+        if not components:
+            return []
+        average_length = self._average_length()
+        doc_types = [doc_type] if doc_type else list(self.postings)
+        candidates = [hit for name in doc_types for hit in self._top(name, components, limit, average_length)]
+        top = heapq.nlargest(limit, candidates)
+        return [{**self.doc_meta[key], "score": round(score, 4)} for score, key in top]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "documents": len(self.doc_terms),
+            "terms": len(self.doc_frequency),
+            "impact_lists": len(self._impacts),
+            "synced_at": self.synced_at.isoformat() if self.synced_at else None,
+        }
+
+    # ---------------------
+    # Building & snapshots
+    # ---------------------
+    @staticmethod
+    async def _changed_documents(db, since: Optional[datetime]) -> AsyncIterator[List[Tuple[str, Dict[str, Any]]]]:
+        """Posts and projects written since ``since``, in batches of SEARCH_SYNC_BATCH_SIZE"""
+        sources = [
+            ("blog", db.blog_posts, {"updated_at": {"$gte": since}} if since else {}),
+            ("project", db.projects, {"created_at": {"$gte": since}} if since else {}),
+        ]
+        batch = []
+        for doc_type, collection, query in sources:
+            async for doc in collection.find(query, {"_id": 0}).batch_size(SEARCH_SYNC_BATCH_SIZE):
+                batch.append((doc_type, doc))
+                if len(batch) >= SEARCH_SYNC_BATCH_SIZE:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    async def sync(self, db, since: Optional[datetime] = None) -> int:
+        """Index posts and projects written since ``since`` (everything when None).
+
+        Tokenizing runs in a worker thread; the results are applied here on
+        the event loop a slice of whole documents at a time, yielding in
+        between, so searches keep being served and never see half a document.
+        """
+        started_at = datetime.utcnow()
+        sorted_before = set(self._impacts)
+        count = 0
+        async for batch in self._changed_documents(db, since):
+            prepared = await asyncio.to_thread(prepare_documents, batch)
+            for start in range(0, len(prepared), SEARCH_APPLY_SLICE):
+                self.apply_prepared(prepared[start:start + SEARCH_APPLY_SLICE])
+                await asyncio.sleep(0)
+            count += len(batch)
+        self.synced_at = started_at
+        # Re-sort, off the loop, the lists queries were using that the sync dropped
+        dropped = sorted_before - set(self._impacts)
+        if dropped:
+            await asyncio.gather(*(self._sort_impact_list(pair) for pair in dropped))
+        return count
+
+    async def build(self, db) -> int:
+        """Index everything from scratch; only for an index nothing else is reading yet"""
+        started_at = datetime.utcnow()
+        count = 0
+        with self._bulk():
+            async for batch in self._changed_documents(db, None):
+                await asyncio.to_thread(lambda: self.apply_prepared(prepare_documents(batch)))
+                count += len(batch)
+        self.synced_at = started_at
+        return count
+
+    def _replace(self, other: "SearchIndex"):
+        for name in ("postings", "doc_frequency", "doc_terms", "doc_lengths", "doc_meta", "vocabulary", "total_length", "synced_at", "_impacts"):
+            setattr(self, name, getattr(other, name))
+
+    async def load_or_build(self, db, snapshot_path: str = SEARCH_SNAPSHOT_PATH):
+        """Load the snapshot or build a fresh index off the event loop, then swap it in"""
+        started = time.perf_counter()
+        fresh = SearchIndex()
+        loaded = bool(snapshot_path) and await asyncio.to_thread(fresh.load, snapshot_path)
+        if not loaded:
+            count = await fresh.build(db)
+            logger.info(f"Search index built from {count} documents in {time.perf_counter() - started:.2f}s")
+            if snapshot_path:
+                await asyncio.to_thread(fresh.save, snapshot_path)
+        await asyncio.to_thread(fresh.prewarm_impact_lists)
+        self._replace(fresh)
+        # Writes indexed here while the fresh copy was prepared were lost in the swap
+        count = await self.sync(db, since=self.synced_at)
+        self.ready = True
+        logger.info(f"Search index ready, {count} documents caught up, {time.perf_counter() - started:.2f}s total")
+
+    def start(self, db, snapshot_path: str = SEARCH_SNAPSHOT_PATH):
+        """Load or build in the background so startup does not wait for it"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._warm(db, snapshot_path))
+
+    async def _warm(self, db, snapshot_path: str):
+        try:
+            await self.load_or_build(db, snapshot_path)
+        except Exception as e:
+            logger.error(f"Search index build failed: {str(e)}")
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def save(self, path: str):
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "synced_at": self.synced_at.isoformat() if self.synced_at else None,
+            "postings": self.postings,
+            "doc_lengths": self.doc_lengths,
+            "doc_meta": self.doc_meta,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        logger.info(f"Search index snapshot written to {path}")
+
+    def load(self, path: str) -> bool:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable search snapshot {path}: {str(e)}")
+            return False
+        if data.get("version") != SNAPSHOT_VERSION or not data.get("synced_at"):
+            return False
+
+        self.__init__()
+        doc_terms: Dict[str, List[str]] = defaultdict(list)
+        doc_frequency: Dict[str, int] = defaultdict(int)
+        for doc_type, by_term in data["postings"].items():
+            self.postings[doc_type] = by_term
+            for term, postings in by_term.items():
+                doc_frequency[term] += len(postings)
+                for key in postings:
+                    doc_terms[key].append(term)
+        self.doc_terms = {key: doc_terms.get(key, []) for key in data["doc_lengths"]}
+        self.doc_frequency = dict(doc_frequency)
+        self.doc_lengths = data["doc_lengths"]
+        self.doc_meta = data["doc_meta"]
+        self.vocabulary = sorted(self.doc_frequency)
+        self.total_length = sum(self.doc_lengths.values())
+        self.synced_at = datetime.fromisoformat(data["synced_at"])
+        return True
@@ -0,0 +1,37 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Type
+
+import orjson
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize plain dicts/lists straight to JSON bytes; datetimes are encoded natively"""
+    return orjson.dumps(content)
+
+
+@lru_cache(maxsize=None)
+def response_projection(model: Type[BaseModel]) -> Dict[str, int]:
+    """Mongo projection returning exactly the fields of ``model``"""
+    return {"_id": 0, **{name: 1 for name in model.model_fields}}
+
+
+@lru_cache(maxsize=None)
+def _static_defaults(model: Type[BaseModel]) -> Dict[str, Any]:
+    return {
+        name: field.default
+        for name, field in model.model_fields.items()
+        if field.default is not PydanticUndefined and field.default_factory is None
+    }
+
+
+def construct_documents(model: Type[BaseModel], docs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fill in defaults for trusted documents without validating them.
+
+    Documents are expected to come from the database through
+    ``response_projection(model)``, so they already have the right shape;
+    this is the dict equivalent of ``model.model_construct``.
+    """
+    defaults = _static_defaults(model)
+    return [{**defaults, **doc} for doc in docs]
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key onto one in-flight load.
+
+    The first caller for a key starts the load as a task; callers arriving
+    while it runs await the same task instead of issuing their own query.
+    Waiters are shielded from each other, so a client disconnecting does
+    not cancel the load for the rest. ``forget`` detaches in-flight loads
+    after a write: later callers start a fresh load, and the detached one
+    still answers its waiters but is not stored.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self._stats = {"loads": 0, "shared": 0, "forgotten": 0}
+
+    async def do(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        store: Optional[Callable[[Hashable, Any], None]] = None,
+    ) -> Any:
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, load, store))
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self._flights[key] = task
+            self._stats["loads"] += 1
+        else:
+            self._stats["shared"] += 1
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, load, store):
+        result = await load()
+        # A load detached by a write may have read the data from before it
+        if store is not None and self._flights.get(key) is asyncio.current_task():
+            store(key, result)
+        return result
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Waiters already saw it; this only keeps asyncio from warning when none are left
+            logger.debug(f"Shared load for {key} failed: {str(task.exception())}")
+
+    def forget(self, match: Callable[[Hashable], bool]) -> int:
+        forgotten = [key for key in self._flights if match(key)]
+        for key in forgotten:
+            del self._flights[key]
+        self._stats["forgotten"] += len(forgotten)
+        return len(forgotten)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "in_flight": len(self._flights)}
@@ -0,0 +1,241 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from services.compression import Compressor, choose_encoding
+
+logger = logging.getLogger(__name__)
+
+# Root the renderer writes to and the API serves from; empty disables serving
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "")
+SNAPSHOT_RELOAD_SECONDS = float(os.getenv("SNAPSHOT_RELOAD_SECONDS", "10"))
+SNAPSHOT_MIN_COMPRESS_BYTES = 256
+SNAPSHOT_KEEP_GENERATIONS = 2
+# Snapshot files kept in memory by each worker, least recently served dropped first
+SNAPSHOT_CACHE_FILES = int(os.getenv("SNAPSHOT_CACHE_FILES", "512"))
+SNAPSHOT_CACHE_BYTES = int(os.getenv("SNAPSHOT_CACHE_BYTES", str(16 * 1024 * 1024)))
+
+CURRENT_LINK = "current"
+MANIFEST = "manifest.json"
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def snapshot_name(namespace: str, **params: Any) -> str:
+    """Relative file name for one response; mirrors the request's query parameters"""
+    parts = []
+    for key, value in sorted(params.items()):
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = str(value).lower()
+        parts.append(f"{key}={quote(str(value), safe='')}")
+    return f"{namespace}/{'&'.join(parts) or 'index'}.json"
+
+
+# ---------------------
+# Writing
+# ---------------------
+class SnapshotWriter:
+    """Writes one generation of snapshots and publishes it atomically.
+
+    Files go to ``<root>/gen-<timestamp>/``; once complete, the
+    ``current`` symlink is swapped to point at it, so readers never see a
+    half-written generation.
+    """
+
+    def __init__(self, root: str, gzip_level: int = 9, brotli_quality: int = 11):
+        self.root = Path(root)
+        self.generation = f"gen-{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}"
+        self.directory = self.root / self.generation
+        self.compressor = Compressor(
+            min_bytes=SNAPSHOT_MIN_COMPRESS_BYTES, gzip_level=gzip_level, brotli_quality=brotli_quality,
+            preference=tuple(ENCODING_SUFFIXES),
+        )
+        self.files = 0
+        self.bytes = {"identity": 0, "gzip": 0, "br": 0}
+        if "br" not in self.compressor.available:
+            logger.warning("brotli is not installed; writing gzip variants only")
+
+    def write(self, name: str, body: bytes):
+        path = self.directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        self.files += 1
+        self.bytes["identity"] += len(body)
+        if len(body) < self.compressor.min_bytes:
+            return
+        for encoding in self.compressor.available:
+            compressed = self.compressor.compress(body, encoding)
+            Path(f"{path}{ENCODING_SUFFIXES[encoding]}").write_bytes(compressed)
+            self.bytes[encoding] += len(compressed)
+
+    def write_file(self, name: str, content: str):
+        (self.directory / name).write_text(content)
+
+    def publish(self, manifest: Dict[str, Any]):
+        manifest = {**manifest, "generation": self.generation, "files": self.files, "bytes": self.bytes}
+        (self.directory / MANIFEST).write_text(json.dumps(manifest, indent=2))
+        link = self.root / CURRENT_LINK
+        tmp_link = self.root / f".{CURRENT_LINK}.tmp"
+        if tmp_link.is_symlink():
+            tmp_link.unlink()
+        tmp_link.symlink_to(self.generation)
+        os.replace(tmp_link, link)
+        self._prune()
+
+    def _prune(self):
+        generations = sorted(p for p in self.root.glob("gen-*") if p.is_dir())
+        for old in generations[:-SNAPSHOT_KEEP_GENERATIONS]:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def render_sitemap(site_url: str, pages, posts) -> str:
+    """Sitemap with the static pages plus one URL per published post"""
+    site_url = site_url.rstrip("/")
+    urls = []
+    for page, lastmod in pages:
+        urls.append((f"{site_url}/{page}" if page else f"{site_url}/", lastmod))
+    for post in posts:
+        urls.append((f"{site_url}/blog/{quote(post['id'])}", post.get("updated_at") or post.get("date")))
+    entries = []
+    for loc, lastmod in urls:
+        entry = f"  <url>\n    <loc>{escape(loc)}</loc>\n"
+        if lastmod is not None:
+            entry += f"    <lastmod>{lastmod.strftime('%Y-%m-%dT%H:%M:%S+00:00')}</lastmod>\n"
+        entries.append(entry + "  </url>\n")
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        + "".join(entries)
+        + "</urlset>\n"
+    )
+
+
+# ---------------------
+# Serving
+# ---------------------
+class SnapshotStore:
+    """Serves the current snapshot generation while it matches the live collection versions.
+
+    Every collection's version token is recorded in the manifest at render
+    time. A snapshot is only used while the token still matches, so any
+    write through the API (or elsewhere) makes reads fall back to MongoDB
+    until the next render. Files are read in a worker thread, then kept in
+    a bounded LRU so the hot ones are served from memory.
+    """
+
+    def __init__(
+        self,
+        root: str = SNAPSHOT_DIR,
+        reload_interval: float = SNAPSHOT_RELOAD_SECONDS,
+        max_files: int = SNAPSHOT_CACHE_FILES,
+        max_bytes: int = SNAPSHOT_CACHE_BYTES,
+    ):
+        self.root = Path(root) if root else None
+        self.reload_interval = reload_interval
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.generation: Optional[str] = None
+        self.manifest: Dict[str, Any] = {}
+        # name -> encoded variants, or None for a file the generation doesn't have
+        self._files: "OrderedDict[str, Optional[Dict[str, bytes]]]" = OrderedDict()
+        self._bytes = 0
+        self._checked_at = 0.0
+        self._stats = {"hits": 0, "stale": 0, "misses": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    async def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        generation, manifest = await asyncio.to_thread(self._read_current, self.generation)
+        if generation == self.generation:
+            return
+        self.generation, self.manifest = generation, manifest
+        self._files.clear()
+        self._bytes = 0
+        if generation is not None:
+            logger.info(f"Serving snapshot generation {generation}")
+
+    def _read_current(self, known: Optional[str]) -> Tuple[Optional[str], Dict[str, Any]]:
+        try:
+            generation = os.readlink(self.root / CURRENT_LINK)
+        except OSError:
+            return None, {}
+        if generation == known:
+            return generation, self.manifest
+        try:
+            return generation, json.loads((self.root / generation / MANIFEST).read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring snapshot generation {generation}: {str(e)}")
+            return None, {}
+
+    @staticmethod
+    def _read_files(path: Path) -> Optional[Dict[str, bytes]]:
+        if not path.is_file():
+            return None
+        variants = {"identity": path.read_bytes()}
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            compressed = Path(f"{path}{suffix}")
+            if compressed.is_file():
+                variants[encoding] = compressed.read_bytes()
+        return variants
+
+    async def _read(self, name: str) -> Optional[Dict[str, bytes]]:
+        if name in self._files:
+            self._files.move_to_end(name)
+            return self._files[name]
+        generation = self.generation
+        variants = await asyncio.to_thread(self._read_files, self.root / generation / name)
+        if generation != self.generation or name in self._files:
+            # A reload or a concurrent read got there first; don't cache over it
+            return variants
+        self._files[name] = variants
+        self._bytes += self._size(variants)
+        while len(self._files) > self.max_files or self._bytes > self.max_bytes:
+            _, evicted = self._files.popitem(last=False)
+            self._bytes -= self._size(evicted)
+        return variants
+
+    @staticmethod
+    def _size(variants: Optional[Dict[str, bytes]]) -> int:
+        return sum(len(data) for data in variants.values()) if variants else 0
+
+    async def lookup(self, collection: str, token: str, name: str) -> Optional[Dict[str, bytes]]:
+        """Encoded variants of a snapshot, or None when missing or stale"""
+        await self._maybe_reload()
+        if self.generation is None:
+            return None
+        if self.manifest.get("versions", {}).get(collection) != token:
+            self._stats["stale"] += 1
+            return None
+        variants = await self._read(name)
+        self._stats["hits" if variants else "misses"] += 1
+        return variants
+
+    def select(self, variants: Dict[str, bytes], accept_encoding: str) -> Tuple[str, bytes]:
+        encoding = choose_encoding(accept_encoding, variants)
+        return encoding, variants[encoding]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "generation": self.generation,
+            "rendered_at": self.manifest.get("rendered_at"),
+            "cached_files": len(self._files),
+            "cached_bytes": self._bytes,
+            **self._stats,
+        }
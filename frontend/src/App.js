@@ -1,4 +1,4 @@
-import React, { Suspense } from "react";
+import React, { Suspense, useEffect, useState } from "react";
 import "./App.css";
 import { Toaster } from "./components/ui/toaster";
 import ThreeDBackground from "./components/ThreeDBackground";
@@ -13,6 +13,11 @@ import Testimonials from "./components/Testimonials";
 import Contact from "./components/Contact";
 import Footer from "./components/Footer";
 import SEO from "./components/SEO"; // ✅ Import SEO component
+import { homeService } from "./services/api";
+
+// Sized to what the sections show: every project (featured ones are picked
+// client-side), the same 20 posts the blog lists, and every testimonial
+const HOME_LIMITS = { projects_limit: 100, featured_limit: 0, testimonials_limit: 100, posts_limit: 20 };
 
 // Loading component for 3D background
 const LoadingFallback = () => (
@@ -20,6 +25,20 @@ const LoadingFallback = () => (
 );
 
 function App() {
+  // undefined while /api/home is in flight, null if it failed (sections then load on their own)
+  const [home, setHome] = useState(undefined);
+
+  useEffect(() => {
+    homeService.getHome(HOME_LIMITS)
+      .then(setHome)
+      .catch((err) => {
+        console.error('Failed to load homepage:', err);
+        setHome(null);
+      });
+  }, []);
+
+  const section = (name) => (home === undefined ? undefined : home && home[name]);
+
   return (
     <div className="App min-h-screen text-white relative">
        {/* ✅ SEO for Home page */}
@@ -52,10 +71,10 @@ function App() {
           <Hero />
           <About />
           <Skills />
-          <Projects />
+          <Projects homeProjects={section("projects")} />
           <Education />
-          <Blog />
-          <Testimonials />
+          <Blog homePosts={section("posts")} />
+          <Testimonials homeTestimonials={section("testimonials")} />
           <Contact />
         </main>
         <Footer />
@@ -7,20 +7,22 @@ import { blogService } from '../services/api';
 import { blogPosts as mockBlogPosts } from '../data/mock';
 import SEO from './SEO';
 
-const Blog = () => {
+const Blog = ({ homePosts }) => {
   const [blogPosts, setBlogPosts] = useState([]);
   const [selectedPost, setSelectedPost] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
   useEffect(() => {
+    // Posts arrive with the homepage request; only fetch them here if that failed
+    if (homePosts === undefined) return;
     loadBlogPosts();
-  }, []);
+  }, [homePosts]);
 
   const loadBlogPosts = async () => {
     setLoading(true);
     try {
-      const response = await blogService.getBlogPosts({ per_page: 20 });
+      const response = homePosts ? { posts: homePosts } : await blogService.getBlogPosts({ per_page: 20 });
 
       if (response.posts && response.posts.length > 0) {
         setBlogPosts(response.posts);
@@ -37,6 +39,18 @@ const Blog = () => {
     }
   };
 
+  // Listings only carry summaries, so fetch the full article when one is opened
+  const openPost = async (post) => {
+    setSelectedPost(post);
+    if (post.content) return;
+    try {
+      const fullPost = await blogService.getBlogPost(post.id);
+      setSelectedPost((current) => (current && current.id === post.id ? fullPost : current));
+    } catch (err) {
+      console.error('Failed to load blog post:', err);
+    }
+  };
+
   const formatDate = (dateString) => {
     const date = new Date(dateString);
     return date.toLocaleDateString('en-US', { year: 'numeric', month: 'long', day: 'numeric' });
@@ -129,7 +143,7 @@ const Blog = () => {
                       </div>
                       <h3 className="text-2xl font-bold text-white mb-4 group-hover:text-blue-400 transition-colors duration-300">{blogPosts[0].title}</h3>
                       <p className="text-gray-300 mb-6 leading-relaxed">{blogPosts[0].excerpt}</p>
-                      <Button onClick={() => setSelectedPost(blogPosts[0])} className="w-fit bg-blue-600 hover:bg-blue-700 transform hover:scale-105 transition-all duration-300">
+                      <Button onClick={() => openPost(blogPosts[0])} className="w-fit bg-blue-600 hover:bg-blue-700 transform hover:scale-105 transition-all duration-300">
                         Read Full Article <ArrowRight className="w-4 h-4 ml-2" />
                       </Button>
                     </CardContent>
@@ -158,7 +172,7 @@ const Blog = () => {
                           <div className="flex items-center"><Calendar className="w-3 h-3 mr-1" />{formatDate(post.date)}</div>
                           <div className="flex items-center"><Clock className="w-3 h-3 mr-1" />{post.read_time || post.readTime}</div>
                         </div>
-                        <Button variant="outline" size="sm" onClick={() => setSelectedPost(post)} className="w-full border-gray-600 text-gray-300 hover:border-blue-500 hover:text-blue-400 transition-all duration-300">
+                        <Button variant="outline" size="sm" onClick={() => openPost(post)} className="w-full border-gray-600 text-gray-300 hover:border-blue-500 hover:text-blue-400 transition-all duration-300">
                           Read More <ArrowRight className="w-4 h-4 ml-2" />
                         </Button>
                       </CardContent>
@@ -7,19 +7,23 @@ import { projectService } from '../services/api';
 import { projects as mockProjects, projectCategories } from '../data/mock';
 import { Helmet } from 'react-helmet-async';
 
-const Projects = () => {
+const Projects = ({ homeProjects }) => {
   const [projects, setProjects] = useState([]);
   const [activeCategory, setActiveCategory] = useState('All');
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
+    // The unfiltered list arrives with the homepage request
+    if (activeCategory === 'All' && homeProjects === undefined) return;
     loadProjects();
-  }, [activeCategory]);
+  }, [activeCategory, homeProjects]);
 
   const loadProjects = async () => {
     setLoading(true);
     try {
-      const projectData = await projectService.getProjects({ category: activeCategory });
+      const projectData = activeCategory === 'All' && homeProjects
+        ? homeProjects
+        : await projectService.getProjects({ category: activeCategory });
 
       if (projectData && projectData.length > 0) {
         setProjects(projectData);
@@ -2,11 +2,14 @@ import React, { useState } from 'react';
 import { Star, Quote, ChevronLeft, ChevronRight } from 'lucide-react';
 import { Card, CardContent } from './ui/card';
 import { Button } from './ui/button';
-import { testimonials } from '../data/mock';
+import { testimonials as mockTestimonials } from '../data/mock';
 import { Helmet } from 'react-helmet-async';
 
-const Testimonials = () => {
+const Testimonials = ({ homeTestimonials }) => {
   const [currentTestimonial, setCurrentTestimonial] = useState(0);
+  const testimonials = homeTestimonials && homeTestimonials.length > 0 ? homeTestimonials : mockTestimonials;
+  // The live list may be shorter than the sample one shown while it loads
+  const current = testimonials[currentTestimonial % testimonials.length];
 
   const nextTestimonial = () => {
     setCurrentTestimonial((prev) => (prev + 1) % testimonials.length);
@@ -96,28 +99,28 @@ const Testimonials = () => {
               </div>
               
               <div className="flex justify-center mb-6">
-                {renderStars(5)}
+                {renderStars(current.rating)}
               </div>
               
               <blockquote className="text-xl md:text-2xl text-gray-300 mb-8 leading-relaxed italic">
-                "{testimonials[currentTestimonial].content}"
+                "{current.content}"
               </blockquote>
               
               <div className="flex flex-col md:flex-row items-center justify-center gap-4">
                 <img 
-                  src={testimonials[currentTestimonial].avatar} 
-                  alt={testimonials[currentTestimonial].name}
+                  src={current.avatar} 
+                  alt={current.name}
                   className="w-16 h-16 rounded-full border-4 border-blue-500/30"
                 />
                 <div className="text-center md:text-left">
                   <div className="text-lg font-semibold text-white">
-                    {testimonials[currentTestimonial].name}
+                    {current.name}
                   </div>
                   <div className="text-blue-400 font-medium">
-                    {testimonials[currentTestimonial].position}
+                    {current.position}
                   </div>
                   <div className="text-gray-400 text-sm">
-                    {testimonials[currentTestimonial].company}
+                    {current.company}
                   </div>
                 </div>
               </div>
@@ -131,7 +134,7 @@ const Testimonials = () => {
                     <button
                       key={index}
                       onClick={() => setCurrentTestimonial(index)}
-                      className={`w-3 h-3 rounded-full transition-all duration-300 ${index === currentTestimonial ? 'bg-blue-500' : 'bg-gray-600 hover:bg-gray-500'}`}
+                      className={`w-3 h-3 rounded-full transition-all duration-300 ${index === currentTestimonial % testimonials.length ? 'bg-blue-500' : 'bg-gray-600 hover:bg-gray-500'}`}
                     />
                   ))}
                 </div>
@@ -167,7 +170,7 @@ const Testimonials = () => {
                   </div>
                 </div>
                 <div className="flex mb-3">
-                  {renderStars(5)}
+                  {renderStars(testimonial.rating)}
                 </div>
                 <blockquote className="text-gray-300 text-sm leading-relaxed italic">
                   "{testimonial.content}"
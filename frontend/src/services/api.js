@@ -92,6 +92,15 @@ export const blogService = {
     }
   },
 
+  async getCategories() {
+    try {
+      const response = await apiClient.get('/blog/categories');
+      return response.data;
+    } catch (error) {
+      throw new Error(error.response?.data?.detail || 'Failed to fetch blog categories');
+    }
+  },
+
   async createBlogPost(postData) {
     try {
       const response = await apiClient.post('/blog', postData);
@@ -99,6 +108,15 @@ export const blogService = {
     } catch (error) {
       throw new Error(error.response?.data?.detail || 'Failed to create blog post');
     }
+  },
+
+  async updateBlogPost(postId, changes) {
+    try {
+      const response = await apiClient.patch(`/blog/${postId}`, changes);
+      return response.data;
+    } catch (error) {
+      throw new Error(error.response?.data?.detail || 'Failed to update blog post');
+    }
   }
 };
 
@@ -146,6 +164,15 @@ export const projectService = {
     }
   },
 
+  async getCategories() {
+    try {
+      const response = await apiClient.get('/projects/categories');
+      return response.data;
+    } catch (error) {
+      throw new Error(error.response?.data?.detail || 'Failed to fetch project categories');
+    }
+  },
+
   async createProject(projectData) {
     try {
       const response = await apiClient.post('/projects', projectData);
@@ -156,6 +183,26 @@ export const projectService = {
   }
 };
 
+// Homepage: projects, featured projects, testimonials and latest posts in one request
+export const homeService = {
+  async getHome(limits = {}) {
+    try {
+      const queryParams = new URLSearchParams();
+      Object.entries(limits).forEach(([name, value]) => {
+        if (value !== undefined) {
+          queryParams.append(name, value.toString());
+        }
+      });
+
+      const url = queryParams.toString() ? `/home?${queryParams}` : '/home';
+      const response = await apiClient.get(url);
+      return response.data;
+    } catch (error) {
+      throw new Error(error.response?.data?.detail || 'Failed to fetch homepage');
+    }
+  }
+};
+
 // Health check
 export const healthService = {
   async checkHealth() {
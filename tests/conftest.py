@@ -0,0 +1,41 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Keep the app self-contained: no rate limits, no snapshots, no peers
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("SNAPSHOT_DIR", "")
+os.environ.setdefault("SEARCH_SNAPSHOT_PATH", "")
+os.environ.setdefault("INVALIDATION_BACKEND", "none")
+
+import mongomock_motor  # noqa: E402
+import motor.motor_asyncio  # noqa: E402
+
+# Every Database.connect() gets an empty in-memory MongoDB
+motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def server():
+    """A freshly imported server module, so caches and counters start empty"""
+    import server as module
+    return importlib.reload(module)
+
+
+@pytest.fixture
+def client(server):
+    from fastapi.testclient import TestClient
+
+    with TestClient(server.app) as test_client:
+        yield test_client
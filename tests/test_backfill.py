@@ -0,0 +1,27 @@
+from datetime import datetime
+
+import pytest
+
+from models.blog import derive_content_fields
+from scripts.backfill_blog_derivations import backfill
+
+
+@pytest.mark.anyio
+async def test_backfill_moves_updated_at_with_the_derived_fields(server):
+    server.db.connect()
+    stamp = datetime(2024, 1, 1)
+    current = "Already derived content " * 5
+    await server.db.blog_posts.insert_many([
+        {"id": "old", "content": "Content stored before derivations " * 5, "published": True, "updated_at": stamp},
+        {"id": "current", "content": current, **derive_content_fields(current), "published": True, "updated_at": stamp},
+    ])
+    before = await server.collection_versions.refresh("blog_posts")
+
+    result = await backfill(server.db, batch_size=10, dry_run=False)
+
+    assert result == {"scanned": 2, "updated": 1}
+    old = await server.db.blog_posts.find_one({"id": "old"})
+    assert old["word_count"] == 20 and old["updated_at"] > stamp
+    assert (await server.db.blog_posts.find_one({"id": "current"}))["updated_at"] == stamp
+    # Running workers pick the change up through the version token
+    assert (await server.collection_versions.refresh("blog_posts"))["token"] != before["token"]
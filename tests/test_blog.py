@@ -0,0 +1,14 @@
+from models.blog import BlogPostDetail
+
+
+def test_post_detail_keeps_derived_fields_internal(client):
+    created = client.post("/api/blog", json={
+        "title": "Derived fields", "excerpt": "An excerpt long enough", "content": "Some words " * 10,
+        "category": "Tech", "published": True,
+    }).json()
+    assert created["word_count"] == 20
+
+    post = client.get(f"/api/blog/{created['id']}").json()
+    assert set(post) == set(BlogPostDetail.model_fields)
+    assert not {"word_count", "text_excerpt", "content_hash"} & set(post)
+    assert post["content"] == "Some words " * 10
@@ -0,0 +1,99 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from services.bulk import bulk_insert
+
+
+def entry(name, **fields):
+    return {"name": name, "position": "Engineer", "company": "Analytical", "content": "A fine collaborator", **fields}
+
+
+def ndjson(*lines):
+    return "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines).encode()
+
+
+def test_array_and_ndjson_bodies_insert_the_same_items(client):
+    items = [entry("Ada Lovelace"), entry("Grace Hopper")]
+
+    response = client.post("/api/testimonials/bulk", json=items)
+    assert response.json() == {"received": 2, "inserted": 2, "failed": 0, "errors": []}
+
+    response = client.post(
+        "/api/testimonials/bulk", content=ndjson(*items) + b"\n\n", headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.json() == {"received": 2, "inserted": 2, "failed": 0, "errors": []}
+
+
+def test_bad_lines_are_reported_by_position(client):
+    body = ndjson(
+        entry("Ada Lovelace"),
+        "{not json",
+        entry("G"),
+        "[1, 2]",
+        entry("Grace Hopper"),
+    )
+    response = client.post(
+        "/api/testimonials/bulk?chunk_size=2", content=body, headers={"Content-Type": "application/x-ndjson"},
+    )
+    result = response.json()
+    assert (result["received"], result["inserted"], result["failed"]) == (5, 2, 3)
+    assert [error["index"] for error in result["errors"]] == [1, 2, 3]
+    assert result["errors"][1]["error"].startswith("name:")
+    assert result["errors"][2]["error"] == "Item must be a JSON object"
+
+
+def test_a_body_that_is_not_an_array_is_refused(client):
+    response = client.post("/api/testimonials/bulk", json={"name": "Ada Lovelace"})
+    assert response.status_code == 400
+
+
+class Collection:
+    """Refuses the documents whose ``reject`` flag is set, the way an unordered insert_many reports them"""
+
+    name = "items"
+
+    def __init__(self):
+        self.docs = []
+
+    async def insert_many(self, docs, ordered=True):
+        write_errors = [{"index": i, "errmsg": f"duplicate {doc['n']}"} for i, doc in enumerate(docs) if doc["reject"]]
+        self.docs.extend(doc for doc in docs if not doc["reject"])
+        if write_errors:
+            raise BulkWriteError({"writeErrors": write_errors, "nInserted": len(docs) - len(write_errors)})
+        return SimpleNamespace(inserted_ids=[doc["n"] for doc in docs])
+
+
+async def items(raw):
+    for item in raw:
+        yield item
+
+
+def build(item):
+    if item["n"] < 0:
+        raise ValueError("negative")
+    return item
+
+
+@pytest.mark.anyio
+async def test_write_errors_map_back_to_request_positions_across_chunks():
+    collection = Collection()
+    raw = [
+        {"n": 0, "reject": False},
+        {"n": 1, "reject": True},
+        {"n": -2, "reject": False},  # Dropped before the insert, so chunk offsets and positions diverge
+        {"n": 3, "reject": True},
+        {"n": 4, "reject": False},
+        {"n": 5, "reject": True},
+        {"n": 6, "reject": False},
+    ]
+    result = await bulk_insert(collection, items(raw), build, chunk_size=3)
+
+    assert result["received"] == 7
+    assert result["inserted"] == 3
+    assert [(error["index"], error["error"]) for error in result["errors"]] == [
+        (1, "duplicate 1"), (2, "negative"), (3, "duplicate 3"), (5, "duplicate 5"),
+    ]
+    assert [doc["n"] for doc in collection.docs] == [0, 4, 6]
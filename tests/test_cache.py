@@ -0,0 +1,118 @@
+import pytest
+
+from services import cache
+from services.cache import ResponseCache, TTLCache, cache_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+
+def blog(page, category=None):
+    return cache_key("blog", category=category, page=page)
+
+
+def test_keys_ignore_parameter_order():
+    assert cache_key("blog", page=1, category="Tech") == cache_key("blog", category="Tech", page=1)
+
+
+def test_least_recently_used_entries_are_evicted_first(clock):
+    responses = ResponseCache(ttl=60, max_entries=3, enabled=True)
+    for page in (1, 2, 3):
+        responses.set(blog(page), b"page")
+    # Reading page 1 makes page 2 the oldest
+    assert responses.get(blog(1)) == b"page"
+    responses.set(blog(4), b"page")
+
+    assert responses.get(blog(2)) is None
+    assert [responses.get(blog(page)) for page in (1, 3, 4)] == [b"page"] * 3
+    assert responses.stats()["evictions"] == 1
+
+
+def test_byte_budget_counts_compressed_variants(clock):
+    responses = ResponseCache(ttl=60, max_bytes=100, enabled=True)
+    responses.set(blog(1), b"x" * 40)
+    responses.set(blog(2), b"x" * 40)
+    assert responses.stats()["bytes"] == 80
+
+    # The variant pushes the total over budget, so the oldest body goes, variants and all
+    responses.set_variant(blog(2), "gzip", b"z" * 30)
+    assert responses.get(blog(1)) is None
+    assert responses.get_variant(blog(2), "gzip") == b"z" * 30
+    assert responses.stats()["bytes"] == 70
+
+    # Replacing a body drops its variants from the budget too
+    responses.set(blog(2), b"y" * 10)
+    assert responses.get_variant(blog(2), "gzip") is None
+    assert responses.stats()["bytes"] == 10
+
+
+def test_bodies_over_the_budget_are_not_cached(clock):
+    responses = ResponseCache(ttl=60, max_bytes=100, enabled=True)
+    responses.set(blog(1), b"x" * 60)
+    responses.set(blog(2), b"x" * 101)
+
+    assert responses.get(blog(2)) is None
+    # Rejected outright rather than evicting everything else to make room
+    assert responses.get(blog(1)) == b"x" * 60
+    assert responses.stats()["evictions"] == 0
+
+
+def test_entries_expire_after_the_ttl(clock):
+    responses = ResponseCache(ttl=60, enabled=True)
+    responses.set(blog(1), b"page")
+
+    clock.now += 59
+    assert responses.get(blog(1)) == b"page"
+    clock.now += 1
+    assert responses.get(blog(1)) is None
+    stats = responses.stats()
+    assert (stats["expirations"], stats["entries"], stats["bytes"]) == (1, 0, 0)
+
+
+def test_invalidation_is_limited_to_matching_keys(clock):
+    responses = ResponseCache(ttl=60, enabled=True)
+    for category in (None, "Tech", "Life"):
+        responses.set(blog(1, category), b"page")
+        responses.set_variant(blog(1, category), "br", b"compressed")
+    responses.set(cache_key("projects"), b"projects")
+
+    removed = responses.invalidate("blog", lambda params: params["category"] in (None, "Tech"))
+    assert removed == 2
+    assert responses.get(blog(1, "Life")) == b"page"
+    assert responses.get_variant(blog(1, "Life"), "br") == b"compressed"
+    assert responses.get(blog(1, "Tech")) is None
+    assert responses.get_variant(blog(1, "Tech"), "br") is None
+
+    # A whole namespace, leaving the others alone
+    assert responses.invalidate("blog") == 1
+    assert responses.get(cache_key("projects")) == b"projects"
+    assert responses.stats()["bytes"] == len(b"projects")
+
+
+def test_variants_for_evicted_bodies_are_dropped(clock):
+    responses = ResponseCache(ttl=60, enabled=True)
+    responses.set(blog(1), b"page")
+    responses.invalidate("blog")
+    # Compression finished after the body was invalidated
+    responses.set_variant(blog(1), "gzip", b"compressed")
+    assert responses.stats()["bytes"] == 0
+
+
+def test_ttl_cache_expires_values(clock):
+    versions: TTLCache[str] = TTLCache(ttl=10)
+    versions.set("post", "v1")
+    assert versions.get("post") == "v1"
+    clock.now += 10
+    assert versions.get("post") is None
@@ -0,0 +1,154 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from services.compression import CompressionMiddleware, Compressor, choose_encoding
+
+LARGE = "compressible " * 100
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", "identity"),
+    ("gzip;q=0.5, identity;q=0", "gzip"),
+    ("identity;q=0", "identity"),
+    ("*", "br"),
+    ("br;q=bogus, gzip", "gzip"),
+    ("", "identity"),
+])
+def test_choose_encoding_honours_q_values(accept_encoding, expected):
+    assert choose_encoding(accept_encoding, ["br", "gzip"]) == expected
+
+
+def compressed_app(**compressor):
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE, headers={"ETag": '"v1"'})
+
+    @app.get("/weak")
+    async def weak():
+        return PlainTextResponse(LARGE, headers={"ETag": 'W/"v1"'})
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny", headers={"ETag": '"v1"'})
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" * 500, media_type="image/png")
+
+    @app.get("/encoded")
+    async def encoded():
+        return Response(gzip.compress(LARGE.encode()), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(50):
+                yield LARGE.encode()
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    app.add_middleware(CompressionMiddleware, compressor=Compressor(**compressor), enabled=True)
+    return TestClient(app)
+
+
+def test_large_bodies_are_compressed_with_the_preferred_coding():
+    client = compressed_app(preference=("gzip",))
+    response = client.get("/large", headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(LARGE)
+    assert response.text == LARGE
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in response.headers
+    assert response.text == LARGE
+
+
+def test_small_and_incompressible_bodies_pass_through():
+    client = compressed_app(min_bytes=512)
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+    # The representation still depends on Accept-Encoding for larger bodies
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+
+
+def test_already_encoded_responses_are_not_compressed_twice():
+    client = compressed_app()
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == LARGE
+
+
+def test_streaming_responses_are_compressed_incrementally():
+    client = compressed_app(preference=("gzip",))
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == LARGE * 50
+
+
+@pytest.mark.anyio
+async def test_streamed_chunks_are_sent_as_they_are_produced():
+    sent, before_end = [], []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        for _ in range(3):
+            await send({"type": "http.response.body", "body": LARGE.encode(), "more_body": True})
+        before_end.extend(message["type"] for message in sent)
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = CompressionMiddleware(app, Compressor(preference=("gzip",)), enabled=True)
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+    await middleware(scope, None, send)
+
+    # The headers went out without waiting for the whole body
+    assert before_end[0] == "http.response.start"
+    assert b"content-length" not in dict(sent[0]["headers"])
+    bodies = [message for message in sent if message["type"] == "http.response.body"]
+    assert bodies[-1]["more_body"] is False
+    assert gzip.decompress(b"".join(message["body"] for message in bodies)) == LARGE.encode() * 3
+
+
+def test_strong_etags_are_suffixed_per_coding():
+    client = compressed_app(preference=("br", "gzip"))
+    assert client.get("/large", headers={"Accept-Encoding": "gzip"}).headers["etag"] == '"v1-gzip"'
+    assert client.get("/large", headers={"Accept-Encoding": "br"}).headers["etag"] == '"v1-br"'
+    assert client.get("/large", headers={"Accept-Encoding": "identity"}).headers["etag"] == '"v1"'
+    # Weak validators already allow byte differences
+    assert client.get("/weak", headers={"Accept-Encoding": "gzip"}).headers["etag"] == 'W/"v1"'
+
+
+def test_suffixed_etag_revalidates_against_the_api(client):
+    response = client.post("/api/blog", json={
+        "title": "A long post", "excerpt": "An excerpt long enough", "content": LARGE,
+        "category": "Tech", "published": True,
+    })
+    url = f"/api/blog/{response.json()['id']}"
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag.endswith('-gzip"')
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    client.patch(url, json={"title": "A longer post"})
+    assert client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}).status_code == 200
@@ -0,0 +1,128 @@
+from datetime import datetime
+
+import pytest
+
+from services.conditional import GroupedVersions
+
+
+def test_approving_a_testimonial_changes_the_etag(server, client):
+    submitted = client.post("/api/testimonials", json={
+        "name": "Grace",
+        "position": "Engineer",
+        "company": "Navy",
+        "content": "Wonderful to work with, would hire again.",
+    })
+    assert submitted.status_code == 200
+    first = client.get("/api/testimonials")
+    assert first.json()["testimonials"] == []
+    etag = first.headers["etag"]
+    assert client.get("/api/testimonials", headers={"If-None-Match": etag}).status_code == 304
+
+    # Approved by hand in the database: neither the count nor created_at moves
+    client.portal.call(server.db.testimonials.update_many, {}, {"$set": {"approved": True}})
+    server.collection_versions.refresh_interval = 0
+
+    second = client.get("/api/testimonials", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert len(second.json()["testimonials"]) == 1
+
+
+def test_featuring_a_project_changes_the_etag(server, client):
+    created = client.post("/api/projects", json={
+        "title": "Compiler",
+        "description": "A compiler for a small language",
+        "technologies": ["Python"],
+        "category": "Tools",
+    })
+    assert created.status_code == 200
+    first = client.get("/api/projects", params={"featured": "true"})
+    assert first.json()["projects"] == []
+
+    client.portal.call(server.db.projects.update_many, {}, {"$set": {"featured": True}})
+    server.collection_versions.refresh_interval = 0
+
+    second = client.get("/api/projects", params={"featured": "true"}, headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    assert len(second.json()["projects"]) == 1
+
+    # No timestamp moved either, yet clients revalidating by date alone still get the change
+    by_date = client.get("/api/projects", params={"featured": "true"}, headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert by_date.status_code == 200
+    assert second.headers["last-modified"] != first.headers["last-modified"]
+
+
+def create_post(client, title, category, published=True):
+    response = client.post("/api/blog", json={
+        "title": title, "excerpt": "An excerpt long enough", "content": "Some words " * 10,
+        "category": category, "published": published,
+    })
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+# Each edit, and the reads whose validators it should change; every other read keeps its ETag.
+# Listing tokens follow their category's newest updated_at, so any edit to a listed post moves them.
+PATCH_MATRIX = [
+    ("tech", {"content": "Other words " * 10}, {"all", "tech", "home"}),
+    ("tech", {"title": "A better title"}, {"all", "tech", "home"}),
+    ("draft", {"title": "Still a draft"}, set()),
+    ("tech", {"category": "Life"}, {"all", "tech", "life", "home", "categories"}),
+    ("draft", {"published": True}, {"all", "tech", "home", "categories"}),
+    ("life", {"published": False}, {"all", "life", "home", "categories", "life_post"}),
+]
+
+
+def test_patch_changes_only_the_validators_it_invalidates(client):
+    posts = {
+        "tech": create_post(client, "Tech post", "Tech"),
+        "life": create_post(client, "Life post", "Life"),
+        "draft": create_post(client, "Draft post", "Tech", published=False),
+    }
+    reads = {
+        "all": ("/api/blog", {}),
+        "tech": ("/api/blog", {"category": "Tech"}),
+        "life": ("/api/blog", {"category": "Life"}),
+        "categories": ("/api/blog/categories", {}),
+        "home": ("/api/home", {}),
+        "life_post": (f"/api/blog/{posts['life']}", {}),
+    }
+
+    def fetch():
+        return {name: client.get(path, params=params) for name, (path, params) in reads.items()}
+
+    before = fetch()
+    for post, changes, expected in PATCH_MATRIX:
+        assert client.patch(f"/api/blog/{posts[post]}", json=changes).status_code == 200
+        after = fetch()
+        changed = {name for name in reads if after[name].headers.get("etag") != before[name].headers.get("etag")}
+        assert changed == expected, (post, changes)
+        for name in reads.keys() - changed:
+            # An unchanged ETag must still describe what is served
+            assert after[name].content == before[name].content, (post, changes, name)
+        before = after
+
+
+@pytest.mark.anyio
+async def test_workers_agree_on_category_tokens(server):
+    server.db.connect()
+    posts = server.db.blog_posts
+    stamp = datetime(2024, 1, 1)
+    await posts.insert_many([
+        {"id": "a", "category": "Tech", "published": True, "updated_at": stamp},
+        {"id": "b", "category": "Life", "published": True, "updated_at": stamp},
+    ])
+
+    # One worker measures before an edit to Tech, the other starts after it
+    early = GroupedVersions(server.db, "blog_posts", {"published": True}, "category", "updated_at")
+    before = {category: await early.token(category) for category in ("Tech", "Life", None)}
+    await posts.update_one({"id": "a"}, {"$set": {"title": "Edited", "updated_at": datetime(2024, 2, 1)}})
+    early.invalidate()
+    late = GroupedVersions(server.db, "blog_posts", {"published": True}, "category", "updated_at")
+
+    for category in ("Tech", "Life", None):
+        assert await early.token(category) == await late.token(category)
+    assert await late.token("Life") == before["Life"]
+    assert await late.token("Tech") != before["Tech"]
+    assert await early.counts_token() == await late.counts_token()
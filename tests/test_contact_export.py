@@ -0,0 +1,33 @@
+import json
+from datetime import datetime
+
+from models.contact import ContactSubmission
+
+
+def export(client, **params):
+    response = client.get("/api/contact", params={"format": "ndjson", **params})
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_export_resumes_inside_a_shared_timestamp(server, client):
+    created_at = datetime(2024, 3, 1, 12, 0, 0, 123000)
+    contacts = [
+        ContactSubmission(
+            id=f"contact-{i}", name="Ada", email="ada@example.com",
+            subject="Hello there", message="A message long enough", created_at=created_at,
+        ).model_dump()
+        for i in range(4)
+    ]
+    client.portal.call(server.db.contacts.insert_many, contacts)
+
+    rows = export(client)
+    assert [row["id"] for row in rows] == [f"contact-{i}" for i in range(4)]
+
+    # The previous run stopped after the second row; all four share one millisecond
+    last = rows[1]
+    resumed = export(client, since=last["created_at"], since_id=last["id"])
+    assert [row["id"] for row in resumed] == ["contact-2", "contact-3"]
+
+    # A timestamp alone still means "strictly later"
+    assert export(client, since=last["created_at"]) == []
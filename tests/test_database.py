@@ -0,0 +1,31 @@
+from services import database
+from services.database import Database
+
+
+def test_reads_stay_on_the_primary_after_a_write(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(database.time, "monotonic", lambda: now[0])
+    db = Database("mongodb://localhost:27017", "portfolio_test", read_preference="secondaryPreferred", read_after_write_seconds=5)
+    db.connect()
+    replica_reads = db.reads
+    assert replica_reads is not db.db
+
+    db.mark_write()
+    assert db.reads is db.db
+    now[0] += 4.9
+    assert db.reads is db.db
+    now[0] += 0.2
+    assert db.reads is replica_reads
+
+
+def test_primary_preference_always_reads_the_primary():
+    db = Database("mongodb://localhost:27017", "portfolio_test")
+    db.connect()
+    assert db.reads is db.db
+
+
+def test_cache_invalidation_marks_a_write(server, monkeypatch):
+    marks = []
+    monkeypatch.setattr(server.db, "mark_write", lambda: marks.append(True))
+    server.invalidate_reads("blog")
+    assert marks
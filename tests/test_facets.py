@@ -0,0 +1,101 @@
+import pytest
+
+from services.facets import FacetCounts
+
+
+def post(category, published=True, **fields):
+    return {"category": category, "published": published, **fields}
+
+
+@pytest.fixture
+def facets():
+    facets = FacetCounts("blog_posts", {"published": True}, ["category"])
+    facets.stale = False
+    return facets
+
+
+def test_apply_moves_counts_between_keys(facets):
+    facets.apply(None, post("Tech"))
+    facets.apply(None, post("Tech"))
+    facets.apply(None, post("Life", published=False))
+    assert dict(facets.counts) == {("Tech",): 2}
+
+    # Recategorised
+    facets.apply(post("Tech"), post("Life"))
+    assert dict(facets.counts) == {("Tech",): 1, ("Life",): 1}
+
+    # Unpublished, then the last one in a category deleted
+    facets.apply(post("Tech"), post("Tech", published=False))
+    facets.apply(post("Life"), None)
+    assert dict(facets.counts) == {}
+
+    # Published again
+    facets.apply(post("Tech", published=False), post("Tech"))
+    assert dict(facets.counts) == {("Tech",): 1}
+
+
+def test_apply_ignores_writes_outside_the_match(facets):
+    facets.apply(post("Tech", published=False), post("Life", published=False))
+    assert dict(facets.counts) == {}
+
+
+@pytest.mark.anyio
+async def test_count_and_breakdown_over_several_facets():
+    facets = FacetCounts("projects", {}, ["category", "featured"])
+    facets.stale = False
+    for category, featured in [("Web", True), ("Web", False), ("Web", False), ("Data", True)]:
+        facets.apply(None, {"category": category, "featured": featured})
+    facets.apply({"category": "Web", "featured": False}, {"category": "Web", "featured": True})
+
+    assert await facets.count(None) == 4
+    assert await facets.count(None, category="Web") == 3
+    assert await facets.count(None, category="Web", featured=True) == 2
+    assert await facets.breakdown(None, "category", "featured") == [
+        {"name": "Data", "count": 1, "featured": 1},
+        {"name": "Web", "count": 3, "featured": 2},
+    ]
+
+
+@pytest.mark.anyio
+async def test_write_during_seed_leaves_the_counts_stale(server):
+    server.db.connect()
+    await server.db.blog_posts.insert_many([post("Tech", id="a"), post("Life", id="b")])
+    facets = FacetCounts("blog_posts", {"published": True}, ["category"])
+
+    aggregate = server.db.blog_posts.aggregate
+
+    class Collection:
+        def aggregate(self, pipeline):
+            # A write lands after the aggregation has read the collection
+            facets.apply(None, post("Tech"))
+            return aggregate(pipeline)
+
+    await facets.seed({"blog_posts": Collection()})
+    assert facets.stale
+    await facets.ensure(server.db)
+    assert not facets.stale
+    assert dict(facets.counts) == {("Tech",): 1, ("Life",): 1}
+
+
+def test_categories_follow_patches(server, client):
+    created = [
+        client.post("/api/blog", json={
+            "title": f"Post number {i}", "excerpt": "An excerpt long enough", "content": "x" * 60,
+            "category": "Tech", "published": True,
+        }).json()
+        for i in range(3)
+    ]
+
+    def categories():
+        return {row["name"]: row["count"] for row in client.get("/api/blog/categories").json()["categories"]}
+
+    assert categories() == {"Tech": 3}
+    client.patch(f"/api/blog/{created[0]['id']}", json={"category": "Life"})
+    client.patch(f"/api/blog/{created[1]['id']}", json={"published": False})
+    assert categories() == {"Tech": 1, "Life": 1}
+
+    # The in-memory counts agree with a fresh seed
+    counts = dict(server.blog_facets.counts)
+    server.blog_facets.invalidate()
+    client.portal.call(server.blog_facets.ensure, server.db)
+    assert dict(server.blog_facets.counts) == counts
@@ -0,0 +1,99 @@
+def create_project(client, title, featured=False):
+    response = client.post("/api/projects", json={
+        "title": title, "description": "A project worth describing", "technologies": ["Python"],
+        "category": "Tools", "featured": featured,
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+def create_post(client, title, published=True):
+    response = client.post("/api/blog", json={
+        "title": title, "excerpt": "An excerpt long enough", "content": "Some words " * 10,
+        "category": "Tech", "published": published,
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+def create_testimonial(server, client, name, approved=True):
+    response = client.post("/api/testimonials", json={
+        "name": name, "position": "Engineer", "company": "Navy", "content": "Wonderful to work with, would hire again.",
+    })
+    assert response.status_code == 200
+    if approved:
+        # Approved by hand in the database; the next version check notices
+        client.portal.call(server.db.testimonials.update_one, {"name": name}, {"$set": {"approved": True}})
+        server.collection_versions.refresh_interval = 0
+    return response.json()
+
+
+def titles(items, field="title"):
+    return [item[field] for item in items]
+
+
+def test_sections_hold_the_newest_visible_items(server, client):
+    for i in range(4):
+        create_project(client, f"Project {i}", featured=i % 2 == 0)
+    create_post(client, "Draft", published=False)
+    create_post(client, "First post")
+    create_post(client, "Second post")
+    create_testimonial(server, client, "Grace Hopper")
+    create_testimonial(server, client, "Pending Reviewer", approved=False)
+
+    home = client.get("/api/home").json()
+    assert titles(home["projects"]) == ["Project 3", "Project 2", "Project 1", "Project 0"]
+    assert titles(home["featured_projects"]) == ["Project 2", "Project 0"]
+    assert titles(home["posts"]) == ["Second post", "First post"]
+    assert titles(home["testimonials"], "name") == ["Grace Hopper"]
+    # Listing summaries, not full posts
+    assert "content" not in home["posts"][0]
+
+
+def test_limits_cap_each_section(server, client):
+    for i in range(3):
+        create_project(client, f"Project {i}", featured=True)
+        create_post(client, f"Post {i}")
+
+    home = client.get("/api/home", params={
+        "projects_limit": 2, "featured_limit": 1, "testimonials_limit": 0, "posts_limit": 0,
+    }).json()
+    assert titles(home["projects"]) == ["Project 2", "Project 1"]
+    assert titles(home["featured_projects"]) == ["Project 2"]
+    assert home["posts"] == [] and home["testimonials"] == []
+
+    assert client.get("/api/home", params={"projects_limit": 101}).status_code == 422
+    assert client.get("/api/home", params={"posts_limit": -1}).status_code == 422
+
+
+def test_etag_changes_when_any_section_does(server, client):
+    create_project(client, "Project 0")
+    first = client.get("/api/home")
+    etag = first.headers["etag"]
+    assert client.get("/api/home", headers={"If-None-Match": etag}).status_code == 304
+    # Other limits are another representation
+    assert client.get("/api/home", params={"posts_limit": 1}).headers["etag"] != etag
+
+    def revalidate():
+        nonlocal etag
+        response = client.get("/api/home", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        etag = response.headers["etag"]
+        return response.json()
+
+    create_project(client, "Project 1")
+    assert len(revalidate()["projects"]) == 2
+
+    create_post(client, "A post")
+    assert titles(revalidate()["posts"]) == ["A post"]
+
+    create_testimonial(server, client, "Grace Hopper")
+    assert titles(revalidate()["testimonials"], "name") == ["Grace Hopper"]
+
+    # Featuring by hand moves no count or timestamp, but the digest still notices
+    client.portal.call(server.db.projects.update_many, {}, {"$set": {"featured": True}})
+    server.collection_versions.refresh_interval = 0
+    assert len(revalidate()["featured_projects"]) == 2
+
+    assert client.get("/api/home", headers={"If-None-Match": etag}).status_code == 304
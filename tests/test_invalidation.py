@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from services.invalidation import ChangeStreamChannel
+
+
+class Stream:
+    """A change stream replaying ``changes``, then idling like a quiet collection"""
+
+    def __init__(self, changes):
+        self.changes = changes
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for change in self.changes:
+            self.resume_token = change
+            yield change
+        await asyncio.Event().wait()
+
+
+class MotorDatabase:
+    def __init__(self, changes):
+        self.changes = changes
+
+    def watch(self, pipeline, **options):
+        return Stream(self.changes)
+
+
+def change(operation, collection, doc_id, **fields):
+    change = {"operationType": operation, "ns": {"coll": collection}, "fullDocument": {"id": doc_id}}
+    if operation == "update":
+        change["updateDescription"] = {"updatedFields": fields}
+    return change
+
+
+@pytest.mark.anyio
+async def test_own_writes_are_not_applied_twice():
+    changes = [
+        change("update", "blog_posts", "mine", title="Own edit"),
+        change("update", "blog_posts", "theirs", title="Peer edit"),
+        change("insert", "projects", "bulk-1"),
+        change("insert", "projects", "bulk-2"),
+        # Only one echo was expected for this document
+        change("update", "blog_posts", "mine", title="Peer edit of the same post"),
+        change("insert", "testimonials", "peer"),
+    ]
+    channel = ChangeStreamChannel(MotorDatabase(changes))
+    await channel.publish({"collection": "blog_posts", "id": "mine"})
+    await channel.publish({"collection": "projects", "id": None, "since": "2024-01-01T00:00:00"})
+
+    applied, done = [], asyncio.Event()
+
+    async def handler(event):
+        applied.append((event["collection"], event["id"]))
+        if len(applied) == 3:
+            done.set()
+
+    await channel.start(handler)
+    await asyncio.wait_for(done.wait(), 1)
+    await channel.stop()
+
+    assert applied == [("blog_posts", "theirs"), ("blog_posts", "mine"), ("testimonials", "peer")]
+
+
+@pytest.mark.anyio
+async def test_unclaimed_echoes_expire():
+    channel = ChangeStreamChannel(MotorDatabase([]), echo_seconds=0)
+    await channel.publish({"collection": "blog_posts", "id": "mine"})
+    await channel.publish({"collection": "blog_posts", "id": "other"})
+
+    assert channel._own_writes == {}
+    assert not channel._is_echo(change("update", "blog_posts", "mine"))
@@ -0,0 +1,135 @@
+import socket
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+
+import mongomock_motor
+import pytest
+from aiosmtpd.controller import Controller
+
+from services.mailer import SMTPConnectionPool
+from services.outbox import DEAD, PENDING, SENDING, SENT, EmailOutbox, backoff_delay
+
+pytestmark = pytest.mark.anyio
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=unused_port())
+    controller.start()
+    try:
+        yield controller, handler
+    finally:
+        controller.stop()
+
+
+def build_outbox(port: int, **options) -> EmailOutbox:
+    pool = SMTPConnectionPool(host="127.0.0.1", port=port, use_ssl=False, password="", timeout=2)
+
+    async def send_batch(payloads):
+        messages = []
+        for payload in payloads:
+            msg = MIMEText(payload["message"])
+            msg["From"] = "site@example.com"
+            msg["To"] = "owner@example.com"
+            msg["Subject"] = payload["subject"]
+            messages.append(msg)
+        return await pool.send_many(messages)
+
+    collection = mongomock_motor.AsyncMongoMockClient()["outbox_test"]["email_outbox"]
+    return EmailOutbox(collection, send_batch=send_batch, **options)
+
+
+def payload(subject="Hello there"):
+    return {"subject": subject, "message": "A message long enough"}
+
+
+async def test_enqueued_delivery_is_sent(smtp_server):
+    controller, handler = smtp_server
+    outbox = build_outbox(controller.port)
+
+    record_id = await outbox.enqueue("contact-1", payload())
+    assert await outbox.drain_once() == 1
+
+    record = await outbox.collection.find_one({"id": record_id})
+    assert record["status"] == SENT
+    assert record["attempts"] == 1
+    assert len(handler.messages) == 1
+    assert await outbox.drain_once() == 0
+
+
+async def test_failures_back_off_then_give_up():
+    outbox = build_outbox(unused_port(), max_attempts=2)
+    record_id = await outbox.enqueue("contact-1", payload())
+
+    before = datetime.utcnow()
+    assert await outbox.drain_once() == 1
+    record = await outbox.collection.find_one({"id": record_id})
+    assert record["status"] == PENDING
+    assert record["attempts"] == 1
+    assert record["last_error"]
+    assert record["next_attempt_at"] >= before + timedelta(seconds=backoff_delay(1))
+
+    # Not due yet, so the next drain leaves it alone
+    assert await outbox.drain_once() == 0
+
+    await outbox.collection.update_one({"id": record_id}, {"$set": {"next_attempt_at": datetime.utcnow()}})
+    assert await outbox.drain_once() == 1
+    record = await outbox.collection.find_one({"id": record_id})
+    assert record["status"] == DEAD
+    assert record["attempts"] == 2
+
+
+async def test_expired_lease_is_reclaimed(smtp_server):
+    controller, handler = smtp_server
+    outbox = build_outbox(controller.port)
+    record_id = await outbox.enqueue("contact-1", payload())
+
+    # A worker claims the record and dies before sending it
+    claimed = await outbox.claim_batch()
+    assert [record["id"] for record in claimed] == [record_id]
+    assert claimed[0]["status"] == SENDING
+
+    # The lease is still held, so nobody else picks it up
+    assert await outbox.drain_once() == 0
+
+    await outbox.collection.update_one(
+        {"id": record_id}, {"$set": {"locked_until": datetime.utcnow() - timedelta(seconds=1)}}
+    )
+    assert await outbox.drain_once() == 1
+    record = await outbox.collection.find_one({"id": record_id})
+    assert record["status"] == SENT
+    assert len(handler.messages) == 1
+
+
+def test_contact_is_accepted_when_enqueue_fails(server, client, monkeypatch):
+    async def failing_enqueue(contact_id, payload):
+        raise RuntimeError("outbox unavailable")
+
+    monkeypatch.setattr(server.email_outbox, "enqueue", failing_enqueue)
+    response = client.post("/api/contact", json={
+        "name": "Ada",
+        "email": "ada@example.com",
+        "subject": "Hello there",
+        "message": "A message long enough",
+    })
+
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+    stored = client.get("/api/contact").json()["contacts"]
+    assert [contact["id"] for contact in stored] == [response.json()["id"]]
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from models.blog import BlogPost
+from services.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_query
+
+
+def test_cursor_round_trip():
+    date = datetime(2024, 5, 17, 9, 30, 12, 345000)
+    token = encode_cursor({"date": date, "id": "post-7"})
+
+    assert "=" not in token
+    assert decode_cursor(token) == (date, "post-7")
+
+
+@pytest.mark.parametrize("token", ["", "not-a-cursor", "e30", encode_cursor({"date": datetime(2024, 1, 1), "id": "x"})[:-4]])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token)
+
+
+def test_keyset_query_keeps_the_base_filter():
+    date = datetime(2024, 1, 1)
+    query = keyset_query({"published": True}, encode_cursor({"date": date, "id": "m"}))
+
+    assert query == {
+        "published": True,
+        "$or": [{"date": {"$lt": date}}, {"date": date, "id": {"$lt": "m"}}],
+    }
+
+
+def test_cursor_pages_through_posts_sharing_a_date(server, client):
+    date = datetime(2024, 3, 1, 12, 0, 0)
+    posts = [
+        BlogPost(
+            id=f"post-{i}", title=f"Post number {i}", excerpt="An excerpt long enough",
+            content="x" * 60, category="Tech", date=date, published=True,
+        ).model_dump()
+        for i in range(5)
+    ]
+    client.portal.call(server.db.blog_posts.insert_many, posts)
+
+    seen, cursor = [], None
+    while True:
+        params = {"per_page": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/blog", params=params).json()
+        seen += [post["id"] for post in page["posts"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"post-{i}" for i in reversed(range(5))]
+
+
+def test_invalid_cursor_is_a_client_error(client):
+    assert client.get("/api/blog", params={"cursor": "garbage"}).status_code == 400
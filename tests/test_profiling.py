@@ -0,0 +1,37 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services.profiling import StackSampler
+
+
+def spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.mark.anyio
+async def test_sampler_stops_without_blocking_the_loop():
+    sampler = StackSampler(threading.get_ident(), interval=0.001)
+    sampler.start()
+    spin(0.05)
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticker = asyncio.ensure_future(tick())
+    stacks = await sampler.stop()
+    ticker.cancel()
+
+    assert not sampler.is_alive()
+    assert any(stack.endswith(f"spin (test_profiling.py:{spin.__code__.co_firstlineno})") for stack in stacks)
+    # Other tasks ran while the sampler thread was being joined
+    assert ticks > 0
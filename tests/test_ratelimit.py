@@ -0,0 +1,136 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from services import ratelimit
+from services.ratelimit import InMemoryRateLimitBackend, RateLimitMiddleware, RouteLimit, parse_rate
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock)
+    return clock
+
+
+@pytest.mark.parametrize("spec, expected", [("5/minute", (5, 5 / 60)), ("3 / hours", (3, 3 / 3600)), ("10/second", (10, 10))])
+def test_parse_rate(spec, expected):
+    assert parse_rate(spec) == expected
+
+
+@pytest.mark.anyio
+async def test_bucket_refills_at_the_configured_rate(clock):
+    backend = InMemoryRateLimitBackend()
+    capacity, rate = parse_rate("2/minute")
+
+    assert await backend.hit("k", capacity, rate) == 0
+    assert await backend.hit("k", capacity, rate) == 0
+    assert await backend.hit("k", capacity, rate) == pytest.approx(30)
+
+    clock.now += 30
+    assert await backend.hit("k", capacity, rate) == 0
+    assert await backend.hit("other", capacity, rate) == 0
+
+
+@pytest.mark.anyio
+async def test_full_buckets_are_swept(clock):
+    backend = InMemoryRateLimitBackend(sweep_interval=10)
+    await backend.hit("k", 2, 1.0)
+    assert len(backend) == 1
+
+    clock.now += 11
+    await backend.hit("fresh", 2, 1.0)
+    assert len(backend) == 1
+
+
+def limited_app():
+    app = FastAPI()
+    received = []
+
+    @app.post("/contact")
+    async def contact(request: Request):
+        received.append(await request.json())
+        return {"ok": True}
+
+    @app.post("/open")
+    async def open_route():
+        return {"ok": True}
+
+    limits = [RouteLimit("POST", "/contact", "2/minute", body_keys=("email",))]
+    app.add_middleware(RateLimitMiddleware, limits=limits, backend=InMemoryRateLimitBackend(), enabled=True)
+    return TestClient(app), received
+
+
+def test_middleware_rejects_with_retry_after(clock):
+    client, received = limited_app()
+    body = {"email": "ada@example.com", "message": "hello"}
+
+    assert client.post("/contact", json=body).status_code == 200
+    assert client.post("/contact", json=body).status_code == 200
+    response = client.post("/contact", json=body)
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "30"
+    # The buffered body still reached the endpoint intact
+    assert received == [body, body]
+
+    # Unlimited routes are untouched
+    assert all(client.post("/open").status_code == 200 for _ in range(5))
+
+    clock.now += 30
+    assert client.post("/contact", json=body).status_code == 200
+
+
+def test_body_key_is_normalised_into_its_own_bucket(clock, monkeypatch):
+    client, _ = limited_app()
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_TRUST_FORWARDED", True)
+
+    for address in ("10.0.0.1", "10.0.0.2"):
+        response = client.post("/contact", json={"email": "Ada@Example.com "}, headers={"x-forwarded-for": address})
+        assert response.status_code == 200
+    # A third address, but the same email once trimmed and lower-cased
+    response = client.post("/contact", json={"email": "ada@example.com"}, headers={"x-forwarded-for": "10.0.0.3"})
+    assert response.status_code == 429
+    # A different email from a fresh address is fine
+    response = client.post("/contact", json={"email": "bob@example.com"}, headers={"x-forwarded-for": "10.0.0.4"})
+    assert response.status_code == 200
+
+
+def test_oversized_body_is_refused_without_buffering_it(clock):
+    client, received = limited_app()
+    message = "x" * (ratelimit.RATE_LIMIT_MAX_BODY + 1)
+
+    assert client.post("/contact", json={"email": "ada@example.com", "message": message}).status_code == 413
+
+    assert received == []
+    # Refusals spend no tokens
+    assert client.post("/contact", json={"email": "ada@example.com"}).status_code == 200
+
+
+@pytest.mark.anyio
+async def test_streamed_body_stops_being_read_past_the_cap():
+    reads, sent = [], []
+
+    async def receive():
+        reads.append(True)
+        return {"type": "http.request", "body": b"x" * 16384, "more_body": True}
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send):
+        raise AssertionError("the app must not be called")
+
+    middleware = RateLimitMiddleware(app, [RouteLimit("POST", "/contact", "2/minute", body_keys=("email",))], enabled=True)
+    scope = {"type": "http", "method": "POST", "path": "/contact", "headers": [], "client": ("10.0.0.1", 1)}
+    await middleware(scope, receive, send)
+
+    assert sent[0]["status"] == 413
+    assert len(reads) == ratelimit.RATE_LIMIT_MAX_BODY // 16384 + 1
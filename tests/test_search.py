@@ -0,0 +1,153 @@
+import asyncio
+import math
+import random
+import threading
+import time
+
+import pytest
+
+from services import search as search_module
+from services.search import K1, NORM_BASE, NORM_SCALE, SearchIndex
+
+WORDS = [f"w{i}" for i in range(60)] + ["python", "pytest", "pyramid", "rust", "react"]
+
+
+def random_text(rng, words):
+    # Skewed draws, so a few terms end up in most documents
+    return " ".join(words[min(int(rng.expovariate(0.15)), len(words) - 1)] for _ in range(rng.randint(5, 40)))
+
+
+def build_index(rng, count=600):
+    index = SearchIndex()
+    for i in range(count):
+        if i % 3:
+            index.add_blog_post({
+                "id": f"p{i}", "title": random_text(rng, WORDS)[:60], "excerpt": random_text(rng, WORDS),
+                "content": random_text(rng, WORDS), "category": "Tech", "published": True,
+            })
+        else:
+            index.add_project({
+                "id": f"r{i}", "title": random_text(rng, WORDS)[:60], "technologies": rng.sample(WORDS, 3),
+                "description": random_text(rng, WORDS), "category": "Web",
+            })
+    return index
+
+
+def exhaustive(index, query, doc_type=None, limit=10, prefix=True):
+    """Score every posting, as the index did before it pruned"""
+    count = len(index.doc_terms)
+    average_length = index.total_length / count
+    tokens = list(dict.fromkeys(search_module.tokenize(query)))
+    scores = {}
+    for position, token in enumerate(tokens):
+        for term, boost in index._expand(token, prefix and position == len(tokens) - 1):
+            df = index.doc_frequency[term]
+            weight = boost * math.log(1 + (count - df + 0.5) / (df + 0.5)) * (K1 + 1)
+            for name, by_term in index.postings.items():
+                if doc_type and name != doc_type:
+                    continue
+                for key, frequency in by_term.get(term, {}).items():
+                    norm = NORM_BASE + NORM_SCALE * index.doc_lengths[key] / average_length
+                    scores[key] = scores.get(key, 0.0) + weight * frequency / (frequency + norm)
+    ranked = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+    return [round(score, 4) for _, score in ranked]
+
+
+QUERIES = ["w0", "w0 w1", "w1 w0 w2", "w3 py", "python", "w5 w40", "pyr", "rust w0 w1"]
+
+
+@pytest.mark.parametrize("doc_type", [None, "blog", "project"])
+def test_pruned_top_k_matches_exhaustive_scores(monkeypatch, doc_type):
+    monkeypatch.setattr(search_module, "SEARCH_IMPACT_LIST_MIN", 8)
+    rng = random.Random(7)
+    index = build_index(rng)
+
+    for query in QUERIES:
+        for limit in (1, 5, 20):
+            got = [hit["score"] for hit in index.search(query, doc_type=doc_type, limit=limit)]
+            assert got == exhaustive(index, query, doc_type, limit), (query, limit)
+
+
+def test_impact_lists_stay_exact_across_writes(monkeypatch):
+    monkeypatch.setattr(search_module, "SEARCH_IMPACT_LIST_MIN", 8)
+    rng = random.Random(11)
+    index = build_index(rng)
+    # Sort the lists, then keep writing so they are maintained in place while lengths drift
+    index.search("w0 w1 w2")
+    for i in range(300):
+        if i % 4 == 0:
+            index.remove("blog", f"p{rng.randrange(600)}")
+        index.add_blog_post({
+            "id": f"p{rng.randrange(900)}", "title": "w0 w1", "excerpt": random_text(rng, WORDS) * 3,
+            "content": random_text(rng, WORDS) * rng.randint(1, 6), "category": "Tech", "published": True,
+        })
+        if i % 50 == 0:
+            for query in QUERIES:
+                assert [hit["score"] for hit in index.search(query)] == exhaustive(index, query), query
+
+
+@pytest.mark.anyio
+async def test_prepare_sorts_off_the_loop_and_drops_stale_sorts(monkeypatch):
+    monkeypatch.setattr(search_module, "SEARCH_IMPACT_LIST_MIN", 8)
+    rng = random.Random(3)
+    index = build_index(rng)
+
+    await index.prepare("w0")
+    assert ("blog", "w0") in index._impacts and ("project", "w0") in index._impacts
+
+    # A write lands while w1 is being sorted in the worker thread
+    started, release = threading.Event(), threading.Event()
+    sort = index._sorted_impacts
+
+    def held_sort(items, average_length):
+        started.set()
+        release.wait(5)
+        return sort(items, average_length)
+
+    index._sorted_impacts = held_sort
+    sorting = asyncio.create_task(index.prepare("w1", doc_type="blog"))
+    await asyncio.to_thread(started.wait, 5)
+    index.add_blog_post({"id": "late", "title": "w1 w1 w1", "excerpt": "", "content": "", "published": True})
+    release.set()
+    await sorting
+    assert ("blog", "w1") not in index._impacts
+    assert [hit["score"] for hit in index.search("w1")] == exhaustive(index, "w1")
+
+
+def test_bulk_load_builds_the_vocabulary_in_one_sort():
+    index = SearchIndex()
+    prepared = search_module.prepare_documents([
+        ("blog", {"id": "1", "title": "zeta alpha", "excerpt": "", "content": "", "published": True}),
+        ("project", {"id": "2", "title": "mid beta", "technologies": ["alpha"], "description": ""}),
+        ("blog", {"id": "3", "title": "draft", "excerpt": "", "content": "", "published": False}),
+    ])
+    index.apply_prepared(prepared)
+
+    assert index.vocabulary == ["alpha", "beta", "mid", "zeta"]
+    assert index.doc_frequency["alpha"] == 2
+    index.apply_prepared(search_module.prepare_documents([("blog", {"id": "1", "title": "x", "published": False})]))
+    assert index.vocabulary == ["alpha", "beta", "mid"]
+
+
+def test_search_waits_for_the_background_build(server, client):
+    post = {
+        "title": "Profiling asyncio", "excerpt": "Finding slow coroutines in production",
+        "content": "A long article about profiling asyncio applications " * 3, "category": "Tech", "published": True,
+    }
+    assert client.post("/api/blog", json=post).status_code == 200
+
+    deadline = time.monotonic() + 5
+    while not server.search_index.ready and time.monotonic() < deadline:
+        time.sleep(0.01)
+    response = client.get("/api/search", params={"q": "asyncio prof"})
+    assert response.status_code == 200
+    assert [hit["title"] for hit in response.json()["results"]] == ["Profiling asyncio"]
+
+
+def test_search_answers_503_until_ready(server, client):
+    # Stop the startup build so it can't flip the flag back mid-test
+    client.portal.call(server.search_index.stop)
+    server.search_index.ready = False
+    response = client.get("/api/search", params={"q": "anything"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"]
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from services.singleflight import SingleFlight
+
+
+class Loader:
+    """A load that blocks until released, counting how often it ran"""
+
+    def __init__(self, result="fresh"):
+        self.result = result
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+@pytest.mark.anyio
+async def test_concurrent_callers_share_one_load():
+    flights, load, stored = SingleFlight(), Loader(), {}
+    waiters = [asyncio.ensure_future(flights.do("k", load, stored.__setitem__)) for _ in range(5)]
+    await load.started.wait()
+    assert flights.stats()["in_flight"] == 1
+
+    load.release.set()
+    assert await asyncio.gather(*waiters) == ["fresh"] * 5
+    assert load.calls == 1
+    assert stored == {"k": "fresh"}
+    assert flights.stats() == {"loads": 1, "shared": 4, "forgotten": 0, "in_flight": 0}
+
+    # Once finished, the next caller loads again
+    assert await flights.do("k", load) == "fresh"
+    assert load.calls == 2
+
+
+@pytest.mark.anyio
+async def test_a_failed_load_reaches_every_waiter():
+    flights, load = SingleFlight(), Loader(RuntimeError("boom"))
+    waiters = [asyncio.ensure_future(flights.do("k", load)) for _ in range(3)]
+    await load.started.wait()
+    load.release.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert [str(result) for result in results] == ["boom"] * 3
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert load.calls == 1
+    # The failure is not remembered
+    load.result = "recovered"
+    assert await flights.do("k", load) == "recovered"
+
+
+@pytest.mark.anyio
+async def test_forget_during_a_load_keeps_its_result_out_of_the_store():
+    flights, stale, stored = SingleFlight(), Loader("stale"), {}
+    waiter = asyncio.ensure_future(flights.do("k", stale, stored.__setitem__))
+    await stale.started.wait()
+
+    # A write lands while the load is still reading
+    assert flights.forget(lambda key: key == "k") == 1
+    fresh = Loader("fresh")
+    fresh.release.set()
+    assert await flights.do("k", fresh, stored.__setitem__) == "fresh"
+
+    stale.release.set()
+    # The detached load still answers its own waiters
+    assert await waiter == "stale"
+    assert stored == {"k": "fresh"}
+    assert flights.stats()["forgotten"] == 1
+
+
+@pytest.mark.anyio
+async def test_a_cancelled_waiter_does_not_cancel_the_load():
+    flights, load = SingleFlight(), Loader()
+    first = asyncio.ensure_future(flights.do("k", load))
+    second = asyncio.ensure_future(flights.do("k", load))
+    await load.started.wait()
+
+    first.cancel()
+    load.release.set()
+    assert await second == "fresh"
+    assert first.cancelled()
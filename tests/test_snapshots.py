@@ -0,0 +1,90 @@
+import gzip
+
+import orjson
+import pytest
+
+from services.snapshots import SnapshotStore, SnapshotWriter, snapshot_name
+
+BODY = orjson.dumps({"testimonials": [{"name": "From the snapshot", "content": "x" * 400}]})
+
+
+def render(root, versions, files=None):
+    writer = SnapshotWriter(str(root))
+    for name, body in (files or {snapshot_name("testimonials"): BODY}).items():
+        writer.write(name, body)
+    writer.publish({"versions": versions})
+    return writer
+
+
+@pytest.mark.anyio
+async def test_lookup_serves_current_snapshots_only(tmp_path):
+    render(tmp_path, {"testimonials": "v1"})
+    store = SnapshotStore(str(tmp_path), reload_interval=0)
+
+    variants = await store.lookup("testimonials", "v1", snapshot_name("testimonials"))
+    assert variants["identity"] == BODY
+    assert gzip.decompress(variants["gzip"]) == BODY
+    assert store.select(variants, "gzip, deflate")[0] == "gzip"
+
+    # The collection moved on since the render
+    assert await store.lookup("testimonials", "v2", snapshot_name("testimonials")) is None
+    # Not rendered at all
+    assert await store.lookup("projects", "v1", snapshot_name("projects")) is None
+    # Rendered for this version, but not this file
+    assert await store.lookup("testimonials", "v1", snapshot_name("testimonials", page=2)) is None
+    assert store.stats()["stale"] == 2
+
+
+@pytest.mark.anyio
+async def test_a_new_generation_replaces_the_cached_files(tmp_path):
+    render(tmp_path, {"testimonials": "v1"})
+    store = SnapshotStore(str(tmp_path), reload_interval=0)
+    assert await store.lookup("testimonials", "v1", snapshot_name("testimonials")) is not None
+
+    render(tmp_path, {"testimonials": "v2"}, {snapshot_name("testimonials"): b'{"testimonials":[]}'})
+    assert await store.lookup("testimonials", "v1", snapshot_name("testimonials")) is None
+    variants = await store.lookup("testimonials", "v2", snapshot_name("testimonials"))
+    assert variants == {"identity": b'{"testimonials":[]}'}
+
+
+@pytest.mark.anyio
+async def test_cached_files_are_bounded(tmp_path):
+    names = [snapshot_name("blog_post", post_id=str(i)) for i in range(4)]
+    render(tmp_path, {"blog_posts": "v1"}, {name: b"{}" for name in names})
+    store = SnapshotStore(str(tmp_path), reload_interval=0, max_files=2)
+
+    for name in names[:3]:
+        await store.lookup("blog_posts", "v1", name)
+    assert list(store._files) == names[1:3]
+
+    # A hit refreshes recency, so the older entry goes next
+    await store.lookup("blog_posts", "v1", names[1])
+    await store.lookup("blog_posts", "v1", names[3])
+    assert list(store._files) == [names[1], names[3]]
+
+    store = SnapshotStore(str(tmp_path), reload_interval=0, max_bytes=5)
+    for name in names:
+        await store.lookup("blog_posts", "v1", name)
+    assert store.stats()["cached_bytes"] <= 5
+
+
+def test_api_falls_back_to_the_live_path_once_stale(server, client, tmp_path):
+    token = client.portal.call(server.collection_versions.get, "testimonials")["token"]
+    render(tmp_path, {"testimonials": token})
+    server.snapshot_store = SnapshotStore(str(tmp_path), reload_interval=0)
+
+    response = client.get("/api/testimonials", headers={"Accept-Encoding": "gzip"})
+    assert response.json()["testimonials"][0]["name"] == "From the snapshot"
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].endswith('-gzip"')
+
+    # A testimonial is approved after the render
+    doc, _ = server.create_document(server.Testimonial, server.TestimonialCreate(
+        name="Ada Lovelace", position="Engineer", company="Analytical", content="A fine collaborator",
+    ))
+    client.portal.call(server.db.testimonials.insert_one, {**doc, "approved": True})
+    client.portal.call(server.collection_versions.refresh, "testimonials")
+
+    names = [t["name"] for t in client.get("/api/testimonials").json()["testimonials"]]
+    assert names == ["Ada Lovelace"]
+    assert server.snapshot_store.stats()["stale"] == 1